@@ -0,0 +1,112 @@
+"""In-process stand-ins for the Azure OpenAI and Azure AI Search SDK clients.
+
+They mirror only the attributes this codebase touches and sleep for a configurable
+latency so benchmarks exercise our code paths without network access.
+"""
+
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class FakeOpenAI:
+    """Quacks like `openai.OpenAI` for `chat.completions.create`, `embeddings.create` and `with_options`."""
+
+    def __init__(
+        self,
+        *,
+        chat_latency_s: float = 0.0,
+        embedding_latency_s: float = 0.0,
+        embedding_dim: int = 3072,
+        reply: str = "Refunds are allowed for captured or settled transactions.",
+    ) -> None:
+        self.chat_latency_s = chat_latency_s
+        self.embedding_latency_s = embedding_latency_s
+        self.reply = reply
+        # One shared vector keeps the fake's own cost out of the measurement
+        self._vector = [0.001 * (i % 97) for i in range(embedding_dim)]
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create_chat))
+        self.embeddings = SimpleNamespace(create=self._create_embeddings)
+        self.chat_calls = 0
+        self.embedding_calls = 0
+
+    def with_options(self, **kwargs: Any) -> "FakeOpenAI":
+        return self
+
+    def _create_chat(self, *, model: str, messages: List[Dict[str, Any]], **kwargs: Any) -> Any:
+        self.chat_calls += 1
+        if self.chat_latency_s:
+            time.sleep(self.chat_latency_s)
+        message = SimpleNamespace(role="assistant", content=self.reply)
+        return SimpleNamespace(choices=[SimpleNamespace(index=0, message=message)])
+
+    def _create_embeddings(self, *, model: str, input: List[str], **kwargs: Any) -> Any:
+        self.embedding_calls += 1
+        if self.embedding_latency_s:
+            time.sleep(self.embedding_latency_s)
+        data = [SimpleNamespace(index=i, embedding=self._vector) for i in range(len(input))]
+        return SimpleNamespace(data=data)
+
+
+def make_transaction(i: int) -> Dict[str, Any]:
+    status = ("authorized", "captured", "settled", "refunded", "chargeback")[i % 5]
+    return {
+        "transaction_id": f"txn_{i:08d}",
+        "amount": round(5 + (i * 7.31) % 995, 2),
+        "currency": ("USD", "EUR", "GBP")[i % 3],
+        "status": status,
+        "merchant_id": f"mid_{i % 50:03d}",
+        "created_utc": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T12:00:00Z",
+    }
+
+
+class FakeSearchClient:
+    """Quacks like `azure.search.documents.SearchClient` for `search` and `upload_documents`."""
+
+    def __init__(
+        self,
+        *,
+        latency_s: float = 0.0,
+        upload_latency_s: float = 0.0,
+        corpus_size: int = 1000,
+        vector_dim: int = 0,
+    ) -> None:
+        self.latency_s = latency_s
+        self.upload_latency_s = upload_latency_s
+        vector = [0.0] * vector_dim if vector_dim else None
+        self._docs: List[Dict[str, Any]] = []
+        for i in range(corpus_size):
+            doc = make_transaction(i)
+            doc["content"] = (
+                f"txn {doc['transaction_id']} amount {doc['amount']:.2f} {doc['currency']} "
+                f"status {doc['status']} merchant {doc['merchant_id']}"
+            )
+            if vector is not None:
+                doc["contentVector"] = vector
+            self._docs.append(doc)
+        self.uploaded = 0
+
+    def search(
+        self,
+        search_text: Optional[str] = None,
+        *,
+        top: Optional[int] = None,
+        select: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        hits = self._docs[: top or 50]
+        for rank, doc in enumerate(hits):
+            # Fresh lists per hit, as a JSON parse of the real response would produce
+            hit = {k: list(v) if isinstance(v, list) else v for k, v in doc.items() if not select or k in select}
+            hit["@search.score"] = 1.0 / (rank + 1)
+            yield hit
+
+    def upload_documents(self, documents: List[Dict[str, Any]], **kwargs: Any) -> List[Any]:
+        if self.upload_latency_s:
+            time.sleep(self.upload_latency_s)
+        self.uploaded += len(documents)
+        return [SimpleNamespace(key=d.get("transaction_id"), succeeded=True) for d in documents]
@@ -0,0 +1,315 @@
+"""Offline performance benchmarks for the payments assistant.
+
+Run from the project root (the directory containing `src/`):
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --output bench.json --baseline previous.json
+
+Azure OpenAI and Azure AI Search are replaced by the in-process fakes in
+`benchmarks/fakes.py`; their latency is injectable so runs are reproducible.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+from unittest import mock
+
+import httpx
+
+from src.agents.agent_client import AgentClient
+from src.ml.embeddings import embed_texts
+from src.observability.stats import latency_summary
+from src.search.models import DEFAULT_SELECT
+from src.search.search_client import AzureSearch
+
+from .fakes import FakeOpenAI, FakeSearchClient, make_transaction
+from .startup import measure_startup
+
+
+def bench_chat(
+    *,
+    requests: int = 200,
+    concurrency: int = 16,
+    model_latency_s: float = 0.02,
+) -> Dict[str, Any]:
+    """Drive POST /chat in-process through the ASGI app with a fake model."""
+    from src.api import main as api_main
+
+    agent = AgentClient(client=FakeOpenAI(chat_latency_s=model_latency_s), model="bench")
+    body = {"messages": [{"role": "user", "content": "Can I refund txn_00000042?"}]}
+    latencies: List[float] = []
+    errors = 0
+
+    async def drive() -> float:
+        nonlocal errors
+        sem = asyncio.Semaphore(concurrency)
+        transport = httpx.ASGITransport(app=api_main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def one() -> None:
+                nonlocal errors
+                async with sem:
+                    t0 = time.perf_counter()
+                    res = await client.post("/chat", json=body)
+                    latencies.append(time.perf_counter() - t0)
+                    if res.status_code != 200:
+                        errors += 1
+
+            t_start = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(requests)))
+            return time.perf_counter() - t_start
+
+    with mock.patch.object(api_main, "get_agent_client", lambda: agent):
+        elapsed = asyncio.run(drive())
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "model_latency_ms": model_latency_s * 1000,
+        "errors": errors,
+        "requests_per_s": round(requests / elapsed, 2),
+        "latency": latency_summary(latencies),
+    }
+
+
+def bench_ingest(*, docs: int = 20000, batch_size: int = 1000, upload_latency_s: float = 0.0) -> Dict[str, Any]:
+    """Parse a generated CSV with `load_csv` and push it through `upload_docs`."""
+    from scripts.ingest_search import load_csv, upload_docs
+
+    fields = ["transaction_id", "amount", "currency", "status", "merchant_id", "created_utc"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "transactions.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=fields)
+            w.writeheader()
+            for i in range(docs):
+                w.writerow(make_transaction(i))
+
+        t0 = time.perf_counter()
+        rows = load_csv(path)
+        parse_s = time.perf_counter() - t0
+
+    client = FakeSearchClient(corpus_size=0, upload_latency_s=upload_latency_s)
+    t0 = time.perf_counter()
+    uploaded = 0
+    for i in range(0, len(rows), batch_size):
+        uploaded += len(upload_docs("bench", rows[i : i + batch_size], client=client))  # type: ignore[arg-type]
+    upload_s = time.perf_counter() - t0
+
+    return {
+        "docs": docs,
+        "uploaded": uploaded,
+        "parse_docs_per_s": round(docs / parse_s, 1),
+        "end_to_end_docs_per_s": round(docs / (parse_s + upload_s), 1),
+    }
+
+
+def bench_ingest_files(*, files: int = 8, rows_per_file: int = 20000, workers: Optional[int] = None) -> Dict[str, Any]:
+    """Parse a directory of CSV files in-process and with the process pool in `iter_documents`."""
+    from src.search.ingest import expand_sources, iter_documents
+
+    fields = ["transaction_id", "amount", "currency", "status", "merchant_id", "created_utc"]
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in range(files):
+            with open(os.path.join(tmp, f"part-{n:03d}.csv"), "w", newline="", encoding="utf-8") as f:
+                w = csv.DictWriter(f, fieldnames=fields)
+                w.writeheader()
+                for i in range(n * rows_per_file, (n + 1) * rows_per_file):
+                    w.writerow(make_transaction(i))
+        paths = expand_sources(tmp)
+
+        t0 = time.perf_counter()
+        serial = sum(1 for _ in iter_documents(paths, workers=1))
+        serial_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        parallel = sum(1 for _ in iter_documents(paths, workers=workers))
+        parallel_s = time.perf_counter() - t0
+
+    return {
+        "files": files,
+        "docs": parallel,
+        "cpus": os.cpu_count(),
+        "serial_docs_per_s": round(serial / serial_s, 1),
+        "pool_docs_per_s": round(parallel / parallel_s, 1),
+        "speedup": round(serial_s / parallel_s, 2),
+    }
+
+
+def bench_embeddings(
+    *, texts: int = 2000, batch_size: int = 32, latency_s: float = 0.005, dim: int = 3072
+) -> Dict[str, Any]:
+    """Embed `texts` strings in batches through `embed_texts` against a fake client."""
+    client = FakeOpenAI(embedding_latency_s=latency_s, embedding_dim=dim)
+    corpus = [f"txn {i} amount {i * 1.5:.2f} USD status settled" for i in range(texts)]
+    with mock.patch("src.ml.embeddings.get_settings") as settings:
+        settings.return_value.azure_openai_embeddings_deployment = "bench"
+        t0 = time.perf_counter()
+        for i in range(0, texts, batch_size):
+            embed_texts(corpus[i : i + batch_size], client=client)  # type: ignore[arg-type]
+        elapsed = time.perf_counter() - t0
+    return {
+        "texts": texts,
+        "batch_size": batch_size,
+        "call_latency_ms": latency_s * 1000,
+        "calls": client.embedding_calls,
+        "texts_per_s": round(texts / elapsed, 1),
+    }
+
+
+def _time_per_call(fn: Callable[[], Any], iterations: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - t0) / iterations
+
+
+def _retained_bytes(fn: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+def bench_search(*, iterations: int = 2000, top: int = 10, vector_dim: int = 3072) -> Dict[str, Any]:
+    """Measure what `AzureSearch.query` adds on top of iterating the raw SDK results, and what
+    the vector-free default projection saves versus selecting every field."""
+    fake = FakeSearchClient(corpus_size=top, vector_dim=vector_dim)
+    search = AzureSearch(service_name="bench", index_name="bench", search_client=fake)  # type: ignore[arg-type]
+
+    search.query("refund", top=1)  # exclude one-off SDK model imports from the timings
+    raw = _time_per_call(lambda: list(fake.search("refund", top=top, select=DEFAULT_SELECT)), iterations)
+    wrapped = _time_per_call(lambda: search.query("refund", top=top), iterations)
+    all_fields = _time_per_call(lambda: search.query("refund", top=top, select=["*"]), max(1, iterations // 10))
+
+    payload_default = len(json.dumps(list(fake.search("refund", top=top, select=DEFAULT_SELECT))))
+    payload_all = len(json.dumps(list(fake.search("refund", top=top))))
+    return {
+        "iterations": iterations,
+        "top": top,
+        "raw_us_per_call": round(raw * 1e6, 2),
+        "wrapper_us_per_call": round(wrapped * 1e6, 2),
+        "overhead_us_per_call": round((wrapped - raw) * 1e6, 2),
+        "all_fields_us_per_call": round(all_fields * 1e6, 2),
+        "payload_bytes_default_select": payload_default,
+        "payload_bytes_all_fields": payload_all,
+        "retained_bytes_default_select": _retained_bytes(lambda: search.query("refund", top=top)),
+        "retained_bytes_all_fields": _retained_bytes(lambda: search.query("refund", top=top, select=["*"])),
+    }
+
+
+BENCHMARKS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "chat": bench_chat,
+    "ingest": bench_ingest,
+    "ingest_files": bench_ingest_files,
+    "embeddings": bench_embeddings,
+    "search": bench_search,
+    "startup": measure_startup,
+}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _flatten(prefix: str, value: Any, out: Dict[str, float]) -> None:
+    if isinstance(value, dict):
+        for k, v in value.items():
+            _flatten(f"{prefix}.{k}" if prefix else k, v, out)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = float(value)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Return one line per numeric metric present in both runs, with the relative change."""
+    cur: Dict[str, float] = {}
+    base: Dict[str, float] = {}
+    _flatten("", current.get("results", {}), cur)
+    _flatten("", baseline.get("results", {}), base)
+    lines = []
+    for key in sorted(cur.keys() & base.keys()):
+        old, new = base[key], cur[key]
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        lines.append(f"{key}: {old:g} -> {new:g} ({change})")
+    return lines
+
+
+def run(selected: List[str], params: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    results = {name: BENCHMARKS[name](**params.get(name, {})) for name in selected}
+    return {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "params": params,
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="Subset of benchmarks to run")
+    p.add_argument("--output", default="bench.json", help="Where to write the JSON results")
+    p.add_argument("--baseline", help="Previous results JSON to compare against")
+    p.add_argument("--chat-requests", type=int, default=200)
+    p.add_argument("--concurrency", type=int, default=16)
+    p.add_argument("--model-latency-ms", type=float, default=20.0)
+    p.add_argument("--ingest-docs", type=int, default=20000)
+    p.add_argument("--upload-latency-ms", type=float, default=0.0)
+    p.add_argument("--embed-texts", type=int, default=2000)
+    p.add_argument("--embed-batch-size", type=int, default=32)
+    p.add_argument("--embed-latency-ms", type=float, default=5.0)
+    p.add_argument("--search-iterations", type=int, default=2000)
+    p.add_argument("--startup-runs", type=int, default=5)
+    args = p.parse_args(argv)
+
+    params: Dict[str, Dict[str, Any]] = {
+        "chat": {
+            "requests": args.chat_requests,
+            "concurrency": args.concurrency,
+            "model_latency_s": args.model_latency_ms / 1000,
+        },
+        "ingest": {"docs": args.ingest_docs, "upload_latency_s": args.upload_latency_ms / 1000},
+        "embeddings": {
+            "texts": args.embed_texts,
+            "batch_size": args.embed_batch_size,
+            "latency_s": args.embed_latency_ms / 1000,
+        },
+        "search": {"iterations": args.search_iterations},
+        "startup": {"runs": args.startup_runs},
+    }
+    selected = args.only or list(BENCHMARKS)
+    report = run(selected, {k: v for k, v in params.items() if k in selected})
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report["results"], indent=2))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {baseline.get('commit') or args.baseline}:")
+        for line in compare(report, baseline):
+            print("  " + line)
+
+
+if __name__ == "__main__":
+    main()
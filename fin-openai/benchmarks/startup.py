@@ -0,0 +1,58 @@
+"""Cold-start measurement: import time of `src.api.main` plus time to the first /healthz.
+
+Each sample runs in a fresh interpreter so module caches from earlier runs do not help.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+# SDKs that must not load until a request actually needs them
+HEAVY_MODULES = ("openai", "azure.identity", "azure.keyvault.secrets", "azure.search.documents")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from src.api.main import app
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+status = TestClient(app).get("/healthz").status_code
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "first_healthz_ms": (t2 - t1) * 1000,
+    "status": status,
+    "heavy_modules_loaded": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def probe_once() -> Dict[str, Any]:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE % (HEAVY_MODULES,)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def measure_startup(runs: int = 5) -> Dict[str, Any]:
+    samples: List[Dict[str, Any]] = [probe_once() for _ in range(runs)]
+    imports = [s["import_ms"] for s in samples]
+    totals = [s["import_ms"] + s["first_healthz_ms"] for s in samples]
+    return {
+        "runs": runs,
+        "import_ms_median": round(statistics.median(imports), 1),
+        "startup_ms_median": round(statistics.median(totals), 1),
+        "startup_ms_max": round(max(totals), 1),
+        "heavy_modules_loaded": sorted({m for s in samples for m in s["heavy_modules_loaded"]}),
+    }
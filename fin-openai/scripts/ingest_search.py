@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-import csv
+import argparse
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from azure.identity import DefaultAzureCredential
 from azure.search.documents.indexes import SearchIndexClient
@@ -13,9 +13,9 @@ from azure.search.documents.indexes.models import (
     SearchField,
     SearchFieldDataType,
     VectorSearch,
-    HnswVectorSearchAlgorithmConfiguration,
+    HnswAlgorithmConfiguration,
+    HnswParameters,
     VectorSearchProfile,
-    edm,
 )
 from azure.search.documents import SearchClient
 
@@ -27,21 +27,33 @@ def get_service_endpoint() -> str:
     return f"https://{service}.search.windows.net"
 
 
-def ensure_index(index_name: str, *, vector_dim: int = 3072, vector_field: str = "contentVector") -> None:
-    endpoint = get_service_endpoint()
-    cred = DefaultAzureCredential()
-    ic = SearchIndexClient(endpoint=endpoint, credential=cred)
+def hnsw_from_env() -> Dict[str, Any]:
+    """HNSW graph parameters from HNSW_M / HNSW_EF_CONSTRUCTION / HNSW_EF_SEARCH / HNSW_METRIC."""
+    return {
+        "m": int(os.getenv("HNSW_M", "4")),
+        "ef_construction": int(os.getenv("HNSW_EF_CONSTRUCTION", "400")),
+        "ef_search": int(os.getenv("HNSW_EF_SEARCH", "500")),
+        "metric": os.getenv("HNSW_METRIC", "cosine"),
+    }
 
+
+def build_index(
+    index_name: str,
+    *,
+    vector_dim: int = 3072,
+    vector_field: str = "contentVector",
+    hnsw: Optional[Dict[str, Any]] = None,
+) -> SearchIndex:
     # id as key; other fields typical for payments demo
     fields = [
-        SimpleField(name="transaction_id", type=edm.String, key=True, filterable=True, sortable=True),
-        SimpleField(name="amount", type=edm.Double, filterable=True, sortable=True),
-        SimpleField(name="currency", type=edm.String, filterable=True, sortable=True, facetable=True),
-        SimpleField(name="status", type=edm.String, filterable=True, sortable=True, facetable=True),
-        SimpleField(name="merchant_id", type=edm.String, filterable=True, sortable=True),
-        SimpleField(name="created_utc", type=edm.DateTimeOffset, filterable=True, sortable=True),
+        SimpleField(name="transaction_id", type=SearchFieldDataType.String, key=True, filterable=True, sortable=True),
+        SimpleField(name="amount", type=SearchFieldDataType.Double, filterable=True, sortable=True, facetable=True),
+        SimpleField(name="currency", type=SearchFieldDataType.String, filterable=True, sortable=True, facetable=True),
+        SimpleField(name="status", type=SearchFieldDataType.String, filterable=True, sortable=True, facetable=True),
+        SimpleField(name="merchant_id", type=SearchFieldDataType.String, filterable=True, sortable=True, facetable=True),
+        SimpleField(name="created_utc", type=SearchFieldDataType.DateTimeOffset, filterable=True, sortable=True, facetable=True),
         # Add a combined text field if you want full-text search
-        SearchableField(name="content", type=edm.String, analyzer_name="en.lucene"),
+        SearchableField(name="content", type=SearchFieldDataType.String, analyzer_name="en.lucene"),
         # Vector field for embeddings (e.g., text-embedding-3-large => 3072 dims)
         SearchField(
             name=vector_field,
@@ -52,11 +64,24 @@ def ensure_index(index_name: str, *, vector_dim: int = 3072, vector_field: str =
     ]
 
     vector_search = VectorSearch(
-        algorithms=[HnswVectorSearchAlgorithmConfiguration(name="hnsw-config")],
+        algorithms=[HnswAlgorithmConfiguration(name="hnsw-config", parameters=HnswParameters(**(hnsw or {})))],
         profiles=[VectorSearchProfile(name="vector-profile", algorithm_configuration_name="hnsw-config")],
     )
 
-    index = SearchIndex(name=index_name, fields=fields, vector_search=vector_search)
+    return SearchIndex(name=index_name, fields=fields, vector_search=vector_search)
+
+
+def ensure_index(
+    index_name: str,
+    *,
+    vector_dim: int = 3072,
+    vector_field: str = "contentVector",
+    hnsw: Optional[Dict[str, Any]] = None,
+) -> None:
+    endpoint = get_service_endpoint()
+    cred = DefaultAzureCredential()
+    ic = SearchIndexClient(endpoint=endpoint, credential=cred)
+    index = build_index(index_name, vector_dim=vector_dim, vector_field=vector_field, hnsw=hnsw)
 
     try:
         # If exists, no-op
@@ -66,70 +91,99 @@ def ensure_index(index_name: str, *, vector_dim: int = 3072, vector_field: str =
 
 
 def load_csv(path: str) -> List[Dict[str, Any]]:
-    rows: List[Dict[str, Any]] = []
-    with open(path, newline="", encoding="utf-8") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            # Map to index schema; add a concatenated content field for search
-            content = (
-                f"txn {row['transaction_id']} amount {row['amount']} {row['currency']} "
-                f"status {row['status']} merchant {row['merchant_id']}"
-            )
-            rows.append({
-                "transaction_id": row["transaction_id"],
-                "amount": float(row["amount"]),
-                "currency": row["currency"],
-                "status": row["status"],
-                "merchant_id": row["merchant_id"],
-                "created_utc": row["created_utc"],
-                "content": content,
-            })
-    return rows
-
-
-def upload_docs(index_name: str, docs: List[Dict[str, Any]]) -> int:
-    endpoint = get_service_endpoint()
-    cred = DefaultAzureCredential()
-    sc = SearchClient(endpoint=endpoint, index_name=index_name, credential=cred)
+    """Parse one CSV export into index documents (see `src.search.ingest` for other formats)."""
+    return parse_csv(path)
+
+
+def upload_docs(
+    index_name: str, docs: List[Dict[str, Any]], *, client: Optional[SearchClient] = None
+) -> List[str]:
+    """Upload `docs` and return the keys the service accepted."""
+    sc = client
+    if sc is None:
+        endpoint = get_service_endpoint()
+        cred = DefaultAzureCredential()
+        sc = SearchClient(endpoint=endpoint, index_name=index_name, credential=cred)
     # upload in batches; SDK handles chunking reasonably
     res = sc.upload_documents(docs)
-    # count successes
-    return sum(1 for r in res if r.succeeded)
+    return [r.key for r in res if r.succeeded]
 
 
+from src.config import get_settings
+from src.domain.payments.rollups import get_rollup_store
 from src.ml.embeddings import embed_texts
+from src.search.ingest import batched, expand_sources, iter_documents, parse_csv
+from src.search.search_client import active_index_name
 
 
-def main() -> None:
-    index = os.getenv("AZURE_SEARCH_INDEX", "transactions")
-    csv_path = os.getenv("CSV_PATH", os.path.join("data", "payments", "sample_transactions.csv"))
+def add_embeddings(docs: List[Dict[str, Any]], vector_field: str, *, batch_size: int = 32) -> None:
+    contents = [d["content"] for d in docs]
+    for i in range(0, len(contents), batch_size):
+        embs = embed_texts(contents[i : i + batch_size])
+        for d, vec in zip(docs[i : i + batch_size], embs):
+            d[vector_field] = vec
+
+
+def target_index(explicit: Optional[str] = None) -> str:
+    """The index to ingest into: `explicit` (`--index`) when given, else the live index.
+
+    With AZURE_SEARCH_INDEX_POINTER set, the live index is the pointer's target, so incremental
+    loads keep reaching the index the API serves after a blue/green switch.
+    """
+    return explicit or active_index_name() or "transactions"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    p = argparse.ArgumentParser(description="Ingest transaction files into Azure AI Search.")
+    p.add_argument("--index", help="target index (default: the pointer's live index, else AZURE_SEARCH_INDEX)")
+    args = p.parse_args(argv)
+    index = target_index(args.index)
+    # INGEST_SOURCES: comma-separated files, directories or globs (CSV, JSONL, Parquet)
+    sources = os.getenv("INGEST_SOURCES") or os.getenv(
+        "CSV_PATH", os.path.join("data", "payments", "sample_transactions.csv")
+    )
+    workers = int(os.getenv("INGEST_WORKERS", "0")) or None
+    upload_batch = int(os.getenv("UPLOAD_BATCH_SIZE", "1000"))
     vector_field = os.getenv("VECTOR_FIELD", "contentVector")
     vector_dim = int(os.getenv("VECTOR_DIM", "3072"))
 
-    ensure_index(index, vector_dim=vector_dim, vector_field=vector_field)
-    docs = load_csv(csv_path)
-
-    # Compute embeddings for docs' content in small batches (optional if configured)
-    try:
-        batch_size = 32
-        all_embeddings: List[List[float]] = []
-        contents = [d["content"] for d in docs]
-        for i in range(0, len(contents), batch_size):
-            batch = contents[i : i + batch_size]
-            embs = embed_texts(batch)
-            all_embeddings.extend(embs)
-
-        for d, vec in zip(docs, all_embeddings):
-            d[vector_field] = vec
-        print(f"Computed embeddings for {len(all_embeddings)} documents")
-    except Exception as e:
-        print(
-            "Embeddings generation skipped (configuration missing or error). "
-            f"Proceeding without vectors. Details: {e}"
-        )
-
-    succeeded = upload_docs(index, docs)
-    print(f"Uploaded {succeeded}/{len(docs)} documents to index '{index}' (vector field: {vector_field})")
+    ensure_index(index, vector_dim=vector_dim, vector_field=vector_field, hnsw=hnsw_from_env())
+    paths = expand_sources(sources)
+    if not paths:
+        raise SystemExit(f"No input files match {sources!r}")
+    print(f"Ingesting {len(paths)} file(s) into index '{index}'")
+
+    client = SearchClient(endpoint=get_service_endpoint(), index_name=index, credential=DefaultAzureCredential())
+    rollups = get_rollup_store() if get_settings().rollup_db_path else None
+    embed = True
+    total = succeeded = embedded = 0
+    # Files are parsed in worker processes; this loop is the single upload stream
+    for docs in batched(iter_documents(paths, workers=workers), upload_batch):
+        # Compute embeddings for docs' content in small batches (optional if configured)
+        if embed:
+            try:
+                add_embeddings(docs, vector_field)
+                embedded += len(docs)
+            except Exception as e:
+                embed = False
+                for d in docs:
+                    d.pop(vector_field, None)
+                print(
+                    "Embeddings generation skipped (configuration missing or error). "
+                    f"Proceeding without vectors. Details: {e}"
+                )
+
+        uploaded = set(upload_docs(index, docs, client=client))
+        succeeded += len(uploaded)
+        total += len(docs)
+        # Fold the indexed rows into the per-merchant/day rollups (idempotent per transaction_id);
+        # rejected rows stay out so the rollups and status lookups match the index
+        if rollups is not None:
+            rollups.apply([d for d in docs if d["transaction_id"] in uploaded])
+
+    if embedded:
+        print(f"Computed embeddings for {embedded} documents")
+    print(f"Uploaded {succeeded}/{total} documents to index '{index}' (vector field: {vector_field})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,159 @@
+"""Blue/green reindex: build a versioned shadow index, validate it, then switch the pointer.
+
+The API resolves its index through the pointer file (`AZURE_SEARCH_INDEX_POINTER`), so the
+live index keeps serving until the new one is loaded and checked. Run from the project root:
+
+    python -m scripts.reindex_search --sample-query refund --sample-query chargeback
+    python -m scripts.reindex_search --source files --sources 'drops/*.csv'   # re-embed from files
+    python -m scripts.reindex_search --rollback
+
+`--source index` (default) copies every document, vectors included, from the live index;
+use it for HNSW or analyzer changes. A new `VECTOR_DIM` needs `--source files` so the
+documents are re-embedded. HNSW settings come from HNSW_M / HNSW_EF_CONSTRUCTION /
+HNSW_EF_SEARCH / HNSW_METRIC.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import random
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from azure.identity import DefaultAzureCredential
+from azure.search.documents import SearchClient
+from azure.search.documents.indexes import SearchIndexClient
+
+from scripts.ingest_search import add_embeddings, build_index, get_service_endpoint, hnsw_from_env
+from src.config import get_settings
+from src.search.index_pointer import read_pointer, write_pointer
+from src.search.ingest import batched, expand_sources, iter_documents
+from src.search.reindex import bulk_load, validate_index
+from src.search.search_client import AzureSearch, active_index_name
+
+
+def copy_documents(live: AzureSearch) -> Iterator[Dict[str, Any]]:
+    """Every document of the live index, all fields (vectors included), in key order."""
+    for hit in live.iter_all(select=["*"]):
+        yield {k: v for k, v in hit.as_dict().items() if not k.startswith("@search.")}
+
+
+def file_documents(sources: str, vector_field: str, workers: Optional[int]) -> Iterator[Dict[str, Any]]:
+    for docs in batched(iter_documents(expand_sources(sources), workers=workers), 1000):
+        add_embeddings(docs, vector_field)
+        yield from docs
+
+
+def rollback(pointer_path: str) -> None:
+    record = read_pointer(pointer_path)
+    if not record or not record.get("previous"):
+        raise SystemExit(f"No previous index recorded in {pointer_path}")
+    write_pointer(pointer_path, record["previous"], previous=record["index"])
+    print(f"Switched back to '{record['previous']}'")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    settings = get_settings()
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--pointer", default=settings.azure_search_index_pointer, help="index pointer file")
+    p.add_argument("--base-name", default=settings.azure_search_index or "transactions")
+    p.add_argument("--version", help="suffix for the new index (default: UTC timestamp)")
+    p.add_argument("--source", choices=["index", "files"], default="index")
+    p.add_argument("--sources", default=os.getenv("INGEST_SOURCES"), help="files/dirs/globs for --source files")
+    p.add_argument("--workers", type=int, default=8, help="concurrent upload batches")
+    p.add_argument("--batch-size", type=int, default=1000)
+    p.add_argument("--parse-workers", type=int, default=None, help="file parsing processes")
+    p.add_argument("--sample-query", action="append", default=[], help="query to compare old vs new")
+    p.add_argument("--sample-keys", type=int, default=20, help="random loaded ids to fetch back")
+    p.add_argument("--min-overlap", type=float, default=0.6, help="required top-10 overlap per sample query")
+    p.add_argument("--count-timeout", type=float, default=300.0)
+    p.add_argument("--no-switch", action="store_true", help="load and validate only")
+    p.add_argument("--rollback", action="store_true", help="point back at the previous index")
+    args = p.parse_args(argv)
+
+    if not args.pointer:
+        raise SystemExit("Set AZURE_SEARCH_INDEX_POINTER (or --pointer) to the shared pointer file")
+    if args.rollback:
+        rollback(args.pointer)
+        return
+
+    vector_field = os.getenv("VECTOR_FIELD", "contentVector")
+    vector_dim = int(os.getenv("VECTOR_DIM", "3072"))
+    live_name = active_index_name()
+    version = args.version or datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    new_name = f"{args.base_name}-{version}"
+
+    index_client = SearchIndexClient(endpoint=get_service_endpoint(), credential=DefaultAzureCredential())
+    index_client.create_index(
+        build_index(new_name, vector_dim=vector_dim, vector_field=vector_field, hnsw=hnsw_from_env())
+    )
+    print(f"Created shadow index '{new_name}' (live: '{live_name}')")
+
+    live = AzureSearch(index_name=live_name) if live_name else None
+    if args.source == "index":
+        if live is None:
+            raise SystemExit("No live index to copy from; use --source files")
+        docs = copy_documents(live)
+    else:
+        if not args.sources:
+            raise SystemExit("--source files needs --sources or INGEST_SOURCES")
+        docs = file_documents(args.sources, vector_field, args.parse_workers)
+
+    # Keep a reservoir of loaded ids to fetch back during validation
+    sample: List[str] = []
+    counter = itertools.count()
+
+    def tap(stream: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for doc in stream:
+            n = next(counter)
+            if n < args.sample_keys:
+                sample.append(doc["transaction_id"])
+            elif random.random() < args.sample_keys / (n + 1):
+                sample[random.randrange(args.sample_keys)] = doc["transaction_id"]
+            yield doc
+
+    new_client = SearchClient(endpoint=get_service_endpoint(), index_name=new_name, credential=DefaultAzureCredential())
+    load = bulk_load(new_client, tap(docs), batch_size=args.batch_size, workers=args.workers)
+    total = next(counter)  # documents read from the source; tap() drew one number per doc
+    print(f"Loaded {load.uploaded}/{total} documents in {load.elapsed_s:.1f}s ({load.docs_per_s}/s, {load.retries} retries)")
+
+    new = AzureSearch(index_name=new_name, search_client=new_client)
+    report = validate_index(
+        new,
+        expected=total,
+        live=live if args.source == "index" else None,
+        sample_queries=args.sample_query,
+        sample_keys=sample,
+        min_overlap=args.min_overlap,
+        count_timeout_s=args.count_timeout,
+    )
+    ok = report.ok and not load.failed_keys
+    print(
+        json.dumps(
+            {
+                "index": new_name,
+                "ok": ok,
+                "failed_uploads": len(load.failed_keys),
+                "count": report.count,
+                "expected": report.expected,
+                "queries": report.queries,
+                "failed_queries": report.failed_queries,
+                "missing_keys": report.missing_keys,
+            },
+            indent=2,
+        )
+    )
+    if not ok:
+        raise SystemExit(f"Validation failed; '{live_name}' stays live and '{new_name}' is left for inspection")
+    if args.no_switch:
+        print(f"Validated '{new_name}'; not switching (--no-switch)")
+        return
+    write_pointer(args.pointer, new_name, previous=live_name)
+    print(f"Switched live index to '{new_name}'; '{live_name}' is kept for --rollback")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Replay a /chat traffic capture against a deployment and report latency and saturation.
+
+Captures are written by the API when `CHAT_CAPTURE_PATH` is set. Run from the project root:
+
+    python -m scripts.replay_chat capture.jsonl --url http://localhost:8000 --mode original
+    python -m scripts.replay_chat capture.jsonl --url https://<app> --mode qps --qps 20 --duration 60
+    python -m scripts.replay_chat capture.jsonl --url https://<app> --mode ramp \\
+        --ramp-start 5 --ramp-end 100 --ramp-step 5 --step-seconds 20 --slo-p95-ms 2000
+
+All modes are open loop: requests are sent on schedule whether or not earlier ones finished,
+so a slow deployment shows up as rising latency and errors instead of a lower send rate.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from src.observability.stats import latency_summary
+
+
+@dataclass
+class Result:
+    step: int
+    offset_s: float
+    latency_s: float
+    status: Optional[int]  # None means a transport error or timeout
+
+
+def load_capture(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return sorted(records, key=lambda r: r.get("ts", 0.0))
+
+
+def original_schedule(records: List[Dict[str, Any]], speed: float = 1.0) -> List[Tuple[float, int]]:
+    """Offsets that reproduce the captured inter-arrival times (scaled by `speed`)."""
+    if not records:
+        return []
+    t0 = records[0].get("ts", 0.0)
+    return [((r.get("ts", t0) - t0) / speed, 0) for r in records]
+
+
+def fixed_qps_schedule(qps: float, duration_s: float) -> List[Tuple[float, int]]:
+    return [(i / qps, 0) for i in range(int(qps * duration_s))]
+
+
+def ramp_schedule(start_qps: float, end_qps: float, step_qps: float, step_s: float) -> List[Tuple[float, int]]:
+    """Open-loop staircase: `step_s` seconds at each rate from `start_qps` to `end_qps`."""
+    schedule: List[Tuple[float, int]] = []
+    qps, step, base = start_qps, 0, 0.0
+    while qps <= end_qps + 1e-9:
+        schedule.extend((base + i / qps, step) for i in range(int(qps * step_s)))
+        qps, step, base = qps + step_qps, step + 1, base + step_s
+    return schedule
+
+
+def summarize(
+    results: List[Result],
+    *,
+    step_rates: Optional[Dict[int, float]] = None,
+    slo_p95_ms: Optional[float] = None,
+    max_error_rate: float = 0.01,
+) -> Dict[str, Any]:
+    """Overall and per-step latency/error report; the saturation point is the first step
+    whose p95 exceeds the SLO or whose error rate exceeds `max_error_rate`."""
+
+    def block(rs: List[Result]) -> Dict[str, Any]:
+        ok = [r.latency_s for r in rs if r.status is not None and r.status < 400]
+        errors = len(rs) - len(ok)
+        throttled = sum(1 for r in rs if r.status == 429)
+        return {
+            "requests": len(rs),
+            "errors": errors,
+            "throttled": throttled,
+            "error_rate": round(errors / len(rs), 4) if rs else 0.0,
+            "latency": latency_summary(ok),
+        }
+
+    report: Dict[str, Any] = {"overall": block(results)}
+    if step_rates:
+        steps = []
+        saturation = None
+        for step, qps in sorted(step_rates.items()):
+            entry = {"step": step, "offered_qps": qps, **block([r for r in results if r.step == step])}
+            steps.append(entry)
+            over_slo = slo_p95_ms is not None and entry["latency"]["p95_ms"] > slo_p95_ms
+            if saturation is None and (over_slo or entry["error_rate"] > max_error_rate):
+                saturation = {"step": step, "offered_qps": qps}
+        report["steps"] = steps
+        report["saturation"] = saturation
+    return report
+
+
+async def replay(
+    url: str,
+    bodies: List[Dict[str, Any]],
+    schedule: List[Tuple[float, int]],
+    *,
+    timeout_s: float = 30.0,
+    headers: Optional[Dict[str, str]] = None,
+) -> List[Result]:
+    results: List[Result] = []
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout_s, limits=limits, headers=headers) as client:
+        start = time.perf_counter()
+
+        async def fire(offset: float, step: int, body: Dict[str, Any]) -> None:
+            t0 = time.perf_counter()
+            status: Optional[int]
+            try:
+                res = await client.post("/chat", json=body)
+                status = res.status_code
+            except httpx.HTTPError:
+                status = None
+            results.append(Result(step, offset, time.perf_counter() - t0, status))
+
+        tasks = []
+        for (offset, step), body in zip(schedule, itertools.cycle(bodies)):
+            delay = offset - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(fire(offset, step, body)))
+        await asyncio.gather(*tasks)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("capture", help="JSONL capture written by the API (CHAT_CAPTURE_PATH)")
+    p.add_argument("--url", default="http://localhost:8000")
+    p.add_argument("--mode", choices=["original", "qps", "ramp"], default="original")
+    p.add_argument("--speed", type=float, default=1.0, help="original mode: pacing multiplier")
+    p.add_argument("--qps", type=float, default=10.0, help="qps mode: request rate")
+    p.add_argument("--duration", type=float, default=60.0, help="qps mode: seconds to run")
+    p.add_argument("--ramp-start", type=float, default=5.0)
+    p.add_argument("--ramp-end", type=float, default=50.0)
+    p.add_argument("--ramp-step", type=float, default=5.0)
+    p.add_argument("--step-seconds", type=float, default=20.0)
+    p.add_argument("--slo-p95-ms", type=float, help="p95 above this marks saturation")
+    p.add_argument("--max-error-rate", type=float, default=0.01)
+    p.add_argument("--timeout", type=float, default=30.0, help="per-request client timeout")
+    p.add_argument("--header", action="append", default=[], help="extra header, e.g. x-priority:batch")
+    p.add_argument("--output", help="write the JSON report here as well as stdout")
+    args = p.parse_args(argv)
+
+    records = load_capture(args.capture)
+    bodies = [r["body"] for r in records]
+    if not bodies:
+        raise SystemExit(f"No requests in capture {args.capture}")
+
+    step_rates: Optional[Dict[int, float]] = None
+    if args.mode == "original":
+        schedule = original_schedule(records, args.speed)
+    elif args.mode == "qps":
+        schedule = fixed_qps_schedule(args.qps, args.duration)
+    else:
+        schedule = ramp_schedule(args.ramp_start, args.ramp_end, args.ramp_step, args.step_seconds)
+        step_rates, qps, step = {}, args.ramp_start, 0
+        while qps <= args.ramp_end + 1e-9:
+            step_rates[step] = round(qps, 3)
+            qps, step = qps + args.ramp_step, step + 1
+
+    headers = {k.strip(): v.strip() for k, v in (h.split(":", 1) for h in args.header)}
+    results = asyncio.run(replay(args.url, bodies, schedule, timeout_s=args.timeout, headers=headers))
+    report = {
+        "url": args.url,
+        "mode": args.mode,
+        "capture": args.capture,
+        **summarize(results, step_rates=step_rates, slo_p95_ms=args.slo_p95_ms, max_error_rate=args.max_error_rate),
+    }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
 import logging
+import threading
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 import os
-from openai import OpenAI
 
+from ..cache.shared_cache import get_shared_cache, make_key
 from ..config import get_settings
+from ..deadline import DeadlineExceeded, bounded_client, remaining_s
+from ..ml.rate_governor import governed, http_client
+from ..ml.tokens import estimate_tokens
+from ..observability.profiling import stage
 from ..security.key_vault import get_secret
+from .intent_router import IntentRouter, build_intent_router
+from ..search.search_client import active_index_name
+from .retrieval import Retriever, build_retriever
+
+if TYPE_CHECKING:  # the SDK is imported on first use to keep cold start fast
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
@@ -25,18 +36,21 @@ class AgentClient:
     or Azure OpenAI Assistants when you wire them up. We keep the interface minimal and focused.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        client: Optional[OpenAI] = None,
+        model: Optional[str] = None,
+        retriever: Optional[Retriever] = None,
+        router: Optional[IntentRouter] = None,
+    ) -> None:
         self.settings = get_settings()
-        self._client: Optional[OpenAI] = None
-        self._model: Optional[str] = None
+        self._client: Optional[OpenAI] = client
+        self._model: Optional[str] = model
+        self._retriever: Optional[Retriever] = retriever
+        self._router: Optional[IntentRouter] = router if router is not None else build_intent_router()
 
-        # Prefer Azure OpenAI if configured
-        if (
-            self.settings.azure_openai_endpoint
-            and self.settings.azure_openai_deployment
-            and self.settings.key_vault_uri
-            and self.settings.azure_openai_api_key_secret_name
-        ):
+        # Prefer Azure OpenAI if configured (an injected client, e.g. a benchmark fake, wins)
+        if self._client is None and self.azure_openai_configured:
             api_key = get_secret(
                 self.settings.key_vault_uri,
                 self.settings.azure_openai_api_key_secret_name,
@@ -49,12 +63,45 @@ class AgentClient:
                 )
                 # The Azure OpenAI API version – update to latest supported
                 api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-06-01")
+                from openai import OpenAI
+
                 self._client = OpenAI(
                     base_url=f"{base_url}",
                     api_key=api_key,
                     default_headers={"api-version": api_version},
+                    http_client=http_client(),
                 )
                 self._model = self.settings.azure_openai_deployment
+                if self._retriever is None:
+                    self._retriever = build_retriever()
+
+    @property
+    def azure_openai_configured(self) -> bool:
+        return bool(
+            self.settings.azure_openai_endpoint
+            and self.settings.azure_openai_deployment
+            and self.settings.key_vault_uri
+            and self.settings.azure_openai_api_key_secret_name
+        )
+
+    @property
+    def model_ready(self) -> bool:
+        return bool(self._client and self._model)
+
+    def ping(self) -> bool:
+        """Send a one-token completion to the deployment, without retries.
+
+        Opens the connection and wakes the deployment (used by warm-up). Returns False without
+        a call when no model is configured; errors propagate to the caller.
+        """
+        if not (self._client and self._model):
+            return False
+        self._client.with_options(max_retries=0).chat.completions.create(
+            model=self._model,
+            messages=[{"role": "user", "content": "ping"}],
+            max_tokens=1,
+        )
+        return True
 
     def chat(self, messages: List[Message], tools: Optional[Dict[str, Any]] = None) -> str:
         """Respond to a chat conversation.
@@ -63,17 +110,50 @@ class AgentClient:
         - messages: List of Message(role, content)
         - tools: optional set of callable tools to augment the agent
         """
+        # Unambiguous fee/refund questions are answered exactly by the domain tools
+        if self._router is not None and messages and messages[-1].role == "user":
+            history = [m.content for m in messages[:-1] if m.role == "user"]
+            with stage("route"):
+                routed = self._router.route(messages[-1].content, history=history)
+            if routed is not None:
+                return routed.reply
+
         # If Azure OpenAI is configured, route to chat completions
         if self._client and self._model:
             try:
                 # Convert to OpenAI messages format
                 msgs = [{"role": m.role, "content": m.content} for m in messages]
-                resp = self._client.chat.completions.create(
-                    model=self._model,
-                    messages=msgs,
-                    temperature=0.2,
-                )
-                return resp.choices[0].message.content or ""
+                context, degraded = self._retrieve(messages)
+                if context:
+                    msgs.insert(0, {"role": "system", "content": context})
+                # The reply depends on the grounding, so the key covers the index and context.
+                # A reply built on failed or partial retrieval is not shared with other workers.
+                ttl = self.settings.shared_cache_chat_ttl_s
+                cache = get_shared_cache() if ttl > 0 and not degraded else None
+                cache_key = None
+                if cache is not None:
+                    index = active_index_name() if self._retriever is not None else None
+                    cache_key = make_key(self._model, index, context, [(m.role, m.content) for m in messages])
+                    cached = cache.get("chat", cache_key)
+                    if cached:
+                        return cached
+                tokens = sum(estimate_tokens(m["content"]) for m in msgs)
+                tokens += self.settings.openai_completion_token_estimate
+                queue_timeout = remaining_s(self.settings.openai_queue_timeout_s)
+                with governed(tokens, timeout=queue_timeout) as permit, stage("model"):
+                    resp = bounded_client(self._client, "model call").chat.completions.create(
+                        model=self._model,
+                        messages=msgs,
+                        temperature=0.2,
+                    )
+                    if permit is not None:
+                        permit.used_tokens = getattr(getattr(resp, "usage", None), "total_tokens", None)
+                reply = resp.choices[0].message.content or ""
+                if cache is not None and reply:
+                    cache.set("chat", cache_key, reply, ttl_s=ttl)
+                return reply
+            except DeadlineExceeded as ex:
+                logger.info("%s; answering with the placeholder", ex)
             except Exception:
                 # Fall back to placeholder if Azure call fails
                 pass
@@ -94,7 +174,40 @@ class AgentClient:
             "I'm your Payments Assistant. Ask me about transactions, fees, chargebacks, or settlement windows."
         )
 
+    def _retrieve(self, messages: List[Message]) -> Tuple[Optional[str], bool]:
+        """Grounding context for the latest user turn (None if retrieval is off or empty), and
+        whether retrieval was degraded: failed, or partial at its deadline."""
+        if self._retriever is None:
+            return None, False
+        query = next((m.content for m in reversed(messages) if m.role == "user"), "")
+        if not query.strip():
+            return None, False
+        try:
+            result = self._retriever.retrieve(query)
+        except Exception as ex:  # retrieval must never block the model call
+            logger.warning("Retrieval failed: %s", ex)
+            return None, True
+        return (result.as_prompt() if result.documents else None), result.partial
+
+
+_agent: Optional[AgentClient] = None
+_agent_lock = threading.Lock()
+
 
 def get_agent_client() -> AgentClient:
+    """Return the process-wide agent so the Key Vault fetch and HTTP connection pool are reused.
+
+    If Azure OpenAI is configured but the key could not be fetched, the client is not cached
+    and the next call retries instead of staying on the placeholder for the process lifetime.
+    """
     # In future, return AzureAgentsClient if azure_ai_agents_endpoint is configured.
-    return AgentClient()
+    global _agent
+    if _agent is not None:
+        return _agent
+    with _agent_lock:
+        if _agent is None:
+            agent = AgentClient()
+            if agent.model_ready or not agent.azure_openai_configured:
+                _agent = agent
+            return agent
+        return _agent
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from ..config import get_settings
+from ..domain.payments.tools import FEE_FIXED, FEE_RATE, calculate_fees, can_refund
+
+logger = logging.getLogger(__name__)
+
+# One compiled alternation; a single scan of the message yields every feature present
+_FEATURES = re.compile(
+    r"""
+    (?P<fee>\bfees?\b|\bprocessing\s+(?:cost|charge)s?\b)
+    | (?P<refund_question>
+        \b(?:can|could|may)\b(?=[^?.!]*\brefund)
+        | \brefundable\b
+        | \beligible\b(?=[^?.!]*\brefund)
+        | \brefunds?\b(?=[^?.!]*\b(?:allowed|possible|eligible)\b)
+        | \bhow\s+(?:do|can|to)\s+(?:i\s+|we\s+|you\s+)?(?:issue\s+|process\s+|make\s+)?(?:a\s+)?refund
+      )
+    | (?P<question>\bwhat(?:'s|\s+is|\s+are|\s+would\s+be)\b|\bhow\s+much\b|\bcalculate\b|\bcompute\b|\bestimate\b)
+    | (?P<status>\b(?:authorized|captured|settled|chargeback)\b
+        | (?<!be\s)(?<!been\s)\brefunded\b)  # "be refunded" is the question, not a status
+    | (?P<refund>\brefund\w*)
+    | (?P<blocker>
+        \bwhy\b|\bexplain\b|\binterchange\b|\bnetwork\b|\bamex\b|\bamerican\s+express\b|\bvisa\b
+        | \bmastercard\b|\bdiscover\b|\binternational\b|\bcross[-\s]border\b|\bdisputes?\b
+        | \blast\b|\btotal\b|\bhistory\b|\breport\b|\bmonthly\b|\bstatement\b|\bmid_\w+
+        | \bshow\b|\blist\b|\bfind\b|\bsearch\b|\bhow\s+many\b|\bcount\b
+      )
+    | (?P<foreign>
+        \b(?:eur|gbp|cad|aud|jpy|inr|mxn|chf|cny|nzd|sek|brl)\b|[€£¥₹]
+        | \beuros?\b|\bpounds?\b|\bsterling\b|\byen\b|\brupees?\b|\bpesos?\b|\bfrancs?\b|\byuan\b
+        | \breais\b|\bcanadian\b|\baustralian\b|\bforeign\b|\bcurrenc(?:y|ies)\b|\bexchange\b
+      )
+    | (?P<txn>\btxn_[A-Za-z0-9]+\b)
+    | (?P<amount>(?:(?:\$|\busd\b)\s*)?[-−]?(?<![\w.])(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d{1,2})?(?![\w.])
+        (?:\s*(?:dollars?|usd|bucks)\b)?)
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+# An amount without a currency marker only counts as one in "fee on/for <n>" at the end of a clause
+_SLOT_BEFORE = re.compile(r"\b(?:on|for)\s+(?:an?\s+)?$", re.IGNORECASE)
+_SLOT_AFTER = re.compile(r"\s*(?:[?.!,;]|$)")
+_MARKED = re.compile(r"\$|usd|dollar|bucks", re.IGNORECASE)
+_WORDS = re.compile(r"[\w'’]+|[^\w\s]")
+
+# The standard schedule covers card transactions only. A fee is quoted when the words naming it
+# ("the processing fee") or the amount ("$100 card payment") come from these lists; any other
+# qualifier ("annual", "PCI", "wire", "ACH", "debit", "a month") sends the message to the model.
+_FEE_QUALIFIERS = {"processing", "transaction", "card"}
+_AMOUNT_NOUNS = {"card", "transaction", "transactions", "payment", "payments", "sale", "purchase"}
+# Words that end the noun phrase in front of "fee(s)"
+_PHRASE_BOUNDARY = set(
+    """a an the your my our their its this that any what what's whats which is are was were be there
+    there's of on for to in with about do does much how me i we you and or
+    calculate compute estimate quote tell get know""".split()
+)
+
+# Context that makes a later, shorter follow-up ambiguous ("what about $100?" after an Amex turn)
+_CONTEXT_BLOCKERS = {"blocker", "foreign"}
+
+
+@dataclass
+class RoutedReply:
+    intent: str
+    reply: str
+    slots: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class _Parse:
+    features: Set[str] = field(default_factory=set)
+    amounts: List[float] = field(default_factory=list)
+    txn_ids: List[str] = field(default_factory=list)
+    statuses: List[str] = field(default_factory=list)
+
+
+def _parse(text: str) -> _Parse:
+    parsed = _Parse()
+    for m in _FEATURES.finditer(text):
+        kind = m.lastgroup
+        if kind is None:
+            continue
+        parsed.features.add(kind)
+        value = m.group(kind)
+        if kind == "fee" and not _standard_fee(text, m.start()):
+            parsed.features.add("other_fee")
+        elif kind == "amount":
+            amount = _amount(text, m)
+            if amount is None:
+                # a count, year, percentage, sign or zero, or not a card payment ("$100 ACH")
+                parsed.features.add("unclear_number")
+            else:
+                parsed.amounts.append(amount)
+        elif kind == "txn":
+            parsed.txn_ids.append(value)
+        elif kind == "status":
+            parsed.statuses.append(value.lower())
+    return parsed
+
+
+def _amount(text: str, m: re.Match) -> Optional[float]:
+    """The match as a positive money amount, or None when it is not clearly one."""
+    value = m.group()
+    before = text[: m.start()]
+    if "-" in value or "−" in value or before.rstrip().endswith(("-", "−")):
+        return None
+    if text[m.end() : m.end() + 1] == "%":
+        return None
+    number = float(re.sub(r"[^\d.]", "", value))
+    if number <= 0:
+        return None
+    if _MARKED.search(value):
+        rest = _WORDS.findall(re.split(r"[?.!,;]", text[m.end() :], maxsplit=1)[0])
+        return number if all(w.lower() in _AMOUNT_NOUNS for w in rest) else None
+    # Bare numbers: only "on/for <n>" closing the clause, and never something that reads as a year
+    is_year = number.is_integer() and 1900 <= number <= 2100
+    if _SLOT_BEFORE.search(before) and _SLOT_AFTER.match(text, m.end()) and not is_year:
+        return number
+    return None
+
+
+def _standard_fee(text: str, start: int) -> bool:
+    """Whether the noun phrase ending in the "fee" at `start` names the standard card fee."""
+    for word in reversed(_WORDS.findall(text[:start])):
+        word = word.lower()
+        if word in _FEE_QUALIFIERS:
+            continue
+        return word in _PHRASE_BOUNDARY or not re.fullmatch(r"[a-z'’]+", word)
+    return True
+
+
+class IntentRouter:
+    """Answers fee and refund-eligibility questions exactly from the domain tools, without the LLM.
+
+    Only unambiguous, single-question messages are answered: anything mentioning card networks,
+    foreign currencies, disputes, reporting periods or asking "why" goes to the model, as does
+    a message with more than one amount, transaction id or status, a number that is not
+    clearly a dollar amount, or a fee other than the standard card processing fee. Earlier turns with such context also send the message to the model.
+    """
+
+    def __init__(
+        self,
+        *,
+        lookup_status: Optional[Callable[[str], Optional[str]]] = None,
+        max_chars: int = 240,
+    ) -> None:
+        self.lookup_status = lookup_status
+        self.max_chars = max_chars
+
+    def route(self, text: str, *, history: Sequence[str] = ()) -> Optional[RoutedReply]:
+        """Answer `text`, the latest user turn; `history` is the conversation's earlier user turns."""
+        if not text or len(text) > self.max_chars or text.count("?") > 1:
+            return None
+        parsed = _parse(text)
+        features = parsed.features
+        if features & _CONTEXT_BLOCKERS:
+            return None
+        if any(_parse(turn).features & _CONTEXT_BLOCKERS for turn in history):
+            return None
+        fee = "fee" in features and ("question" in features or bool(parsed.amounts))
+        refund = "refund_question" in features and "fee" not in features  # "Can I refund the fee?"
+        if fee == refund:  # neither, or both in one message
+            return None
+        if fee:
+            return self._fees(parsed)
+        return self._refund(parsed)
+
+    def _fees(self, parsed: _Parse) -> Optional[RoutedReply]:
+        if parsed.features & {"refund", "unclear_number", "other_fee"}:  # "the refund fee", "the annual fee"
+            return None
+        if parsed.txn_ids or parsed.statuses or len(parsed.amounts) > 1:
+            return None
+        if not parsed.amounts:
+            return RoutedReply(
+                "fee_schedule",
+                f"Our standard processing fee is {FEE_RATE * 100:.1f}% + ${FEE_FIXED:.2f} per transaction. "
+                "Tell me an amount and I'll calculate the exact fee.",
+            )
+        amount = parsed.amounts[0]
+        fee = calculate_fees(amount)
+        return RoutedReply(
+            "fee_quote",
+            f"The processing fee on ${amount:,.2f} is ${fee:,.2f} "
+            f"({FEE_RATE * 100:.1f}% + ${FEE_FIXED:.2f}), so you would net ${amount - fee:,.2f}.",
+            {"amount": amount, "fee": fee},
+        )
+
+    def _refund(self, parsed: _Parse) -> Optional[RoutedReply]:
+        if len(parsed.txn_ids) > 1 or len(set(parsed.statuses)) > 1:
+            return None
+        if parsed.txn_ids:
+            txn_id = parsed.txn_ids[0]
+            if self.lookup_status is None:
+                return None
+            try:
+                status = self.lookup_status(txn_id)
+            except Exception as ex:
+                logger.warning("Status lookup for %s failed: %s", txn_id, ex)
+                return None
+            if status is None:
+                return None
+            if can_refund(status):
+                reply = f"Yes, {txn_id} is {status}, so it can be refunded."
+            else:
+                reply = f"No, {txn_id} is {status}; only captured or settled transactions can be refunded."
+            return RoutedReply(
+                "refund_eligibility",
+                reply,
+                {"transaction_id": txn_id, "status": status, "refundable": can_refund(status)},
+            )
+        if parsed.statuses:
+            status = parsed.statuses[0]
+            if can_refund(status):
+                reply = f"Yes, {status} transactions can be refunded."
+            else:
+                reply = f"No, {status} transactions can't be refunded; only captured or settled ones can."
+            return RoutedReply("refund_eligibility", reply, {"status": status, "refundable": can_refund(status)})
+        return RoutedReply(
+            "refund_policy",
+            "Refunds can be issued for captured or settled transactions. "
+            "Share the transaction_id and I can check whether it is eligible.",
+        )
+
+
+def _status_lookup() -> Optional[Callable[[str], Optional[str]]]:
+    """Transaction status from the local rollups when configured, else from Search."""
+    settings = get_settings()
+    if settings.rollup_db_path:
+        from ..domain.payments.rollups import get_rollup_store
+
+        return get_rollup_store().status_of
+    if settings.azure_search_service and settings.azure_search_index:
+        from ..search.filters import odata_literal
+        from ..search.search_client import get_azure_search
+
+        def lookup(txn_id: str) -> Optional[str]:
+            hits = list(
+                get_azure_search().iter_query(
+                    None,
+                    top=1,
+                    filters=f"transaction_id eq {odata_literal(txn_id)}",
+                    select=["transaction_id", "status"],
+                )
+            )
+            return hits[0].status if hits else None
+
+        return lookup
+    return None
+
+
+def build_intent_router() -> Optional[IntentRouter]:
+    if not get_settings().intent_router_enabled:
+        return None
+    return IntentRouter(lookup_status=_status_lookup())
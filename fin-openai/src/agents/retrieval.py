@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from ..config import get_settings
+from ..deadline import remaining_s, submit_in_context
+from ..ml.embeddings import embed_texts
+from ..ml.tokens import estimate_tokens
+from ..observability.profiling import stage
+from ..search.models import DEFAULT_SELECT
+from ..search.ranking import reciprocal_rank_fusion
+from ..search.search_client import AzureSearch, get_azure_search
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_PREAMBLE = (
+    "Answer using the indexed payments records below when they are relevant, citing "
+    "transaction ids. Ignore records that do not relate to the question."
+)
+
+
+@lru_cache
+def _executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=get_settings().rag_max_workers, thread_name_prefix="retrieval"
+    )
+
+
+@dataclass
+class RetrievedContext:
+    documents: List[Dict[str, Any]] = field(default_factory=list)
+    completed: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.missing)
+
+    def as_prompt(self) -> str:
+        lines = [CONTEXT_PREAMBLE, ""]
+        lines.extend(f"[{i}] {_doc_text(d)}" for i, d in enumerate(self.documents, start=1))
+        return "\n".join(lines)
+
+
+def _doc_text(doc: Dict[str, Any]) -> str:
+    content = doc.get("content")
+    if content:
+        return str(content)
+    return ", ".join(f"{k}={doc[k]}" for k in DEFAULT_SELECT if doc.get(k) is not None)
+
+
+def trim_to_budget(docs: List[Dict[str, Any]], token_budget: int) -> List[Dict[str, Any]]:
+    """Keep the highest-ranked documents whose combined text fits in `token_budget` tokens."""
+    kept: List[Dict[str, Any]] = []
+    used = estimate_tokens(CONTEXT_PREAMBLE)
+    for doc in docs:
+        cost = estimate_tokens(_doc_text(doc)) + 2  # "[n] " prefix and newline
+        if used + cost > token_budget:
+            break
+        kept.append(doc)
+        used += cost
+    return kept
+
+
+def _embed_query(texts: List[str]) -> List[List[float]]:
+    # The user is waiting on this one: jump ahead of bulk ingestion in the rate governor
+    return embed_texts(texts, priority="interactive")
+
+
+class Retriever:
+    """Keyword + vector retrieval under a deadline, fused locally with reciprocal rank fusion.
+
+    The keyword search and the query embedding start together; the vector search starts as
+    soon as the embedding is back. Whatever has finished by the deadline is fused and
+    returned, so a slow retriever degrades the context instead of delaying the model call.
+    The deadline is `deadline_s` or the request's remaining budget, whichever is shorter.
+    """
+
+    def __init__(
+        self,
+        search: Union[AzureSearch, Callable[[], AzureSearch]],
+        *,
+        top_k: int = 5,
+        deadline_s: float = 0.8,
+        token_budget: int = 1500,
+        use_vectors: bool = True,
+        key_field: str = "transaction_id",
+        embed: Callable[[List[str]], List[List[float]]] = _embed_query,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        self.search = search
+        self.top_k = top_k
+        self.deadline_s = deadline_s
+        self.token_budget = token_budget
+        self.use_vectors = use_vectors
+        self.key_field = key_field
+        self.embed = embed
+        self._executor = executor
+
+    def retrieve(self, query: str) -> RetrievedContext:
+        t0 = time.monotonic()
+        deadline = t0 + remaining_s(self.deadline_s)
+        pool = self._executor or _executor()
+        # A provider is resolved per query so an index switch takes effect without a restart
+        search = self.search() if callable(self.search) else self.search
+
+        pending: Dict[Future, str] = {
+            submit_in_context(pool, search.query, query, top=self.top_k): "keyword"
+        }
+        if self.use_vectors:
+            pending[submit_in_context(pool, self.embed, [query])] = "embedding"
+
+        ranked: Dict[str, List[Dict[str, Any]]] = {}
+        failed: List[str] = []
+        with stage("retrieval"):
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, _ = wait(list(pending), timeout=remaining, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = pending.pop(fut)
+                    try:
+                        result = fut.result()
+                    except Exception as ex:
+                        logger.warning("Retrieval step '%s' failed: %s", name, ex)
+                        failed.append("vector" if name == "embedding" else name)
+                        continue
+                    if name == "embedding":
+                        vq = submit_in_context(
+                            pool,
+                            search.vector_query,
+                            query,
+                            top=self.top_k,
+                            vector=result[0],
+                        )
+                        pending[vq] = "vector"
+                    else:
+                        ranked[name] = result
+
+        # Anything still pending missed the deadline; it finishes in the background, unused
+        missing = failed + ["vector" if n == "embedding" else n for n in pending.values()]
+        fused = reciprocal_rank_fusion(list(ranked.values()), key=self.key_field, top=self.top_k)
+        context = RetrievedContext(
+            documents=trim_to_budget(fused, self.token_budget),
+            completed=sorted(ranked),
+            missing=sorted(missing),
+            elapsed_ms=round((time.monotonic() - t0) * 1000, 1),
+        )
+        if context.partial:
+            logger.info("Retrieval returned partial results after %.0f ms; missing %s", context.elapsed_ms, missing)
+        return context
+
+
+def build_retriever() -> Optional[Retriever]:
+    """Retriever for the configured index, or None when RAG is disabled or Search is not set up."""
+    settings = get_settings()
+    if not (settings.rag_enabled and settings.azure_search_service and settings.azure_search_index):
+        return None
+    return Retriever(
+        get_azure_search,
+        top_k=settings.rag_top_k,
+        deadline_s=settings.rag_deadline_ms / 1000,
+        token_budget=settings.rag_context_token_budget,
+        use_vectors=bool(settings.azure_openai_embeddings_deployment),
+    )
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+
+class Overloaded(Exception):
+    """The request was not admitted; respond 429 with `Retry-After: retry_after_s`."""
+
+    def __init__(self, reason: str, retry_after_s: int) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+@dataclass(order=True)
+class _Waiter:
+    rank: int
+    seq: int
+    future: asyncio.Future = field(compare=False)
+    deadline: float = field(compare=False)
+
+
+class AdmissionController:
+    """Per-worker in-flight limit with a bounded, priority-ordered wait queue.
+
+    Runs on the event loop, in front of the thread pool, so an overloaded worker answers
+    429 immediately instead of queueing work nobody will wait for:
+
+    - at most `max_in_flight` requests run; up to `max_queue` more wait, highest priority first
+    - when the queue is full, a new request displaces the newest lower-priority waiter or is
+      rejected
+    - a waiter that has not started within its `max_wait_s` is dropped; by then the client
+      has usually given up, and running it would only delay the requests behind it
+    """
+
+    def __init__(
+        self,
+        *,
+        max_in_flight: int = 32,
+        max_queue: int = 64,
+        max_wait_s: float = 2.0,
+        clock: Any = time.monotonic,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_wait_s = max_wait_s
+        self._clock = clock
+        self.in_flight = 0
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._service_s = 1.0  # EWMA of time in the slot, for Retry-After
+        self.counters: Dict[str, int] = {"admitted": 0, "rejected": 0, "shed": 0, "expired": 0}
+
+    def retry_after(self) -> int:
+        backlog = self._queued() + 1
+        return max(1, math.ceil(self._service_s * backlog / max(1, self.max_in_flight)))
+
+    def _queued(self) -> int:
+        if len(self._queue) > 2 * self.max_queue:  # drop entries that timed out or left
+            self._queue = [w for w in self._queue if not w.future.done()]
+            heapq.heapify(self._queue)
+        return sum(1 for w in self._queue if not w.future.done())
+
+    async def acquire(self, priority: str = "interactive", *, max_wait_s: Optional[float] = None) -> None:
+        rank = PRIORITIES.get(priority, 0)
+        if self.in_flight < self.max_in_flight and not self._queued():
+            self.in_flight += 1
+            self.counters["admitted"] += 1
+            return
+
+        if self._queued() >= self.max_queue:
+            live = [w for w in self._queue if not w.future.done()]
+            worst = max(live) if live else None
+            if worst is None or worst.rank <= rank:
+                self.counters["rejected"] += 1
+                raise Overloaded("queue full", self.retry_after())
+            worst.future.set_exception(Overloaded("displaced by higher-priority work", self.retry_after()))
+            self.counters["shed"] += 1
+            logger.info("Shed a queued priority-%d request for a priority-%d one", worst.rank, rank)
+
+        wait_s = self.max_wait_s if max_wait_s is None else max_wait_s
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(rank, next(self._seq), loop.create_future(), self._clock() + wait_s)
+        heapq.heappush(self._queue, waiter)
+        try:
+            await asyncio.wait_for(waiter.future, timeout=wait_s)
+        except asyncio.TimeoutError:
+            self.counters["expired"] += 1
+            raise Overloaded("waited past deadline", self.retry_after())
+        except asyncio.CancelledError:
+            # Client went away; hand back a slot that was granted in the meantime
+            if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+                self.release(0.0)
+            raise
+        self.counters["admitted"] += 1
+
+    def release(self, service_s: Optional[float] = None) -> None:
+        if service_s:
+            self._service_s = 0.8 * self._service_s + 0.2 * service_s
+        now = self._clock()
+        while self._queue:
+            waiter = heapq.heappop(self._queue)
+            if waiter.future.done():
+                continue  # timed out, cancelled or displaced
+            if now > waiter.deadline:
+                waiter.future.set_exception(Overloaded("waited past deadline", self.retry_after()))
+                self.counters["expired"] += 1
+                continue
+            waiter.future.set_result(None)  # the slot passes straight to the waiter
+            return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: str = "interactive", *, max_wait_s: Optional[float] = None) -> AsyncIterator[None]:
+        await self.acquire(priority, max_wait_s=max_wait_s)
+        t0 = self._clock()
+        try:
+            yield
+        finally:
+            self.release(self._clock() - t0)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": self.in_flight, "queued": self._queued(), **self.counters}
@@ -1,17 +1,78 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from typing import List
+import time
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime
+from typing import AsyncIterator, Iterator, List, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from ..config import get_settings
 from ..agents.agent_client import get_agent_client, Message
+from ..deadline import Deadline, deadline_scope, parse_budget_ms
+from ..observability.capture import TrafficRecorder
+from ..observability.profiling import ProfilingMiddleware, profile_thread, stage
+from ..search.filters import and_filters, any_of, created_range, facet_number, odata_literal
+from ..search.paging import InvalidContinuationToken, decode_continuation, encode_continuation
+from ..search.search_client import get_azure_search
+from .admission import AdmissionController, Overloaded
+from .warmup import WarmupState, warm_up
 
 logger = logging.getLogger("uvicorn")
 
-app = FastAPI(title="Fiserv Payments Assistant")
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    state = app.state.warmup = WarmupState()
+    task = None
+    if settings.warmup_enabled:
+        task = asyncio.create_task(warm_up(state, settings))
+    else:
+        state.mark_ready()
+    yield
+    if task is not None:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+
+app = FastAPI(title="Fiserv Payments Assistant", lifespan=lifespan)
+
+if settings.profiling_sample_rate > 0 or settings.profiling_admin_token:
+    # Installed only when configured so unprofiled deployments pay nothing per request
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=settings.profiling_sample_rate,
+        admin_token=settings.profiling_admin_token,
+        header=settings.profiling_header,
+        output_dir=settings.profiling_dir,
+        max_files=settings.profiling_max_files,
+    )
+
+traffic_recorder = (
+    TrafficRecorder(settings.chat_capture_path, settings.chat_capture_sample_rate)
+    if settings.chat_capture_path
+    else None
+)
+
+
+admission = (
+    AdmissionController(
+        max_in_flight=settings.admission_max_in_flight,
+        max_queue=settings.admission_max_queue,
+        max_wait_s=settings.admission_queue_timeout_ms / 1000,
+    )
+    if settings.admission_enabled
+    else None
+)
 
 
 class ChatMessage(BaseModel):
@@ -32,6 +93,14 @@ def healthz():
     return {"status": "ok"}
 
 
+@app.get("/readyz")
+def readyz():
+    state = getattr(app.state, "warmup", None)
+    if state is None or not state.ready:
+        return JSONResponse(status_code=503, content={"status": "warming"})
+    return {"status": "ready", "timed_out": state.timed_out, "steps": state.steps}
+
+
 @app.get("/")
 def root():
     return {
@@ -39,19 +108,192 @@ def root():
         "message": "Welcome. See /docs for Swagger UI.",
         "endpoints": {
             "GET /healthz": "Liveness probe",
+            "GET /readyz": "Readiness probe (ready once startup warm-up completes)",
             "POST /chat": "Chat with the payments assistant",
+            "GET /transactions": "Export matching transactions as NDJSON with continuation tokens",
+            "GET /merchants/{merchant_id}/summary": "Counts by status, currency, amount band and period",
         },
         "docs": "/docs",
     }
 
 
 @app.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest):
+async def chat(req: ChatRequest, request: Request):
+    """Admission runs on the event loop; only admitted requests reach the thread pool.
+
+    The request's deadline (client header or server default) bounds the admission wait and
+    every downstream call. A client disconnect expires it, so queued and in-flight work stops.
+    """
+    deadline = Deadline(
+        parse_budget_ms(
+            request.headers.get(settings.chat_deadline_header),
+            default_ms=settings.chat_deadline_ms,
+            max_ms=settings.chat_deadline_max_ms,
+        )
+    )
+    watcher = asyncio.create_task(_cancel_on_disconnect(request, deadline))
     try:
-        agent = get_agent_client()
-        msgs = [Message(role=m.role, content=m.content) for m in req.messages]
-        reply = agent.chat(msgs)
+        controller = admission
+        if controller is None:
+            return await run_in_threadpool(_chat, req, deadline)
+        priority = request.headers.get(settings.admission_priority_header, "interactive").lower()
+        try:
+            async with controller.slot(priority, max_wait_s=min(controller.max_wait_s, deadline.remaining())):
+                return await run_in_threadpool(_chat, req, deadline)
+        except Overloaded as ex:
+            return JSONResponse(
+                status_code=429,
+                content={"detail": f"Server busy: {ex.reason}"},
+                headers={"Retry-After": str(ex.retry_after_s)},
+            )
+    finally:
+        watcher.cancel()
+
+
+async def _cancel_on_disconnect(request: Request, deadline: Deadline) -> None:
+    poll_s = settings.chat_disconnect_poll_ms / 1000
+    while not deadline.expired:
+        if await request.is_disconnected():
+            deadline.cancel()
+            logger.info("Client disconnected; cancelling /chat work")
+            return
+        await asyncio.sleep(poll_s)
+
+
+def _chat(req: ChatRequest, deadline: Optional[Deadline] = None) -> ChatResponse | JSONResponse:
+    started_at, t0, status = time.time(), time.perf_counter(), 200
+    try:
+        if deadline is not None and deadline.expired:
+            # Admitted too late: nobody is waiting (499, client closed request) or will be in time
+            status = 499 if deadline.cancelled else 504
+            return JSONResponse(status_code=status, content={"detail": "Request deadline exceeded"})
+        with deadline_scope(deadline), profile_thread():
+            with stage("agent_init"):
+                agent = get_agent_client()
+            msgs = [Message(role=m.role, content=m.content) for m in req.messages]
+            reply = agent.chat(msgs)
         return ChatResponse(reply=reply)
     except Exception as ex:  # pragma: no cover - logged and returned as 500
+        status = 500
         logger.exception("Chat failed: %s", ex)
         raise HTTPException(status_code=500, detail="Agent invocation failed")
+    finally:
+        recorder = traffic_recorder
+        if recorder is not None and recorder.should_capture():
+            recorder.record(
+                "/chat",
+                req.model_dump(),
+                started_at=started_at,
+                latency_s=time.perf_counter() - t0,
+                status=status,
+            )
+
+
+@app.get("/transactions")
+def export_transactions(
+    merchant_id: Optional[str] = None,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    page_size: int = Query(1000, ge=1, le=1000),
+    limit: Optional[int] = Query(None, ge=1),
+    continuation: Optional[str] = None,
+):
+    """Stream matching transactions as NDJSON in `transaction_id` order.
+
+    After every page a `{"@continuation": "<token>"}` line is written; pass the latest one
+    back as `continuation` to resume an interrupted export. The stream ends with
+    `{"@continuation": null, "count": n}` once everything was sent, or with a non-null token
+    when `limit` stopped it early.
+    """
+    filters = and_filters(
+        f"merchant_id eq {odata_literal(merchant_id)}" if merchant_id else None,
+        f"status eq {odata_literal(status)}" if status else None,
+        created_range(created_from, created_to),
+    )
+    try:
+        after = decode_continuation(continuation, filters) if continuation else None
+        search = get_azure_search()
+    except InvalidContinuationToken as ex:
+        raise HTTPException(status_code=400, detail=str(ex))
+    except ValueError:
+        raise HTTPException(status_code=503, detail="Search is not configured")
+
+    def lines() -> Iterator[str]:
+        count = 0
+        for page, last_key in search.iter_pages(filters, page_size=page_size, after=after):
+            for hit in page:
+                yield json.dumps(hit.as_dict(), default=str) + "\n"
+                count += 1
+                if limit is not None and count >= limit:
+                    token = encode_continuation(hit["transaction_id"], filters)
+                    yield json.dumps({"@continuation": token, "count": count}) + "\n"
+                    return
+            yield json.dumps({"@continuation": encode_continuation(last_key, filters)}) + "\n"
+        yield json.dumps({"@continuation": None, "count": count}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+SUMMARY_INTERVALS = ("day", "week", "month", "quarter", "year")
+
+
+@app.get("/merchants/{merchant_id}/summary")
+def merchant_summary(
+    merchant_id: str,
+    status: Optional[List[str]] = Query(None),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    amount_edges: str = Query("10,100,1000,10000", description="Comma-separated amount band edges"),
+    interval: str = Query("day"),
+):
+    """Aggregate a merchant's transactions in Search with facets; no documents are returned.
+
+    `status` may be repeated (e.g. `?status=refunded&status=chargeback`) to scope the counts.
+    """
+    if interval not in SUMMARY_INTERVALS:
+        raise HTTPException(status_code=400, detail=f"interval must be one of {', '.join(SUMMARY_INTERVALS)}")
+    try:
+        edges = [facet_number(e) for e in sorted({float(e) for e in amount_edges.split(",") if e.strip()})]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="amount_edges must be comma-separated finite numbers")
+    try:
+        search = get_azure_search()
+    except ValueError:
+        raise HTTPException(status_code=503, detail="Search is not configured")
+
+    filters = and_filters(
+        f"merchant_id eq {odata_literal(merchant_id)}",
+        any_of("status", status),
+        created_range(created_from, created_to),
+    )
+    facets = ["status,count:50", "currency,count:50", f"created_utc,interval:{interval}"]
+    if edges:
+        facets.append("amount,values:" + "|".join(edges))
+    from azure.core.exceptions import HttpResponseError
+
+    try:
+        agg = search.aggregate(facets, filters=filters)
+    except HttpResponseError as ex:
+        logger.warning("Summary aggregation for %s failed: %s", merchant_id, ex)
+        if ex.status_code is not None and 400 <= ex.status_code < 500:
+            # Usually an index created before amount/created_utc/merchant_id were facetable
+            raise HTTPException(status_code=409, detail=f"The index cannot compute this summary: {ex.message}")
+        raise HTTPException(status_code=502, detail="Search aggregation failed")
+    buckets = agg["facets"]
+
+    def counts(name: str) -> dict:
+        return {b["value"]: b["count"] for b in buckets.get(name, [])}
+
+    return {
+        "merchant_id": merchant_id,
+        "count": agg["count"],
+        "by_status": counts("status"),
+        "by_currency": counts("currency"),
+        "by_amount": [
+            {k: b[k] for k in ("from", "to", "count") if k in b} for b in buckets.get("amount", [])
+        ],
+        f"by_{interval}": [
+            {"start": b["value"], "count": b["count"]} for b in buckets.get("created_utc", [])
+        ],
+    }
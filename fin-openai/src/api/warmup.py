@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from ..agents.agent_client import get_agent_client
+from ..config import Settings
+from ..ml.embeddings import embed_texts
+from ..search.search_client import get_azure_search
+from ..security.managed_identity import get_default_credential
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmupState:
+    """What the readiness probe reports: ready once warm-up finished or timed out."""
+
+    started: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+    ready: bool = False
+    timed_out: bool = False
+    steps: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def run_step(self, name: str, fn: Callable[[], Any]) -> None:
+        t0 = time.perf_counter()
+        try:
+            fn()
+            self.steps[name] = {"ok": True, "ms": round((time.perf_counter() - t0) * 1000, 1)}
+        except Exception as ex:  # a failed step must not keep the instance out of rotation
+            logger.warning("Warm-up step '%s' failed: %s", name, ex)
+            self.steps[name] = {
+                "ok": False,
+                "ms": round((time.perf_counter() - t0) * 1000, 1),
+                "error": type(ex).__name__,
+            }
+
+    def mark_ready(self, *, timed_out: bool = False) -> None:
+        self.timed_out = timed_out
+        self.finished = time.time()
+        self.ready = True
+
+
+def run_warmup(state: WarmupState, settings: Settings) -> None:
+    """Pay the first-request costs up front: credential chain, Key Vault, TLS to OpenAI/Search.
+
+    Steps whose service is not configured are skipped. Runs in a worker thread.
+    """
+    azure_configured = settings.key_vault_uri or settings.azure_search_service
+    if azure_configured:
+        state.run_step("credential", get_default_credential)
+    state.run_step("agent", get_agent_client)
+    if settings.warmup_model_ping and settings.azure_openai_deployment:
+        state.run_step("model", lambda: get_agent_client().ping())
+    if settings.azure_openai_embeddings_deployment:
+        state.run_step("embeddings", lambda: embed_texts(["warm-up"]))
+    if settings.azure_search_service and settings.azure_search_index:
+        state.run_step("search", lambda: get_azure_search().query("*", top=1))
+
+
+async def warm_up(state: WarmupState, settings: Settings) -> None:
+    try:
+        await asyncio.wait_for(
+            asyncio.to_thread(run_warmup, state, settings), timeout=settings.warmup_timeout_s
+        )
+        state.mark_ready()
+        logger.info("Warm-up finished in %.0f ms: %s", (state.finished - state.started) * 1000, state.steps)
+    except asyncio.TimeoutError:
+        # The worker thread keeps going; we just stop holding the instance out of rotation
+        logger.warning("Warm-up exceeded %.1fs; reporting ready anyway", settings.warmup_timeout_s)
+        state.mark_ready(timed_out=True)
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    ns TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (ns, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed);
+"""
+
+
+def make_key(*parts: Any) -> str:
+    """Stable digest of JSON-serializable parts (texts, query options, message lists)."""
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SharedCache:
+    """Key/value cache in a SQLite WAL file shared by every worker process on the host.
+
+    - Readers never block on writers (WAL); each thread keeps its own connection. Writes
+      (including the LRU touch on read) wait at most `busy_timeout_ms` for the write lock and
+      are skipped after that. A read that fails for any SQLite reason is a logged miss
+    - Entries expire after their TTL and the store is trimmed to roughly `max_entries`,
+      least recently used first. Access times are refreshed at most once per
+      `touch_interval_s`, so a hot read is one indexed SELECT and no write
+    - Values are JSON (lists, dicts, strings, numbers), never pickles: anything that can
+      write the file can poison answers but not run code in the workers. The file is
+      created owner-only; do not put secrets in it
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_entries: int = 100_000,
+        default_ttl_s: float = 3600.0,
+        touch_interval_s: float = 60.0,
+        trim_every: int = 256,
+        busy_timeout_ms: int = 50,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.default_ttl_s = default_ttl_s
+        self.touch_interval_s = touch_interval_s
+        self.trim_every = trim_every
+        self.busy_timeout_ms = busy_timeout_ms
+        self._clock = clock
+        self._local = threading.local()
+        if path != ":memory:" and not os.path.exists(path):
+            os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+        conn = self._conn()
+        conn.execute("PRAGMA busy_timeout = 5000")  # startup may wait for another worker's schema setup
+        conn.executescript(_SCHEMA)
+        conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, ns: str, key: str, default: Any = None) -> Any:
+        return self.get_many(ns, [key]).get(key, default)
+
+    def get_many(self, ns: str, keys: Sequence[str]) -> Dict[str, Any]:
+        """Values for the keys that are present and unexpired."""
+        if not keys:
+            return {}
+        now = self._clock()
+        unique = list(dict.fromkeys(keys))
+        rows: List[Any] = []
+        try:
+            conn = self._conn()
+            for i in range(0, len(unique), 500):  # stay under SQLite's bound-parameter limit
+                chunk = unique[i : i + 500]
+                rows += conn.execute(
+                    f"SELECT key, value, accessed FROM cache WHERE ns = ? AND expires > ? "
+                    f"AND key IN ({','.join('?' * len(chunk))})",
+                    (ns, now, *chunk),
+                ).fetchall()
+        except sqlite3.Error as ex:  # locked or corrupt file: a cache read must never fail the request
+            logger.warning("Shared cache read failed; treating as a miss: %s", ex)
+            return {}
+        found: Dict[str, Any] = {}
+        stale: List[str] = []
+        for key, value, accessed in rows:
+            try:
+                found[key] = json.loads(value)
+            except (TypeError, ValueError):  # written by an incompatible version; treat as a miss
+                continue
+            if now - accessed > self.touch_interval_s:
+                stale.append(key)
+        if stale:
+            try:
+                conn.executemany(
+                    "UPDATE cache SET accessed = ? WHERE ns = ? AND key = ?",
+                    [(now, ns, key) for key in stale],
+                )
+            except sqlite3.Error:  # busy: the LRU hint can wait for the next read
+                pass
+        return found
+
+    def set(self, ns: str, key: str, value: Any, *, ttl_s: Optional[float] = None) -> None:
+        self.set_many(ns, {key: value}, ttl_s=ttl_s)
+
+    def set_many(self, ns: str, items: Dict[str, Any], *, ttl_s: Optional[float] = None) -> None:
+        if not items:
+            return
+        now = self._clock()
+        expires = now + (self.default_ttl_s if ttl_s is None else ttl_s)
+        try:
+            rows = [
+                (ns, key, json.dumps(value, separators=(",", ":")), expires, now) for key, value in items.items()
+            ]
+        except (TypeError, ValueError) as ex:
+            logger.warning("Shared cache write skipped; value is not JSON: %s", ex)
+            return
+        try:
+            self._conn().executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as ex:  # a cache write must never fail the request
+            logger.warning("Shared cache write skipped: %s", ex)
+            return
+        if random.random() < len(rows) / self.trim_every:
+            self.trim()
+
+    def trim(self) -> int:
+        """Drop expired entries, then the least recently used ones above `max_entries`."""
+        try:
+            conn = self._conn()
+            removed = conn.execute("DELETE FROM cache WHERE expires <= ?", (self._clock(),)).rowcount
+            (count,) = conn.execute("SELECT count(*) FROM cache").fetchone()
+            if count > self.max_entries:
+                # Trim to 90% so the next trim is not immediately due again
+                excess = count - int(self.max_entries * 0.9)
+                removed += conn.execute(
+                    "DELETE FROM cache WHERE (ns, key) IN "
+                    "(SELECT ns, key FROM cache ORDER BY accessed LIMIT ?)",
+                    (excess,),
+                ).rowcount
+        except sqlite3.Error as ex:
+            logger.warning("Shared cache trim skipped: %s", ex)
+            return 0
+        return removed
+
+    def get_or_set(self, ns: str, key: str, compute: Callable[[], Any], *, ttl_s: Optional[float] = None) -> Any:
+        value = self.get(ns, key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(ns, key, value, ttl_s=ttl_s)
+        return value
+
+    def clear(self, ns: Optional[str] = None) -> None:
+        if ns is None:
+            self._conn().execute("DELETE FROM cache")
+        else:
+            self._conn().execute("DELETE FROM cache WHERE ns = ?", (ns,))
+
+
+@lru_cache
+def get_shared_cache() -> Optional[SharedCache]:
+    """The host-wide cache at `SHARED_CACHE_PATH`, or None when caching is disabled."""
+    settings = get_settings()
+    if not settings.shared_cache_path:
+        return None
+    try:
+        return SharedCache(
+            settings.shared_cache_path,
+            max_entries=settings.shared_cache_max_entries,
+            busy_timeout_ms=settings.shared_cache_busy_timeout_ms,
+        )
+    except sqlite3.Error as ex:  # an unusable file disables the cache instead of failing requests
+        logger.warning("Shared cache at %s disabled: %s", settings.shared_cache_path, ex)
+        return None
@@ -17,6 +17,43 @@ class Settings(BaseSettings):
     azure_search_index: str | None = Field(
         default=None, description="Default Search index to query"
     )
+    azure_search_index_pointer: str | None = Field(
+        default=None,
+        description="File naming the live index (written by scripts/reindex_search.py); overrides AZURE_SEARCH_INDEX",
+    )
+    azure_search_default_select: str | None = Field(
+        default=None,
+        description="Comma-separated fields returned when a query passes no select (never the vector)",
+    )
+    azure_search_federated_indexes: str | None = Field(
+        default=None,
+        description="Comma-separated shards for federated search: name or name|<from>|<to>[|<timeout_ms>]",
+    )
+    azure_search_federated_timeout_ms: int = Field(
+        default=1000, description="Per-index timeout for federated search shards that set none"
+    )
+    azure_search_federated_max_workers: int = Field(
+        default=32, description="Threads shared by federated shard queries"
+    )
+    azure_search_federated_merge: str = Field(
+        default="rrf", description="Federated merge strategy: rrf | score (min-max normalized)"
+    )
+
+    # Retrieval-augmented chat
+    rag_enabled: bool = Field(default=True, description="Ground chat answers in Azure AI Search results")
+    rag_top_k: int = Field(default=5, description="Documents kept after rank fusion")
+    rag_deadline_ms: int = Field(
+        default=800, description="Retrieval budget; partial results are used when it runs out"
+    )
+    rag_context_token_budget: int = Field(
+        default=1500, description="Approximate token budget for retrieved context in the prompt"
+    )
+    rag_max_workers: int = Field(default=16, description="Threads shared by retrieval calls")
+
+    # Transaction rollups (per merchant/day/status/currency aggregates)
+    rollup_db_path: str | None = Field(
+        default=None, description="SQLite file holding incremental transaction rollups"
+    )
 
     # Azure AI Foundry / Agents Service (placeholders)
     azure_ai_agents_endpoint: str | None = Field(
@@ -45,9 +82,105 @@ class Settings(BaseSettings):
         default=None, description="Key Vault secret name that stores Azure OpenAI API key"
     )
 
+    # Local intent router (answers fee/refund questions from the domain tools)
+    intent_router_enabled: bool = Field(
+        default=True, description="Answer unambiguous fee and refund questions without the model"
+    )
+
+    # Azure OpenAI rate governor (shared by chat and embeddings)
+    openai_governor_enabled: bool = Field(
+        default=True, description="Pace Azure OpenAI calls with the shared AIMD rate governor"
+    )
+    openai_tpm_limit: int | None = Field(
+        default=None, description="Deployment tokens-per-minute quota; enables token pacing"
+    )
+    openai_rpm_limit: int | None = Field(
+        default=None, description="Deployment requests-per-minute quota; enables request pacing"
+    )
+    openai_quota_workers: int = Field(
+        default=1, description="Worker processes sharing the quota (uvicorn --workers); each paces at its share"
+    )
+    openai_max_concurrency: int = Field(default=32, description="Upper bound for concurrent calls")
+    openai_bulk_reserve: float = Field(
+        default=0.25, description="Share of concurrency and tokens that bulk work cannot use"
+    )
+    openai_completion_token_estimate: int = Field(
+        default=512, description="Completion tokens assumed per chat call when charging the quota"
+    )
+    openai_queue_timeout_s: float = Field(
+        default=10.0, description="Longest a chat call waits for quota before falling back"
+    )
+
+    # Admission control on /chat (per worker process)
+    admission_enabled: bool = Field(default=True, description="Bound in-flight and queued /chat requests")
+    admission_max_in_flight: int = Field(default=32, description="Concurrent /chat requests per worker")
+    admission_max_queue: int = Field(default=64, description="Requests allowed to wait for a slot")
+    admission_queue_timeout_ms: int = Field(
+        default=2000, description="Queued requests not started within this are answered 429"
+    )
+    admission_priority_header: str = Field(
+        default="x-priority", description="Request header carrying interactive | batch"
+    )
+
+    # Request deadlines on /chat (propagated as timeouts to model, search, embeddings, Key Vault)
+    chat_deadline_ms: int = Field(default=30000, description="Budget for a /chat request without a deadline header")
+    chat_deadline_max_ms: int = Field(default=120000, description="Upper bound on a client-requested budget")
+    chat_deadline_header: str = Field(
+        default="x-request-timeout-ms", description="Request header carrying the client's budget in ms"
+    )
+    chat_disconnect_poll_ms: int = Field(
+        default=250, description="How often /chat checks whether its client has disconnected"
+    )
+
+    # Host-wide shared cache (SQLite WAL file shared by all workers; disabled when unset)
+    shared_cache_path: str | None = Field(
+        default=None, description="SQLite file backing the cross-worker cache; unset disables caching"
+    )
+    shared_cache_max_entries: int = Field(default=100_000, description="Entries kept before LRU trimming")
+    shared_cache_busy_timeout_ms: int = Field(
+        default=50, description="How long a cache write waits for another worker's write lock before skipping"
+    )
+    shared_cache_embedding_ttl_s: float = Field(
+        default=7 * 24 * 3600, description="TTL for cached embeddings (0 disables)"
+    )
+    shared_cache_search_ttl_s: float = Field(default=60, description="TTL for cached search results (0 disables)")
+    shared_cache_chat_ttl_s: float = Field(default=120, description="TTL for cached chat replies (0 disables)")
+
     # Observability
     app_insights_connection_string: str | None = None
 
+    # Profiling (opt-in; the middleware is not installed unless sampling or the admin token is set)
+    profiling_sample_rate: float = Field(
+        default=0.0, description="Fraction of requests to profile (0 disables sampling)"
+    )
+    profiling_admin_token: str | None = Field(
+        default=None, description="Token that forces profiling when sent in the profiling header"
+    )
+    profiling_header: str = Field(
+        default="x-profile-token", description="Request header carrying the profiling admin token"
+    )
+    profiling_dir: str = Field(default="profiles", description="Directory for profile output")
+    profiling_max_files: int = Field(
+        default=100, description="Profiles kept on disk before the oldest are rotated out"
+    )
+
+    # Startup warm-up and readiness
+    warmup_enabled: bool = Field(default=True, description="Warm up clients in the background at startup")
+    warmup_timeout_s: float = Field(
+        default=20.0, description="Report ready after this long even if warm-up has not finished"
+    )
+    warmup_model_ping: bool = Field(
+        default=True, description="Send a 1-token completion during warm-up to open the model connection"
+    )
+
+    # Traffic capture for replay/load testing (opt-in)
+    chat_capture_path: str | None = Field(
+        default=None, description="JSONL file that scrubbed /chat requests are appended to"
+    )
+    chat_capture_sample_rate: float = Field(
+        default=1.0, description="Fraction of /chat requests to capture when capture is enabled"
+    )
+
     # Security
     key_vault_uri: str | None = Field(default=None, description="Key Vault URI if used")
 
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_current: contextvars.ContextVar[Optional["Deadline"]] = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's time budget ran out, or its client disconnected, before a downstream call."""
+
+
+class Deadline:
+    """Absolute time budget for one request, shared by every call made on its behalf.
+
+    Set it for the request with `deadline_scope`; downstream code reads it through
+    `current_deadline`/`call_options`, so no signature in between has to carry it. `cancel()`
+    (on client disconnect) expires it immediately, from any thread.
+    """
+
+    def __init__(self, budget_s: float, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self.budget_s = budget_s
+        self.expires_at = clock() + budget_s
+        self._cancelled = threading.Event()
+
+    def remaining(self) -> float:
+        if self._cancelled.is_set():
+            return 0.0
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def check(self, what: str = "call") -> float:
+        """Seconds left; raises DeadlineExceeded instead of starting `what` with none."""
+        remaining = self.remaining()
+        if remaining <= 0.0:
+            reason = "client disconnected" if self.cancelled else f"deadline of {self.budget_s:.2f}s passed"
+            raise DeadlineExceeded(f"Skipped {what}: {reason}")
+        return remaining
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Make `deadline` current for this context (and threads started with a copy of it)."""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def submit_in_context(pool: Executor, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """`pool.submit` in a copy of the caller's context, so the request deadline (and the
+    profiling session that `stage()` records into) follow the task to its worker thread."""
+    return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def remaining_s(cap: Optional[float] = None) -> Optional[float]:
+    """Time left on the current deadline, at most `cap`; `cap` unchanged when there is none."""
+    deadline = _current.get()
+    if deadline is None:
+        return cap
+    remaining = deadline.remaining()
+    return remaining if cap is None else min(cap, remaining)
+
+
+def call_options(what: str = "call") -> Dict[str, float]:
+    """`timeout=` keyword for an SDK call under the current deadline (`{}` without one).
+
+    Raises DeadlineExceeded when nothing is left, so no call starts that nobody waits for.
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return {}
+    return {"timeout": deadline.check(what)}
+
+
+def bounded_client(client: T, what: str = "call") -> T:
+    """`client` (an OpenAI SDK client) for one call under the current deadline; unchanged without one.
+
+    The SDK's `timeout` applies per attempt, and between its retries it sleeps for the server's
+    retry-after (up to 60s). Under a deadline the call gets the time remaining and no SDK retries,
+    so it cannot outlive the request. Raises DeadlineExceeded when nothing is left.
+    """
+    options = call_options(what)
+    if not options:
+        return client
+    return client.with_options(max_retries=0, **options)  # type: ignore[attr-defined]
+
+
+def parse_budget_ms(value: Optional[str], *, default_ms: int, max_ms: int) -> float:
+    """Request budget in seconds from a header value in milliseconds, clamped to `max_ms`."""
+    budget_ms: float = default_ms
+    if value:
+        try:
+            budget_ms = float(value)
+        except ValueError:
+            logger.debug("Ignoring malformed deadline header %r", value)
+        else:
+            if budget_ms <= 0:
+                budget_ms = default_ms
+    return min(budget_ms, max_ms) / 1000
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ...config import get_settings
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ("merchant_id", "day", "status", "currency")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    merchant_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    status TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    txn_count INTEGER NOT NULL,
+    amount_sum REAL NOT NULL,
+    amount_min REAL NOT NULL,
+    amount_max REAL NOT NULL,
+    PRIMARY KEY (merchant_id, day, status, currency)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ingested (
+    transaction_id TEXT PRIMARY KEY,
+    merchant_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    status TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    amount REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ingested_group ON ingested (merchant_id, day, status, currency);
+"""
+
+_UPSERT = """
+INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (merchant_id, day, status, currency) DO UPDATE SET
+    txn_count = txn_count + excluded.txn_count,
+    amount_sum = amount_sum + excluded.amount_sum,
+    amount_min = min(amount_min, excluded.amount_min),
+    amount_max = max(amount_max, excluded.amount_max)
+"""
+
+Group = Tuple[str, str, str, str]
+
+
+def utc_day(created_utc: Any) -> str:
+    """Calendar day (UTC, `YYYY-MM-DD`) of an ISO timestamp or datetime."""
+    if isinstance(created_utc, datetime):
+        value = created_utc
+    else:
+        value = datetime.fromisoformat(str(created_utc).replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date().isoformat()
+
+
+def _day_bound(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value.isoformat()
+    return utc_day(value)
+
+
+class RollupStore:
+    """Incrementally maintained count/sum/min/max per (merchant, day, status, currency).
+
+    Rows are applied as they are ingested; each transaction is remembered by id, so re-running
+    an ingest does not double count, and a transaction whose status or amount changed moves
+    from its old group to its new one. Queries read the small rollup table only.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def apply(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Fold transaction rows into the rollups; returns how many rows changed anything."""
+        facts: Dict[str, Tuple[str, str, str, str, float]] = {}
+        for row in rows:
+            facts[str(row["transaction_id"])] = (
+                str(row["merchant_id"]),
+                utc_day(row["created_utc"]),
+                str(row["status"]),
+                str(row["currency"]),
+                float(row["amount"]),
+            )
+        if not facts:
+            return 0
+
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                previous = self._previous(list(facts))
+                changed = [t for t, fact in facts.items() if previous.get(t) != fact]
+                conn.executemany(
+                    "INSERT OR REPLACE INTO ingested VALUES (?, ?, ?, ?, ?, ?)",
+                    [(t, *facts[t]) for t in changed],
+                )
+                # Groups that lost a row are rebuilt from `ingested` (min/max cannot be
+                # decremented); everything else is a cheap additive upsert.
+                retracted = {previous[t][:4] for t in changed if t in previous}
+                for group in retracted:
+                    self._recompute(group)
+                added: Dict[Group, List[float]] = {}
+                for t in changed:
+                    if facts[t][:4] not in retracted:
+                        added.setdefault(facts[t][:4], []).append(facts[t][4])
+                conn.executemany(
+                    _UPSERT,
+                    [
+                        (*group, len(amounts), sum(amounts), min(amounts), max(amounts))
+                        for group, amounts in added.items()
+                    ],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return len(changed)
+
+    def _previous(self, ids: Sequence[str]) -> Dict[str, Tuple[str, str, str, str, float]]:
+        found: Dict[str, Tuple[str, str, str, str, float]] = {}
+        for i in range(0, len(ids), 500):  # stay under SQLite's bound-parameter limit
+            chunk = ids[i : i + 500]
+            marks = ",".join("?" * len(chunk))
+            for txn_id, *fact in self._conn.execute(
+                f"SELECT transaction_id, merchant_id, day, status, currency, amount "
+                f"FROM ingested WHERE transaction_id IN ({marks})",
+                chunk,
+            ):
+                found[txn_id] = tuple(fact)  # type: ignore[assignment]
+        return found
+
+    def _recompute(self, group: Group) -> None:
+        where = "merchant_id = ? AND day = ? AND status = ? AND currency = ?"
+        self._conn.execute(f"DELETE FROM rollups WHERE {where}", group)
+        self._conn.execute(
+            f"INSERT INTO rollups SELECT merchant_id, day, status, currency, count(*), "
+            f"sum(amount), min(amount), max(amount) FROM ingested WHERE {where} "
+            f"GROUP BY merchant_id, day, status, currency",
+            group,
+        )
+
+    def status_of(self, transaction_id: str) -> Optional[str]:
+        """Last ingested status of a transaction, or None if it was never ingested."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM ingested WHERE transaction_id = ?", (transaction_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def query(
+        self,
+        *,
+        merchant_id: Optional[str] = None,
+        start: Any = None,
+        end: Any = None,
+        status: Optional[Sequence[str]] = None,
+        currency: Optional[Sequence[str]] = None,
+        group_by: Sequence[str] = (),
+    ) -> List[Dict[str, Any]]:
+        """Totals over the rollups, optionally grouped by any of `DIMENSIONS`.
+
+        `start` is inclusive and `end` exclusive (dates, datetimes or ISO strings; compared
+        by UTC day). Each row has the group columns plus `count`, `sum`, `min` and `max`.
+        """
+        unknown = set(group_by) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Cannot group by {sorted(unknown)}; choose from {DIMENSIONS}")
+        clauses: List[str] = []
+        params: List[Any] = []
+        if merchant_id is not None:
+            clauses.append("merchant_id = ?")
+            params.append(merchant_id)
+        if start is not None:
+            clauses.append("day >= ?")
+            params.append(_day_bound(start))
+        if end is not None:
+            clauses.append("day < ?")
+            params.append(_day_bound(end))
+        for column, values in (("status", status), ("currency", currency)):
+            if values:
+                clauses.append(f"{column} IN ({','.join('?' * len(values))})")
+                params.extend(values)
+
+        columns = list(group_by)
+        sql = (
+            "SELECT "
+            + "".join(f"{c}, " for c in columns)
+            + "sum(txn_count), sum(amount_sum), min(amount_min), max(amount_max) FROM rollups"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if columns:
+            sql += f" GROUP BY {', '.join(columns)} ORDER BY {', '.join(columns)}"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        out: List[Dict[str, Any]] = []
+        for row in rows:
+            count = row[len(columns)]
+            if not count:
+                continue
+            record = dict(zip(columns, row))
+            record.update(
+                count=count,
+                sum=round(row[len(columns) + 1], 2),
+                min=row[len(columns) + 2],
+                max=row[len(columns) + 3],
+            )
+            out.append(record)
+        return out
+
+
+@lru_cache
+def get_rollup_store() -> RollupStore:
+    """Shared RollupStore at `ROLLUP_DB_PATH`."""
+    path = get_settings().rollup_db_path
+    if not path:
+        raise ValueError("ROLLUP_DB_PATH is not configured")
+    return RollupStore(path)
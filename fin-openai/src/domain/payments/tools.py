@@ -1,7 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, Optional
+
+from .rollups import RollupStore, get_rollup_store
+
+# Standard blended pricing; the intent router quotes these in its replies
+FEE_RATE = 0.029
+FEE_FIXED = 0.30
 
 
 @dataclass
@@ -12,10 +18,32 @@ class Transaction:
     status: str  # authorized | captured | settled | refunded | chargeback
 
 
-def calculate_fees(amount: float, rate: float = 0.029, fixed: float = 0.30) -> float:
+def calculate_fees(amount: float, rate: float = FEE_RATE, fixed: float = FEE_FIXED) -> float:
     """Calculate processing fees using a typical blended model."""
     return round(amount * rate + fixed, 2)
 
 
 def can_refund(status: str) -> bool:
     return status in {"captured", "settled"}
+
+
+def merchant_volume(
+    merchant_id: str,
+    start: Any = None,
+    end: Any = None,
+    *,
+    store: Optional[RollupStore] = None,
+) -> Dict[str, Any]:
+    """Transaction volume for a merchant from the rollups: totals, status/currency mix, refund rate."""
+    store = store or get_rollup_store()
+    by_status = store.query(merchant_id=merchant_id, start=start, end=end, group_by=["status"])
+    by_currency = store.query(merchant_id=merchant_id, start=start, end=end, group_by=["currency"])
+    count = sum(r["count"] for r in by_status)
+    refunded = sum(r["count"] for r in by_status if r["status"] in {"refunded", "chargeback"})
+    return {
+        "merchant_id": merchant_id,
+        "count": count,
+        "by_status": {r["status"]: {"count": r["count"], "sum": r["sum"]} for r in by_status},
+        "by_currency": {r["currency"]: {"count": r["count"], "sum": r["sum"]} for r in by_currency},
+        "refund_rate": round(refunded / count, 4) if count else 0.0,
+    }
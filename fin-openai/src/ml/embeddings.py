@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 import os
-from typing import List
-
-from openai import OpenAI
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional
 
+from ..cache.shared_cache import get_shared_cache, make_key
 from ..config import get_settings
+from ..deadline import bounded_client, remaining_s
+from ..observability.profiling import stage
 from ..security.key_vault import get_secret
+from .rate_governor import governed, http_client
+from .tokens import estimate_tokens
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 
+@lru_cache
 def _get_openai_client_for_embeddings() -> OpenAI:
     settings = get_settings()
     if not (
@@ -32,19 +40,52 @@ def _get_openai_client_for_embeddings() -> OpenAI:
         f"{settings.azure_openai_embeddings_deployment}"
     )
     api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-06-01")
-    return OpenAI(base_url=base_url, api_key=api_key, default_headers={"api-version": api_version})
+    from openai import OpenAI
+
+    return OpenAI(
+        base_url=base_url,
+        api_key=api_key,
+        default_headers={"api-version": api_version},
+        http_client=http_client(),
+    )
 
 
-def embed_texts(texts: List[str]) -> List[List[float]]:
+def embed_texts(
+    texts: List[str], *, client: Optional[OpenAI] = None, priority: str = "bulk"
+) -> List[List[float]]:
     """Return embeddings for a list of texts using the configured Azure OpenAI deployment.
 
     Notes:
     - For text-embedding-3-large the vector length is 3072.
     - Input size/throughput limits depend on your deployment SKU/region.
+    - Pass `client` to reuse an existing (or fake) OpenAI client.
+    - Calls go through the shared rate governor; query-time callers pass `priority="interactive"`.
+    - With the shared cache enabled, only texts no worker has embedded recently are sent.
     """
-    client = _get_openai_client_for_embeddings()
     settings = get_settings()
     # The SDK requires model param; for Azure, pass the deployment name
     model = settings.azure_openai_embeddings_deployment  # type: ignore[arg-type]
-    resp = client.embeddings.create(model=model, input=texts)
+    cache = get_shared_cache()
+    if cache is None or settings.shared_cache_embedding_ttl_s <= 0:
+        return _create_embeddings(texts, model, client=client, priority=priority)
+
+    keys = [make_key(model, t) for t in texts]
+    vectors = cache.get_many("embeddings", keys)
+    todo = {k: t for k, t in zip(keys, texts) if k not in vectors}
+    if todo:
+        fresh = dict(zip(todo, _create_embeddings(list(todo.values()), model, client=client, priority=priority)))
+        cache.set_many("embeddings", fresh, ttl_s=settings.shared_cache_embedding_ttl_s)
+        vectors.update(fresh)
+    return [vectors[k] for k in keys]
+
+
+def _create_embeddings(
+    texts: List[str], model: Optional[str], *, client: Optional[OpenAI], priority: str
+) -> List[List[float]]:
+    client = client or _get_openai_client_for_embeddings()
+    tokens = sum(estimate_tokens(t) for t in texts)
+    with governed(tokens, priority=priority, timeout=remaining_s()) as permit, stage("embeddings"):
+        resp = bounded_client(client, "embeddings").embeddings.create(model=model, input=texts)
+        if permit is not None:
+            permit.used_tokens = getattr(getattr(resp, "usage", None), "total_tokens", None)
     return [d.embedding for d in resp.data]
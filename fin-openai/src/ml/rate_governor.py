@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {"interactive": 0, "bulk": 1}
+
+
+class RateLimitTimeout(TimeoutError):
+    """No capacity became available within the caller's wait budget."""
+
+
+class _Bucket:
+    """Token bucket refilled continuously at `per_minute / 60` per second."""
+
+    def __init__(self, per_minute: float, *, burst_s: float, now: float) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_s)
+        self.level = self.capacity
+        self._last = now
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._last) * self.rate)
+        self._last = now
+
+    def wait_for(self, amount: float) -> float:
+        return max(0.0, (amount - self.level) / self.rate)
+
+
+@dataclass
+class Permit:
+    tokens: int
+    priority: str
+    granted_at: float
+    waited_s: float
+    used_tokens: Optional[int] = None  # set by the caller from the response's usage, if known
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    for name, scale in (("retry-after-ms", 0.001), ("x-ms-retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value:
+            try:
+                return float(value) * scale
+            except ValueError:
+                continue
+    return None
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    """A numeric header, or None when absent or malformed (a bad header must not fail the call)."""
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        logger.debug("Ignoring malformed %s header %r", name, value)
+        return None
+
+
+def _is_throttle(ex: BaseException) -> bool:
+    return getattr(ex, "status_code", None) == 429
+
+
+class RateGovernor:
+    """Shared admission control for Azure OpenAI calls that draw on one TPM/RPM quota.
+
+    - Concurrency follows AIMD: +1 per window of successful calls, halved on a 429
+    - Optional token and request buckets pace calls to the configured per-minute quota,
+      charged with local token estimates and corrected from `x-ratelimit-remaining-*`
+    - A 429's `retry-after` pauses every new admission, not just the request that hit it
+    - `interactive` callers are always admitted ahead of `bulk` ones, and bulk work cannot
+      use the last `bulk_reserve` share of concurrency or tokens
+    """
+
+    def __init__(
+        self,
+        *,
+        tokens_per_minute: Optional[float] = None,
+        requests_per_minute: Optional[float] = None,
+        max_concurrency: int = 32,
+        min_concurrency: int = 1,
+        initial_concurrency: Optional[int] = None,
+        bulk_reserve: float = 0.25,
+        decrease_factor: float = 0.5,
+        burst_s: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        now = clock()
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.bulk_reserve = bulk_reserve
+        self.decrease_factor = decrease_factor
+        self.limit = float(initial_concurrency or max(min_concurrency, max_concurrency // 4))
+        self.in_flight = 0
+        self.tokens = _Bucket(tokens_per_minute, burst_s=burst_s, now=now) if tokens_per_minute else None
+        self.requests = _Bucket(requests_per_minute, burst_s=burst_s, now=now) if requests_per_minute else None
+        self.paused_until = 0.0
+        self.throttled = 0
+        self._last_decrease = -math.inf
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+
+    # Admission
+
+    def _capacity(self, rank: int) -> int:
+        share = 1.0 if rank == 0 else 1.0 - self.bulk_reserve
+        return max(1, int(self.limit * share))
+
+    def _blocked_for(self, tokens: int, rank: int, now: float) -> Optional[float]:
+        """0 when admissible now; else seconds until it might be (None: wait for a release)."""
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight >= self._capacity(rank):
+            return None
+        waits = [0.0]
+        if self.requests is not None:
+            self.requests.refill(now)
+            waits.append(self.requests.wait_for(1.0))
+        if self.tokens is not None:
+            self.tokens.refill(now)
+            need = min(tokens, self.tokens.capacity)
+            if rank > 0:
+                need = min(need + self.bulk_reserve * self.tokens.capacity, self.tokens.capacity)
+            waits.append(self.tokens.wait_for(need))
+        return max(waits)
+
+    def acquire(self, tokens: int, *, priority: str = "interactive", timeout: Optional[float] = None) -> Permit:
+        rank = PRIORITIES[priority]
+        start = self._clock()
+        deadline = None if timeout is None else start + timeout
+        entry = (rank, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = self._clock()
+                    blocked = self._blocked_for(tokens, rank, now)
+                    if self._waiters[0] == entry and blocked == 0:
+                        heapq.heappop(self._waiters)
+                        self.in_flight += 1
+                        if self.requests is not None:
+                            self.requests.level -= 1
+                        if self.tokens is not None:
+                            self.tokens.level -= min(tokens, self.tokens.capacity)
+                        self._cond.notify_all()
+                        return Permit(tokens, priority, now, now - start)
+                    if deadline is not None and now >= deadline:
+                        raise RateLimitTimeout(
+                            f"No Azure OpenAI capacity for a {priority} call within {timeout:.1f}s"
+                        )
+                    wait_s = 0.25 if not blocked else min(blocked, 0.25)
+                    if deadline is not None:
+                        wait_s = min(wait_s, deadline - now)
+                    self._cond.wait(max(wait_s, 0.001))
+            except BaseException:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+
+    def release(self, permit: Permit, *, throttled: bool = False, used_tokens: Optional[int] = None) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self._decrease(self._clock())
+            elif self._clock() >= self.paused_until:
+                # Additive increase: about +1 once a full window of calls has succeeded
+                self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+            if used_tokens is not None and self.tokens is not None:
+                # Settle the estimate against what the service actually counted
+                charged = min(permit.tokens, self.tokens.capacity)
+                self.tokens.level = min(self.tokens.capacity, self.tokens.level + charged - used_tokens)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(
+        self, tokens: int, *, priority: str = "interactive", timeout: Optional[float] = None
+    ) -> Iterator[Permit]:
+        permit = self.acquire(tokens, priority=priority, timeout=timeout)
+        try:
+            yield permit
+        except BaseException as ex:
+            self.release(permit, throttled=_is_throttle(ex))
+            raise
+        self.release(permit, used_tokens=permit.used_tokens)
+
+    # Feedback from responses
+
+    def _decrease(self, now: float) -> None:
+        # At most one multiplicative decrease per second, however many calls see the same 429 burst
+        if now - self._last_decrease >= 1.0:
+            self.limit = max(float(self.min_concurrency), self.limit * self.decrease_factor)
+            self._last_decrease = now
+            self.throttled += 1
+            logger.info("Azure OpenAI throttled; concurrency limit now %.1f", self.limit)
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Fold one HTTP response's rate-limit signals into the governor."""
+        now = self._clock()
+        with self._cond:
+            remaining_tokens = _header_number(headers, "x-ratelimit-remaining-tokens")
+            remaining_requests = _header_number(headers, "x-ratelimit-remaining-requests")
+            if remaining_tokens is not None and self.tokens is not None:
+                self.tokens.refill(now)
+                self.tokens.level = min(self.tokens.level, remaining_tokens)
+            if remaining_requests is not None and self.requests is not None:
+                self.requests.refill(now)
+                self.requests.level = min(self.requests.level, remaining_requests)
+            exhausted = remaining_tokens == 0 or remaining_requests == 0
+            if status_code == 429 or exhausted:
+                pause = _retry_after(headers) or 1.0
+                self.paused_until = max(self.paused_until, now + pause)
+                if status_code == 429:
+                    self._decrease(now)
+            self._cond.notify_all()
+
+    def http_hook(self, response: Any) -> None:
+        """httpx `event_hooks["response"]` callback: sees every response, SDK retries included."""
+        self.observe(response.status_code, response.headers)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiters),
+                "throttled": self.throttled,
+                "paused_s": round(max(0.0, self.paused_until - self._clock()), 3),
+            }
+
+
+@lru_cache
+def get_rate_governor() -> Optional[RateGovernor]:
+    """The process-wide governor shared by chat and embeddings (None when disabled).
+
+    The quota is per deployment but the governor is per process, so each of the
+    `OPENAI_QUOTA_WORKERS` processes paces at its share of it.
+    """
+    settings = get_settings()
+    if not settings.openai_governor_enabled:
+        return None
+    workers = max(1, settings.openai_quota_workers)
+    return RateGovernor(
+        tokens_per_minute=settings.openai_tpm_limit / workers if settings.openai_tpm_limit else None,
+        requests_per_minute=settings.openai_rpm_limit / workers if settings.openai_rpm_limit else None,
+        max_concurrency=settings.openai_max_concurrency,
+        bulk_reserve=settings.openai_bulk_reserve,
+    )
+
+
+def governed(tokens: int, *, priority: str = "interactive", timeout: Optional[float] = None) -> ContextManager[Any]:
+    governor = get_rate_governor()
+    if governor is None:
+        return nullcontext()
+    return governor.slot(tokens, priority=priority, timeout=timeout)
+
+
+def http_client() -> Any:
+    """httpx client for OpenAI SDK clients, reporting every response to the governor."""
+    from openai import DefaultHttpxClient
+
+    governor = get_rate_governor()
+    hooks = {"response": [governor.http_hook]} if governor is not None else {}
+    return DefaultHttpxClient(event_hooks=hooks)
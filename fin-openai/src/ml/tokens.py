@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+# Roughly 4 characters per token for English text on OpenAI tokenizers. Good enough for
+# budgeting; we avoid loading a tokenizer on the request path.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
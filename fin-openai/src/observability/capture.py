@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+import logging
+import random
+import re
+import threading
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+# Card numbers (13-19 digits, optionally space/dash separated), e-mail addresses and other
+# long digit runs (account/routing numbers) never leave the process unmasked.
+_PAN = re.compile(r"\b(?:\d[ -]?){12,18}\d\b")
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_LONG_DIGITS = re.compile(r"\b\d{9,}\b")
+
+
+def scrub(text: str) -> str:
+    """Mask card numbers, e-mail addresses and long digit runs in free text."""
+    text = _PAN.sub("[PAN]", text)
+    text = _EMAIL.sub("[EMAIL]", text)
+    return _LONG_DIGITS.sub("[NUMBER]", text)
+
+
+def scrub_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return scrub(value)
+    if isinstance(value, dict):
+        return {k: scrub_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [scrub_value(v) for v in value]
+    return value
+
+
+class TrafficRecorder:
+    """Appends scrubbed request bodies and timings to a JSONL capture file.
+
+    Each line is `{"ts", "path", "status", "latency_ms", "body"}`; `ts` is the wall-clock
+    start time so `scripts/replay_chat.py` can reproduce the original pacing.
+    """
+
+    def __init__(self, path: str, sample_rate: float = 1.0) -> None:
+        self.path = path
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+
+    def should_capture(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def record(
+        self,
+        path: str,
+        body: Dict[str, Any],
+        *,
+        started_at: float,
+        latency_s: float,
+        status: int,
+    ) -> None:
+        line = json.dumps(
+            {
+                "ts": round(started_at, 6),
+                "path": path,
+                "status": status,
+                "latency_ms": round(latency_s * 1000, 3),
+                "body": scrub_value(body),
+            },
+            separators=(",", ":"),
+        )
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError:  # pragma: no cover - capture must never fail a request
+            logger.exception("Failed to append to capture file %s", self.path)
+
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import hmac
+import json
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+import anyio
+
+logger = logging.getLogger(__name__)
+
+_current: contextvars.ContextVar[Optional["ProfileSession"]] = contextvars.ContextVar(
+    "profile_session", default=None
+)
+
+# cProfile hooks are per thread and the event loop thread is shared by every request,
+# so only one request is profiled at a time; others are simply not sampled.
+_slot = threading.Lock()
+
+# From 3.12 cProfile is built on sys.monitoring: the middleware's profiler already sees every
+# thread, and enabling a second one while it runs raises ValueError
+_PROFILER_SEES_ALL_THREADS = sys.version_info >= (3, 12)
+
+
+@dataclass
+class ProfileSession:
+    """Per-request profiling state: stage timings plus the cProfile collectors."""
+
+    request_id: str
+    method: str
+    path: str
+    reason: str
+    started: float = field(default_factory=time.perf_counter)
+    stages: List[Dict[str, Any]] = field(default_factory=list)
+    profilers: List[cProfile.Profile] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, name: str, start: float, duration: float) -> None:
+        entry = {
+            "stage": name,
+            "start_ms": round((start - self.started) * 1000, 3),
+            "duration_ms": round(duration * 1000, 3),
+            "thread": threading.current_thread().name,
+        }
+        with self._lock:
+            self.stages.append(entry)
+
+    def add_profiler(self, profiler: cProfile.Profile) -> None:
+        with self._lock:
+            self.profilers.append(profiler)
+
+
+def current_session() -> Optional[ProfileSession]:
+    return _current.get()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a pipeline stage when the current request is being profiled.
+
+    Outside a profiled request this is a single context-variable lookup.
+    """
+    session = _current.get()
+    if session is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        session.record(name, t0, time.perf_counter() - t0)
+
+
+@contextmanager
+def profile_thread() -> Iterator[None]:
+    """Extend the request's call-stack profile to the current worker thread.
+
+    Sync endpoints run in the threadpool, which the middleware's profiler (bound to the
+    event loop thread) cannot see before Python 3.12. From 3.12 it can, and this is a no-op.
+    """
+    session = _current.get()
+    if session is None or _PROFILER_SEES_ALL_THREADS:
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as ex:  # another profiling tool is active; stage timings still work
+        logger.debug("Skipping the worker-thread profile: %s", ex)
+        yield
+        return
+    session.add_profiler(profiler)
+    try:
+        yield
+    finally:
+        profiler.disable()
+
+
+class ProfileWriter:
+    """Writes `<id>.prof` (pstats) and `<id>.json` (stage breakdown) and rotates old pairs."""
+
+    def __init__(self, output_dir: str, max_files: int = 100) -> None:
+        self.output_dir = output_dir
+        self.max_files = max(1, max_files)
+
+    def write(self, session: ProfileSession, status: Optional[int], total: float) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        now = time.time_ns()
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now // 10**9))
+        stem = f"{stamp}.{now % 10**9:09d}-{session.request_id}"
+        base = os.path.join(self.output_dir, stem)
+
+        if session.profilers:
+            stats = pstats.Stats(*session.profilers)
+            stats.dump_stats(base + ".prof")
+
+        summary = {
+            "request_id": session.request_id,
+            "method": session.method,
+            "path": session.path,
+            "reason": session.reason,
+            "status": status,
+            "total_ms": round(total * 1000, 3),
+            "stages": sorted(session.stages, key=lambda s: s["start_ms"]),
+        }
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+        self._rotate()
+        return base
+
+    def _rotate(self) -> None:
+        stems = sorted(
+            name[: -len(".json")] for name in os.listdir(self.output_dir) if name.endswith(".json")
+        )
+        for stem in stems[: max(0, len(stems) - self.max_files)]:
+            for ext in (".json", ".prof"):
+                try:
+                    os.remove(os.path.join(self.output_dir, stem + ext))
+                except FileNotFoundError:
+                    pass
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles a sampled fraction of requests, or any request that
+    carries the admin token in the profiling header.
+
+    Only install it when profiling is configured; see `src/api/main.py`.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        *,
+        sample_rate: float = 0.0,
+        admin_token: Optional[str] = None,
+        header: str = "x-profile-token",
+        output_dir: str = "profiles",
+        max_files: int = 100,
+    ) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.admin_token = admin_token
+        self.header = header.lower().encode("latin-1")
+        self.writer = ProfileWriter(output_dir, max_files)
+
+    def _reason(self, scope: Dict[str, Any]) -> Optional[str]:
+        if self.admin_token:
+            for name, value in scope.get("headers", ()):
+                if name == self.header:
+                    if hmac.compare_digest(value.decode("latin-1"), self.admin_token):
+                        return "header"
+                    break
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        reason = self._reason(scope)
+        if reason is None or not _slot.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        session = ProfileSession(
+            request_id=uuid.uuid4().hex[:12],
+            method=scope.get("method", ""),
+            path=scope.get("path", ""),
+            reason=reason,
+        )
+        status: Optional[int] = None
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as ex:  # another profiler or coverage tool owns the hook
+            _slot.release()
+            logger.debug("Skipping the request profile: %s", ex)
+            await self.app(scope, receive, send)
+            return
+        token = _current.set(session)
+        session.add_profiler(profiler)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            _current.reset(token)
+            total = time.perf_counter() - session.started
+            _slot.release()
+            try:
+                await anyio.to_thread.run_sync(self.writer.write, session, status, total)
+            except Exception:  # pragma: no cover - profiling must never fail a request
+                logger.exception("Failed to write request profile")
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Sequence
+
+
+def percentile(sorted_samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_samples)))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+def latency_summary(samples_s: Sequence[float]) -> Dict[str, float]:
+    """Summarize latencies given in seconds as count/mean/p50/p95/p99/max in milliseconds."""
+    ordered = sorted(samples_s)
+    count = len(ordered)
+    return {
+        "count": count,
+        "mean_ms": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if count else 0.0,
+    }
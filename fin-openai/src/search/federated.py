@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..config import get_settings
+from ..deadline import submit_in_context
+from ..observability.profiling import stage
+from .filters import and_filters, created_range
+from .ranking import normalized_score_merge, reciprocal_rank_fusion
+from .search_client import AzureSearch
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache
+def _executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=get_settings().azure_search_federated_max_workers, thread_name_prefix="federated-search"
+    )
+
+
+def _parse_date(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class IndexShard:
+    """One index in the federation, optionally covering a `created_utc` range [start, end)."""
+
+    index_name: str
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    timeout_s: Optional[float] = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "IndexShard":
+        """Parse `name`, `name|<from>|<to>` or `name|<from>|<to>|<timeout_ms>`.
+
+        Dates are ISO; any field after the name may be empty. Without a timeout the shard uses
+        the federation's default.
+        """
+        name, start, end, timeout_ms = (spec.strip().split("|") + ["", "", ""])[:4]
+        return cls(
+            index_name=name,
+            created_from=_parse_date(start) if start else None,
+            created_to=_parse_date(end) if end else None,
+            timeout_s=float(timeout_ms) / 1000 if timeout_ms else None,
+        )
+
+    def overlaps(self, start: Optional[datetime], end: Optional[datetime]) -> bool:
+        if start is not None and self.created_to is not None and start >= self.created_to:
+            return False
+        if end is not None and self.created_from is not None and end <= self.created_from:
+            return False
+        return True
+
+
+@dataclass
+class FederatedResult:
+    documents: List[Dict[str, Any]] = field(default_factory=list)
+    searched: List[str] = field(default_factory=list)
+    pruned: List[str] = field(default_factory=list)
+    timed_out: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.timed_out or self.failed)
+
+
+class FederatedSearch:
+    """Fan one query out to several indexes concurrently and merge the top hits locally.
+
+    Latency tracks the slowest index that answers within its timeout rather than the sum of
+    all of them. Shards whose `created_utc` range cannot match the query are never called.
+    """
+
+    def __init__(
+        self,
+        shards: Sequence[IndexShard],
+        *,
+        clients: Optional[Dict[str, AzureSearch]] = None,
+        timeout_s: float = 1.0,
+        merge: str = "rrf",
+        key_field: str = "transaction_id",
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        if merge not in ("rrf", "score"):
+            raise ValueError("merge must be 'rrf' or 'score'")
+        self.shards = list(shards)
+        self.timeout_s = timeout_s
+        self.merge = merge
+        self.key_field = key_field
+        self._executor = executor
+        self._clients: Dict[str, AzureSearch] = dict(clients or {})
+        for shard in self.shards:
+            if shard.index_name not in self._clients:
+                self._clients[shard.index_name] = AzureSearch(index_name=shard.index_name)
+
+    def _timed_query(self, client: AzureSearch, **kwargs: Any) -> Tuple[List[Dict[str, Any]], float]:
+        return client.query(**kwargs), time.monotonic()
+
+    def query(
+        self,
+        query_text: str,
+        *,
+        top: int = 5,
+        filters: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        select: Optional[List[str]] = None,
+        semantic: bool = False,
+    ) -> FederatedResult:
+        t0 = time.monotonic()
+        result = FederatedResult()
+        combined_filter = and_filters(filters, created_range(created_from, created_to))
+        pool = self._executor or _executor()
+
+        futures = {}
+        deadlines = {}
+        for shard in self.shards:
+            if not shard.overlaps(created_from, created_to):
+                result.pruned.append(shard.index_name)
+                continue
+            fut = submit_in_context(
+                pool,
+                self._timed_query,
+                self._clients[shard.index_name],
+                query_text=query_text,
+                top=top,
+                filters=combined_filter,
+                select=select,
+                semantic=semantic,
+            )
+            futures[fut] = shard.index_name
+            deadlines[fut] = t0 + (shard.timeout_s if shard.timeout_s is not None else self.timeout_s)
+
+        ranked: List[List[Dict[str, Any]]] = []
+        if futures:
+            with stage("federated_search"):
+                wait(list(futures), timeout=max(0.0, max(deadlines.values()) - time.monotonic()))
+            for fut, name in futures.items():
+                if not fut.done():
+                    result.timed_out.append(name)  # keeps running in the background, unused
+                    continue
+                try:
+                    docs, finished = fut.result()
+                except Exception as ex:
+                    logger.warning("Federated query against '%s' failed: %s", name, ex)
+                    result.failed.append(name)
+                    continue
+                if finished > deadlines[fut]:
+                    result.timed_out.append(name)
+                    continue
+                result.searched.append(name)
+                ranked.append(docs)
+
+        if self.merge == "rrf":
+            result.documents = reciprocal_rank_fusion(ranked, key=self.key_field, top=top)
+        else:
+            result.documents = normalized_score_merge(ranked, key=self.key_field, top=top)
+        result.elapsed_ms = round((time.monotonic() - t0) * 1000, 1)
+        if result.partial:
+            logger.info(
+                "Federated search partial: timed out %s, failed %s", result.timed_out, result.failed
+            )
+        return result
+
+
+@lru_cache
+def get_federated_search() -> FederatedSearch:
+    """FederatedSearch over `AZURE_SEARCH_FEDERATED_INDEXES` (comma-separated shard specs)."""
+    settings = get_settings()
+    if not settings.azure_search_federated_indexes:
+        raise ValueError("AZURE_SEARCH_FEDERATED_INDEXES is not configured")
+    shards = [
+        IndexShard.parse(spec)
+        for spec in settings.azure_search_federated_indexes.split(",")
+        if spec.strip()
+    ]
+    return FederatedSearch(
+        shards,
+        timeout_s=settings.azure_search_federated_timeout_ms / 1000,
+        merge=settings.azure_search_federated_merge,
+    )
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Iterable, Optional
+
+# `search.in` delimiters, tried in order until one appears in none of the values
+_IN_DELIMITERS = ("|", ",", ";", "~", "^")
+
+
+def odata_literal(value: Any) -> str:
+    """Render a Python value as an OData literal for Azure AI Search `$filter` expressions."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def and_filters(*parts: Optional[str]) -> Optional[str]:
+    """Join non-empty filter expressions with `and`; None when there is nothing to filter."""
+    present = [p for p in parts if p]
+    if len(present) <= 1:
+        return present[0] if present else None
+    return " and ".join(f"({p})" for p in present)
+
+
+def any_of(field: str, values: Optional[Iterable[str]]) -> Optional[str]:
+    """`search.in(field, ...)` over string values; None when `values` is empty.
+
+    The delimiter is one no value contains; if every candidate occurs, the values are
+    or-ed `eq` comparisons instead.
+    """
+    items = [str(v) for v in values or () if v]
+    if not items:
+        return None
+    if len(items) == 1:
+        return f"{field} eq {odata_literal(items[0])}"
+    for delimiter in _IN_DELIMITERS:
+        if not any(delimiter in item for item in items):
+            joined = delimiter.join(items)
+            return f"search.in({field}, {odata_literal(joined)}, {odata_literal(delimiter)})"
+    return " or ".join(f"{field} eq {odata_literal(item)}" for item in items)
+
+
+def facet_number(value: float) -> str:
+    """A plain decimal literal for facet `values:` edges: no exponent and no rounding."""
+    if not math.isfinite(value):
+        raise ValueError(f"Facet edge must be finite, got {value!r}")
+    text = format(Decimal(repr(value)), "f")
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return text
+
+
+def created_range(
+    start: Optional[datetime], end: Optional[datetime], *, field: str = "created_utc"
+) -> Optional[str]:
+    """`field ge start and field lt end`; either bound may be omitted."""
+    parts = []
+    if start is not None:
+        parts.append(f"{field} ge {odata_literal(start)}")
+    if end is not None:
+        parts.append(f"{field} lt {odata_literal(end)}")
+    return " and ".join(parts) or None
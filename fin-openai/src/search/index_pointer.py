@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def read_pointer(path: str) -> Optional[Dict[str, Any]]:
+    """The pointer record (`{"index", "previous", "switched_utc"}`), or None if there is none."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_pointer(path: str, index_name: str, *, previous: Optional[str] = None) -> Dict[str, Any]:
+    """Point readers at `index_name` atomically: write a temp file, fsync, then `os.replace`.
+
+    Readers see either the old record or the new one, never a partial write.
+    """
+    record = {
+        "index": index_name,
+        "previous": previous,
+        "switched_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".index-pointer-", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(record, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    logger.info("Index pointer %s now targets '%s' (was '%s')", path, index_name, previous)
+    return record
+
+
+class IndexPointer:
+    """Resolves the active index name from a pointer file, re-reading it only when it changes.
+
+    One `stat` per lookup; the file is parsed again only when its inode, mtime or size moves.
+    `write_pointer` always creates a new inode, so a same-size rewrite within a coarse mtime
+    tick is still seen.
+    Falls back to `default` while the file does not exist.
+    """
+
+    def __init__(self, path: str, default: Optional[str] = None) -> None:
+        self.path = path
+        self.default = default
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._index: Optional[str] = default
+
+    def active_index(self) -> Optional[str]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return self.default
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    record = read_pointer(self.path)
+                    self._index = (record or {}).get("index") or self.default
+                    self._stamp = stamp
+        return self._index
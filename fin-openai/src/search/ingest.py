@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import csv
+import glob
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from queue import Empty
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SOURCE_COLUMNS = ("transaction_id", "amount", "currency", "status", "merchant_id", "created_utc")
+SUPPORTED_SUFFIXES = (".csv", ".jsonl", ".ndjson", ".parquet")
+
+
+def _document(txn_id: Any, amount: Any, currency: Any, status: Any, merchant: Any, created: Any) -> Dict[str, Any]:
+    # Map one source row to the index schema, with a concatenated content field for search.
+    # The amount is formatted once, so "12.50" from CSV and 12.5 from JSONL/Parquet embed alike.
+    value = float(amount)
+    return {
+        "transaction_id": str(txn_id),
+        "amount": value,
+        "currency": currency,
+        "status": status,
+        "merchant_id": merchant,
+        "created_utc": created,
+        "content": f"txn {txn_id} amount {value:.2f} {currency} status {status} merchant {merchant}",
+    }
+
+
+def iter_csv(path: str) -> Iterator[Dict[str, Any]]:
+    # Positional reader: column lookups are resolved once from the header, not per row
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        idx = [header.index(c) for c in SOURCE_COLUMNS]
+        i0, i1, i2, i3, i4, i5 = idx
+        for r in reader:
+            if r:
+                yield _document(r[i0], r[i1], r[i2], r[i3], r[i4], r[i5])
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                yield _document(*(row[c] for c in SOURCE_COLUMNS))
+
+
+def iter_parquet(path: str, *, batch_rows: int = 10_000) -> Iterator[Dict[str, Any]]:
+    """Parquet rows, read in record batches of just the needed columns.
+
+    pyarrow is optional (listed, commented out, in requirements.txt); install it to ingest Parquet.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as ex:  # optional dependency
+        raise RuntimeError("Parquet ingestion requires pyarrow (pip install pyarrow)") from ex
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=list(SOURCE_COLUMNS)):
+        # One zip over the column lists instead of per-row dicts from pyarrow
+        columns = [batch.column(c).to_pylist() for c in SOURCE_COLUMNS]
+        for values in zip(*columns):
+            yield _document(*values)
+
+
+PARSERS: Dict[str, Callable[[str], Iterator[Dict[str, Any]]]] = {
+    ".csv": iter_csv,
+    ".jsonl": iter_jsonl,
+    ".ndjson": iter_jsonl,
+    ".parquet": iter_parquet,
+}
+
+
+def iter_file(path: str) -> Iterator[Dict[str, Any]]:
+    suffix = os.path.splitext(path)[1].lower()
+    parser = PARSERS.get(suffix)
+    if parser is None:
+        raise ValueError(f"Unsupported file type '{suffix}' for {path}")
+    return parser(path)
+
+
+def parse_csv(path: str) -> List[Dict[str, Any]]:
+    return list(iter_csv(path))
+
+
+def parse_file(path: str) -> List[Dict[str, Any]]:
+    return list(iter_file(path))
+
+
+def expand_sources(spec: str) -> List[str]:
+    """Files named by a comma-separated list of paths, directories and glob patterns.
+
+    Directories contribute their supported files (non-recursive). The result is sorted and
+    de-duplicated so runs are reproducible.
+    """
+    paths: List[str] = []
+    for part in (p.strip() for p in spec.split(",")):
+        if not part:
+            continue
+        if os.path.isdir(part):
+            paths.extend(
+                os.path.join(part, name)
+                for name in os.listdir(part)
+                if name.lower().endswith(SUPPORTED_SUFFIXES)
+            )
+        elif glob.has_magic(part):
+            paths.extend(glob.glob(part, recursive=True))
+        else:
+            paths.append(part)
+    return sorted(set(paths))
+
+
+# Per worker process: the bounded queue that parsed chunks are handed back through
+_chunks: Any = None
+
+
+def _init_worker(queue: Any) -> None:
+    global _chunks
+    _chunks = queue
+
+
+def _parse_into_queue(path: str, chunk_size: int) -> int:
+    count = 0
+    try:
+        for chunk in batched(iter_file(path), chunk_size):
+            _chunks.put((path, chunk))  # blocks while the parent is behind
+            count += len(chunk)
+    finally:
+        _chunks.put((path, None))  # end of this file, parsed or failed
+    return count
+
+
+def iter_documents(
+    paths: Iterable[str],
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+    max_chunks: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Parse files in a process pool and yield their documents as one stream.
+
+    Each file is parsed by one worker process, so throughput scales with cores up to the
+    number of files. Workers hand back `chunk_size`-row chunks through a queue of at most
+    `max_chunks` (default: two per worker). A worker waits while the queue is full, so memory
+    stays bounded however large the files are. Chunks from different files interleave.
+    With a single file or `workers=1` parsing streams in-process.
+    """
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield from iter_file(path)
+        return
+    workers = min(workers, len(paths))
+    ctx = multiprocessing.get_context()
+    queue = ctx.Queue(maxsize=max_chunks or 2 * workers)
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(queue,)
+    ) as pool:
+        futures = {pool.submit(_parse_into_queue, path, chunk_size): path for path in paths}
+        try:
+            remaining = len(paths)
+            while remaining:
+                try:
+                    path, chunk = queue.get(timeout=1.0)
+                except Empty:
+                    # A crashed worker never sends its end marker; surface its error instead
+                    for fut in futures:
+                        if fut.done() and fut.exception() is not None:
+                            fut.result()
+                    continue
+                if chunk is None:
+                    remaining -= 1
+                    continue
+                yield from chunk
+            for fut, path in futures.items():
+                logger.info("Parsed %d documents from %s", fut.result(), path)
+        finally:
+            # Stopped early or failed: let blocked workers finish so the pool can shut down
+            for fut in futures:
+                fut.cancel()
+            while not all(fut.done() for fut in futures):
+                try:
+                    queue.get(timeout=0.1)
+                except Empty:
+                    pass
+
+
+def batched(docs: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional
+
+# Retrievable, non-vector fields of the transactions index. Used as the default `select`
+# so the 3072-float `contentVector` is never shipped back with every hit.
+DEFAULT_SELECT: List[str] = [
+    "transaction_id",
+    "amount",
+    "currency",
+    "status",
+    "merchant_id",
+    "created_utc",
+    "content",
+]
+
+_FIELD_SLOTS = tuple(DEFAULT_SELECT)
+# Result key -> slot. Scores come only from the service's `@search.*` keys; a document field
+# that happens to be called `score` is an ordinary extra field.
+_SLOT_FOR = {
+    **{name: name for name in _FIELD_SLOTS},
+    "@search.score": "score",
+    "@search.reranker_score": "reranker_score",
+}
+_MISSING = object()
+
+
+class SearchHit:
+    """Compact, slotted search result.
+
+    Known index fields and scores are attributes; anything else the query returned (other
+    selected fields, highlights, captions) lands in `extra`. Supports read-only mapping
+    access (`hit["amount"]`, `hit.get("@search.score")`, `{**hit}`) so code written against
+    the SDK's dict results keeps working. As with a dict, a field the result carried as
+    null is present with value None; one it did not carry is absent.
+    """
+
+    __slots__ = _FIELD_SLOTS + ("score", "reranker_score", "extra", "nulls")
+
+    def __init__(self, **fields: Any) -> None:
+        self._fill(fields)
+
+    def _fill(self, raw: Dict[str, Any]) -> None:
+        # Explicit assignments: this runs once per hit on the query path
+        get = raw.get
+        self.transaction_id = get("transaction_id")
+        self.amount = get("amount")
+        self.currency = get("currency")
+        self.status = get("status")
+        self.merchant_id = get("merchant_id")
+        self.created_utc = get("created_utc")
+        self.content = get("content")
+        self.score = get("@search.score")
+        self.reranker_score = get("@search.reranker_score")
+        self.extra = {k: v for k, v in raw.items() if k not in _SLOT_FOR} or None
+        # Known fields present as null; usually none, so usually None
+        self.nulls = frozenset(_SLOT_FOR[k] for k, v in raw.items() if v is None and k in _SLOT_FOR) or None
+
+    @classmethod
+    def from_result(cls, raw: Dict[str, Any]) -> "SearchHit":
+        hit = cls.__new__(cls)
+        hit._fill(raw)
+        return hit
+
+    def get(self, name: str, default: Any = None) -> Any:
+        slot = _SLOT_FOR.get(name)
+        if slot is not None:
+            value = getattr(self, slot)
+            if value is None and not (self.nulls and slot in self.nulls):
+                return default
+            return value
+        if self.extra is not None and name in self.extra:
+            return self.extra[name]
+        return default
+
+    def __getitem__(self, name: str) -> Any:
+        value = self.get(name, _MISSING)
+        if value is _MISSING:
+            raise KeyError(name)
+        return value
+
+    def keys(self) -> Iterator[str]:
+        nulls = self.nulls or ()
+        for name in _FIELD_SLOTS:
+            if getattr(self, name) is not None or name in nulls:
+                yield name
+        if self.score is not None or "score" in nulls:
+            yield "@search.score"
+        if self.reranker_score is not None or "reranker_score" in nulls:
+            yield "@search.reranker_score"
+        if self.extra:
+            yield from self.extra
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys()
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.get(name, _MISSING) is not _MISSING
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: self[name] for name in self.keys()}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SearchHit):
+            return self.as_dict() == other.as_dict()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SearchHit({self.as_dict()!r})"
+
+
+def resolve_select(
+    select: Optional[List[str]], default: Optional[List[str]] = None
+) -> Optional[List[str]]:
+    """Apply the vector-free default projection; `["*"]` asks for every retrievable field."""
+    if select is None:
+        return default or DEFAULT_SELECT
+    if select == ["*"]:
+        return None
+    return select
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+from typing import Any, Optional
+
+
+class InvalidContinuationToken(ValueError):
+    pass
+
+
+def _fingerprint(filters: Optional[str]) -> str:
+    return hashlib.sha256((filters or "").encode("utf-8")).hexdigest()[:16]
+
+
+def encode_continuation(last_key: Any, filters: Optional[str]) -> str:
+    """Opaque token: the last key returned plus a fingerprint of the query's filter."""
+    payload = json.dumps({"k": last_key, "f": _fingerprint(filters)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_continuation(token: str, filters: Optional[str]) -> Any:
+    """Return the last key from `token`; rejects tokens issued for a different filter."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key, fingerprint = payload["k"], payload["f"]
+    except Exception as ex:
+        raise InvalidContinuationToken("Malformed continuation token") from ex
+    if fingerprint != _fingerprint(filters):
+        raise InvalidContinuationToken("Continuation token does not match this query")
+    return key
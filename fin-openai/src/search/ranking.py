@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[Sequence[Dict[str, Any]]],
+    *,
+    key: str = "transaction_id",
+    k: int = 60,
+    top: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Merge ranked result lists with reciprocal rank fusion (score = sum of 1 / (k + rank)).
+
+    Only ranks are used, so lists scored on different scales (BM25, cosine) merge fairly.
+    The first occurrence of each document is kept and annotated with `@fusion.score`.
+    """
+    scores: Dict[Any, float] = {}
+    docs: Dict[Any, Dict[str, Any]] = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results, start=1):
+            doc_key = doc.get(key)
+            if doc_key is None:
+                continue
+            scores[doc_key] = scores.get(doc_key, 0.0) + 1.0 / (k + rank)
+            docs.setdefault(doc_key, doc)
+    ordered = sorted(scores, key=scores.__getitem__, reverse=True)
+    if top is not None:
+        ordered = ordered[:top]
+    return [{**docs[doc_key], "@fusion.score": scores[doc_key]} for doc_key in ordered]
+
+
+def normalized_score_merge(
+    result_lists: Sequence[Sequence[Dict[str, Any]]],
+    *,
+    key: str = "transaction_id",
+    score_field: str = "@search.score",
+    top: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Merge lists by min-max normalizing each list's scores to [0, 1] and keeping the best.
+
+    Use when lists come from the same kind of query against different indexes, where the raw
+    scores are comparable in shape but not in scale (BM25 depends on per-index statistics).
+    """
+    best: Dict[Any, Dict[str, Any]] = {}
+    for results in result_lists:
+        scores = [float(d.get(score_field) or 0.0) for d in results]
+        if not scores:
+            continue
+        lo, hi = min(scores), max(scores)
+        for doc, score in zip(results, scores):
+            doc_key = doc.get(key)
+            if doc_key is None:
+                continue
+            norm = (score - lo) / (hi - lo) if hi > lo else 1.0
+            if doc_key not in best or norm > best[doc_key]["@fusion.score"]:
+                best[doc_key] = {**doc, "@fusion.score": norm}
+    ordered = sorted(best.values(), key=lambda d: d["@fusion.score"], reverse=True)
+    return ordered[:top] if top is not None else ordered
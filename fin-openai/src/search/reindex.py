@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from .ingest import batched
+from .search_client import AzureSearch
+
+logger = logging.getLogger(__name__)
+
+# Per-document statuses worth retrying: throttled or the service briefly unavailable
+RETRYABLE_STATUS = {409, 422, 429, 503}
+
+
+@dataclass
+class LoadResult:
+    uploaded: int = 0
+    failed_keys: List[str] = field(default_factory=list)
+    batches: int = 0
+    retries: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def docs_per_s(self) -> float:
+        return round(self.uploaded / self.elapsed_s, 1) if self.elapsed_s else 0.0
+
+
+def _too_large(ex: Exception) -> bool:
+    return getattr(ex, "status_code", None) == 413
+
+
+def _upload_with_retry(
+    client: Any, docs: List[Dict[str, Any]], *, key_field: str, max_retries: int, backoff_s: float
+) -> Dict[str, Any]:
+    pending = docs
+    uploaded, retries = 0, 0
+    failed: List[str] = []  # rejected for good, on any attempt
+    for attempt in range(max_retries + 1):
+        try:
+            results = client.upload_documents(pending)
+        except Exception as ex:  # whole batch rejected (e.g. 503, 413, connection reset)
+            if _too_large(ex) and len(pending) > 1:
+                # Resending the same payload cannot succeed; upload each half on its own
+                mid = len(pending) // 2
+                for half in (pending[:mid], pending[mid:]):
+                    outcome = _upload_with_retry(
+                        client, half, key_field=key_field, max_retries=max_retries, backoff_s=backoff_s
+                    )
+                    uploaded += outcome["uploaded"]
+                    failed.extend(outcome["failed"])
+                    retries += outcome["retries"]
+                return {"uploaded": uploaded, "failed": failed, "retries": retries}
+            if attempt == max_retries or _too_large(ex):
+                logger.warning("Upload batch failed after %d retries: %s", retries, ex)
+                failed.extend(d[key_field] for d in pending)
+                return {"uploaded": uploaded, "failed": failed, "retries": retries}
+        else:
+            by_key = {d[key_field]: d for d in pending}
+            retry_docs: List[Dict[str, Any]] = []
+            for r in results:
+                if r.succeeded:
+                    uploaded += 1
+                elif getattr(r, "status_code", 503) in RETRYABLE_STATUS and attempt < max_retries:
+                    retry_docs.append(by_key[r.key])
+                else:
+                    failed.append(r.key)
+            if not retry_docs:
+                return {"uploaded": uploaded, "failed": failed, "retries": retries}
+            pending = retry_docs
+        retries += 1
+        time.sleep(backoff_s * (2**attempt) * (0.5 + random.random()))
+    failed.extend(d[key_field] for d in pending)
+    return {"uploaded": uploaded, "failed": failed, "retries": retries}
+
+
+def bulk_load(
+    client: Any,
+    docs: Iterable[Dict[str, Any]],
+    *,
+    batch_size: int = 1000,
+    workers: int = 8,
+    key_field: str = "transaction_id",
+    max_retries: int = 5,
+    backoff_s: float = 0.5,
+) -> LoadResult:
+    """Upload `docs` with `workers` concurrent batches, retrying throttled documents.
+
+    At most `2 * workers` batches are in memory at once, so `docs` can be a lazy stream of
+    any size. `batch_size` 1000 is the service's per-request maximum; a batch rejected as
+    too large (413) is split in half until it fits.
+    """
+    result = LoadResult()
+    t0 = time.perf_counter()
+    inflight: Set[Future] = set()
+
+    def collect(done: Iterable[Future]) -> None:
+        for fut in done:
+            outcome = fut.result()
+            result.uploaded += outcome["uploaded"]
+            result.failed_keys.extend(outcome["failed"])
+            result.retries += outcome["retries"]
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-load") as pool:
+        for batch in batched(docs, batch_size):
+            if len(inflight) >= 2 * workers:
+                done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                collect(done)
+            inflight.add(
+                pool.submit(
+                    _upload_with_retry,
+                    client,
+                    batch,
+                    key_field=key_field,
+                    max_retries=max_retries,
+                    backoff_s=backoff_s,
+                )
+            )
+            result.batches += 1
+        done, _ = wait(inflight)
+        collect(done)
+    result.elapsed_s = time.perf_counter() - t0
+    return result
+
+
+def wait_for_count(client: Any, expected: int, *, timeout_s: float = 300.0, poll_s: float = 5.0) -> int:
+    """Poll the document count until it reaches `expected` (indexing is near-real-time)."""
+    deadline = time.monotonic() + timeout_s
+    while True:
+        count = client.get_document_count()
+        if count >= expected or time.monotonic() >= deadline:
+            return count
+        time.sleep(poll_s)
+
+
+@dataclass
+class ValidationReport:
+    expected: int
+    count: int
+    queries: Dict[str, float] = field(default_factory=dict)  # query -> top-k key overlap
+    failed_queries: List[str] = field(default_factory=list)
+    missing_keys: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.count == self.expected and not self.failed_queries and not self.missing_keys
+
+
+def validate_index(
+    new: AzureSearch,
+    *,
+    expected: int,
+    live: Optional[AzureSearch] = None,
+    sample_queries: Sequence[str] = (),
+    sample_keys: Sequence[str] = (),
+    top: int = 10,
+    min_overlap: float = 0.6,
+    key_field: str = "transaction_id",
+    count_timeout_s: float = 300.0,
+) -> ValidationReport:
+    """Check a freshly loaded index before it takes traffic.
+
+    - the document count reaches `expected`
+    - each sample query returns hits, and when `live` is given, its top-`top` keys overlap
+      the live index's by at least `min_overlap` (a query with no live hits must have none)
+    - every sample key can be fetched by id
+    """
+    report = ValidationReport(
+        expected=expected, count=wait_for_count(new.client, expected, timeout_s=count_timeout_s)
+    )
+    for q in sample_queries:
+        new_keys = [h[key_field] for h in new.query(q, top=top)]
+        if live is None:
+            report.queries[q] = 1.0 if new_keys else 0.0
+            if not new_keys:
+                report.failed_queries.append(q)
+            continue
+        live_keys = [h[key_field] for h in live.query(q, top=top)]
+        if not live_keys:
+            overlap = 1.0 if not new_keys else 0.0
+        else:
+            overlap = len(set(new_keys) & set(live_keys)) / len(live_keys)
+        report.queries[q] = round(overlap, 3)
+        if overlap < min_overlap:
+            report.failed_queries.append(q)
+    for key in sample_keys:
+        try:
+            new.client.get_document(key=key)
+        except Exception:
+            report.missing_keys.append(key)
+    return report
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional
-
-from azure.search.documents import SearchClient
-from azure.core.credentials import AzureKeyCredential  # type: ignore
-from azure.core.credentials import TokenCredential
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from ..cache.shared_cache import get_shared_cache, make_key
 from ..config import get_settings
+from ..deadline import call_options
+from ..observability.profiling import stage
 from ..security.managed_identity import get_default_credential
 from ..ml.embeddings import embed_texts
+from .filters import and_filters, odata_literal
+from .index_pointer import IndexPointer
+from .models import SearchHit, resolve_select
+
+if TYPE_CHECKING:  # SDK modules load on first use, not at import time
+    from azure.core.credentials import TokenCredential
+    from azure.search.documents import SearchClient
 
 logger = logging.getLogger(__name__)
 
@@ -25,16 +32,30 @@ class AzureSearch:
         credential: Optional[TokenCredential] = None,
         service_name: Optional[str] = None,
         index_name: Optional[str] = None,
+        search_client: Optional[SearchClient] = None,
+        default_select: Optional[List[str]] = None,
     ) -> None:
         settings = get_settings()
         self._service = service_name or settings.azure_search_service
         self._index = index_name or settings.azure_search_index
+        self._default_select = default_select or (
+            [f.strip() for f in settings.azure_search_default_select.split(",") if f.strip()]
+            if settings.azure_search_default_select
+            else None
+        )
 
         if not self._service or not self._index:
             raise ValueError("Azure Search service/index are not configured")
 
         endpoint = f"https://{self._service}.search.windows.net"
 
+        if search_client is not None:
+            # Pre-built client (tests, benchmarks); skips credential resolution
+            self.client = search_client
+            return
+
+        from azure.search.documents import SearchClient
+
         # Prefer AAD via DefaultAzureCredential
         cred = credential or get_default_credential()
         self.client = SearchClient(
@@ -44,31 +65,164 @@ class AzureSearch:
         )
         logger.info("AzureSearch initialized for index '%s' at '%s'", self._index, endpoint)
 
-    def query(
+    def iter_query(
         self,
-        query_text: str,
+        query_text: Optional[str],
         *,
         top: int = 5,
         semantic: bool = False,
         filters: Optional[str] = None,
         select: Optional[List[str]] = None,
-    ) -> List[Dict[str, Any]]:
-        from azure.search.documents.models import QueryType
+        vector: Optional[List[float]] = None,
+        vector_field: str = "contentVector",
+        order_by: Optional[List[str]] = None,
+    ) -> Iterator[SearchHit]:
+        """Stream hits as result pages arrive instead of materializing the whole list.
+
+        - `select=None` uses the vector-free default projection; pass `["*"]` for every field
+        - `vector` adds a vector query over `vector_field` (hybrid when `query_text` is set)
+        """
+        from azure.search.documents.models import QueryType, VectorizedQuery
 
         logger.debug("Search query: %s", query_text)
+        vector_queries = None
+        if vector is not None:
+            vector_queries = [VectorizedQuery(vector=vector, k_nearest_neighbors=top, fields=vector_field)]
 
         results_iter = self.client.search(
             search_text=query_text,
+            vector_queries=vector_queries,
             top=top,
             include_total_count=False,
             filter=filters,
-            select=select,
+            select=resolve_select(select, self._default_select),
+            order_by=order_by,
             query_type=QueryType.SEMANTIC if semantic else QueryType.SIMPLE,
+            **call_options("search"),
         )
-        results: List[Dict[str, Any]] = []
         for r in results_iter:
-            results.append(dict(r))
-        return results
+            yield SearchHit.from_result(r)
+
+    def iter_pages(
+        self,
+        filters: Optional[str] = None,
+        *,
+        key_field: str = "transaction_id",
+        page_size: int = 1000,
+        after: Any = None,
+        select: Optional[List[str]] = None,
+    ) -> Iterator[Tuple[List[SearchHit], Any]]:
+        """Walk every document matching `filters` in key order, one page at a time.
+
+        Each request is `key gt <last key>` ordered by key, so paging never uses `skip`
+        (which the service caps at 100,000) and memory stays at one page. Yields
+        `(hits, last_key)`; resume later by passing `last_key` back as `after`.
+        `key_field` must be filterable and sortable.
+        """
+        projection = resolve_select(select, self._default_select)
+        if projection is not None and key_field not in projection:
+            projection = projection + [key_field]
+        last = after
+        while True:
+            page_filter = and_filters(
+                filters, f"{key_field} gt {odata_literal(last)}" if last is not None else None
+            )
+            with stage("search"):
+                page = list(
+                    self.iter_query(
+                        None,
+                        top=page_size,
+                        filters=page_filter,
+                        select=projection,
+                        order_by=[f"{key_field} asc"],
+                    )
+                )
+            if not page:
+                return
+            last = page[-1][key_field]
+            yield page, last
+            if len(page) < page_size:
+                return
+
+    def iter_all(
+        self,
+        filters: Optional[str] = None,
+        *,
+        key_field: str = "transaction_id",
+        page_size: int = 1000,
+        after: Any = None,
+        select: Optional[List[str]] = None,
+    ) -> Iterator[SearchHit]:
+        """Every document matching `filters`, streamed in key order (see `iter_pages`)."""
+        for page, _ in self.iter_pages(
+            filters, key_field=key_field, page_size=page_size, after=after, select=select
+        ):
+            yield from page
+
+    def aggregate(
+        self,
+        facets: List[str],
+        *,
+        filters: Optional[str] = None,
+        query_text: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Server-side counts via facets; no documents are transferred (`top=0`).
+
+        `facets` uses the service's facet syntax, e.g. `"status,count:20"`,
+        `"amount,values:10|100|1000"` or `"created_utc,interval:day"`. Fields must be facetable.
+        Returns `{"count": <total matches>, "facets": {field: [{"value"|"from"/"to", "count"}]}}`.
+        """
+        with stage("search"):
+            results = self.client.search(
+                search_text=query_text,
+                top=0,
+                include_total_count=True,
+                filter=filters,
+                facets=facets,
+            )
+            raw_facets = results.get_facets() or {}
+            count = results.get_count()
+        return {
+            "count": count,
+            "facets": {
+                name: [{k: v for k, v in bucket.items() if v is not None} for bucket in buckets]
+                for name, buckets in raw_facets.items()
+            },
+        }
+
+    def _cached(self, parts: List[Any], compute: Callable[[], List[SearchHit]]) -> List[SearchHit]:
+        """Serve from the host-wide cache when enabled; keys include service and index.
+
+        Hits are stored as plain dicts (JSON) and rebuilt as SearchHits on the way out.
+        """
+        ttl = get_settings().shared_cache_search_ttl_s
+        cache = get_shared_cache() if ttl > 0 else None
+        if cache is None:
+            return compute()
+        key = make_key(self._service, self._index, self._default_select, *parts)
+        cached = cache.get("search", key)
+        if cached is not None:
+            return [SearchHit.from_result(raw) for raw in cached]
+        hits = compute()
+        cache.set("search", key, [hit.as_dict() for hit in hits], ttl_s=ttl)
+        return hits
+
+    def query(
+        self,
+        query_text: str,
+        *,
+        top: int = 5,
+        semantic: bool = False,
+        filters: Optional[str] = None,
+        select: Optional[List[str]] = None,
+    ) -> List[SearchHit]:
+        def run() -> List[SearchHit]:
+            with stage("search"):
+                return list(
+                    self.iter_query(query_text, top=top, semantic=semantic, filters=filters, select=select)
+                )
+
+        return self._cached(["query", query_text, top, semantic, filters, select], run)
 
     def vector_query(
         self,
@@ -78,28 +232,25 @@ class AzureSearch:
         vector_field: str = "contentVector",
         filters: Optional[str] = None,
         select: Optional[List[str]] = None,
-    ) -> List[Dict[str, Any]]:
+        vector: Optional[List[float]] = None,
+    ) -> List[SearchHit]:
         """Vector similarity search using pre-computed embeddings stored in the index.
 
         Requires the index to have a vector field (e.g., 'contentVector') and vector search profile.
+        Pass `vector` when the query embedding is already computed to skip the embeddings call.
         """
-        from azure.search.documents.models import VectorizedQuery
+        def run() -> List[SearchHit]:
+            vec = vector if vector is not None else embed_texts([query_text])[0]
+            with stage("search"):
+                return list(
+                    self.iter_query(
+                        None, top=top, filters=filters, select=select, vector=vec, vector_field=vector_field
+                    )
+                )
 
-        vec = embed_texts([query_text])[0]
-        vq = VectorizedQuery(vector=vec, k_nearest_neighbors=top, fields=vector_field)
-
-        results_iter = self.client.search(
-            search_text=None,
-            vector_queries=[vq],
-            top=top,
-            include_total_count=False,
-            filter=filters,
-            select=select,
-        )
-        results: List[Dict[str, Any]] = []
-        for r in results_iter:
-            results.append(dict(r))
-        return results
+        # Keyed on the text and embedding deployment the vector comes from, not 3072 floats
+        model = get_settings().azure_openai_embeddings_deployment
+        return self._cached(["vector", query_text, model, top, vector_field, filters, select], run)
 
     def hybrid_query(
         self,
@@ -110,26 +261,49 @@ class AzureSearch:
         filters: Optional[str] = None,
         select: Optional[List[str]] = None,
         semantic: bool = False,
-    ) -> List[Dict[str, Any]]:
+    ) -> List[SearchHit]:
         """Hybrid search: combines keyword/semantic search with vector similarity.
 
         Set semantic=True to use the service's semantic ranking on the text query part.
         """
-        from azure.search.documents.models import QueryType, VectorizedQuery
-
         vec = embed_texts([query_text])[0]
-        vq = VectorizedQuery(vector=vec, k_nearest_neighbors=top, fields=vector_field)
+        with stage("search"):
+            return list(
+                self.iter_query(
+                    query_text,
+                    top=top,
+                    semantic=semantic,
+                    filters=filters,
+                    select=select,
+                    vector=vec,
+                    vector_field=vector_field,
+                )
+            )
 
-        results_iter = self.client.search(
-            search_text=query_text,
-            vector_queries=[vq],
-            top=top,
-            include_total_count=False,
-            filter=filters,
-            select=select,
-            query_type=QueryType.SEMANTIC if semantic else QueryType.SIMPLE,
-        )
-        results: List[Dict[str, Any]] = []
-        for r in results_iter:
-            results.append(dict(r))
-        return results
+
+@lru_cache
+def _index_pointer() -> Optional[IndexPointer]:
+    settings = get_settings()
+    if not settings.azure_search_index_pointer:
+        return None
+    return IndexPointer(settings.azure_search_index_pointer, default=settings.azure_search_index)
+
+
+def active_index_name() -> Optional[str]:
+    """The live index: the pointer file's target when one is configured, else AZURE_SEARCH_INDEX."""
+    pointer = _index_pointer()
+    return pointer.active_index() if pointer else get_settings().azure_search_index
+
+
+@lru_cache(maxsize=4)
+def _azure_search_for(index_name: Optional[str]) -> AzureSearch:
+    return AzureSearch(index_name=index_name)
+
+
+def get_azure_search() -> AzureSearch:
+    """Shared AzureSearch for the live index (one credential and connection pool per process).
+
+    When the index pointer is switched, the next call returns a client for the new index;
+    requests already holding the old client finish against it.
+    """
+    return _azure_search_for(active_index_name())
@@ -1,22 +1,30 @@
 from __future__ import annotations
 
 from typing import Optional
-from azure.keyvault.secrets import SecretClient
+
+from ..deadline import call_options
+from ..observability.profiling import stage
 from .managed_identity import get_default_credential
 
 
 def get_secret(vault_uri: str, name: str, *, version: Optional[str] = None) -> Optional[str]:
     """Fetch a secret value from Azure Key Vault using Managed Identity/AAD.
 
-    Returns None if the secret cannot be fetched (e.g., not found or access denied).
+    Returns None if the secret cannot be fetched (e.g., not found or access denied), or when
+    the current request deadline leaves no time to try.
     """
-    cred = get_default_credential()
+    with stage("credential"):
+        cred = get_default_credential()
+    from azure.keyvault.secrets import SecretClient
+
     client = SecretClient(vault_url=vault_uri, credential=cred)
     try:
-        if version:
-            sec = client.get_secret(name, version=version)
-        else:
-            sec = client.get_secret(name)
+        with stage("key_vault"):
+            options = call_options("Key Vault fetch")
+            if version:
+                sec = client.get_secret(name, version=version, **options)
+            else:
+                sec = client.get_secret(name, **options)
         return sec.value
     except Exception:
         return None
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 
-from azure.identity import DefaultAzureCredential
+if TYPE_CHECKING:
+    from azure.identity import DefaultAzureCredential
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache
 def get_default_credential(authority_host: Optional[str] = None) -> DefaultAzureCredential:
     """
     Returns a DefaultAzureCredential configured for server and local dev.
@@ -15,9 +18,12 @@ def get_default_credential(authority_host: Optional[str] = None) -> DefaultAzure
     - Uses Managed Identity in Azure
     - Falls back to Azure CLI / Visual Studio Code signed-in account locally
     - Avoids environment credentials unless explicitly configured
+    - Cached per authority so the chain is resolved once and tokens are reused
     """
     # In highly locked-down environments, you may want to set exclude_* flags.
     # We keep defaults but log the resolved chain for visibility.
+    from azure.identity import DefaultAzureCredential
+
     credential = DefaultAzureCredential(authority=authority_host)
     logger.debug("Initialized DefaultAzureCredential with authority=%s", authority_host)
     return credential
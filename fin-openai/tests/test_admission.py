@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import main
+from src.api.admission import AdmissionController, Overloaded
+
+
+def test_queue_orders_by_priority_and_drops_expired_waiters():
+    async def scenario():
+        ctl = AdmissionController(max_in_flight=1, max_queue=4, max_wait_s=1.0)
+        await ctl.acquire()
+        order = []
+
+        async def request(priority, **kwargs):
+            async with ctl.slot(priority, **kwargs):
+                order.append(priority)
+
+        batch = asyncio.create_task(request("batch"))
+        expiring = asyncio.create_task(request("interactive", max_wait_s=0.01))
+        await asyncio.sleep(0.05)
+        interactive = asyncio.create_task(request("interactive"))
+        await asyncio.sleep(0)
+        ctl.release()
+        await asyncio.gather(batch, interactive)
+        with pytest.raises(Overloaded, match="deadline"):
+            await expiring
+        return order, ctl.stats()
+
+    order, stats = asyncio.run(scenario())
+    assert order == ["interactive", "batch"]
+    assert stats == {"in_flight": 0, "queued": 0, "admitted": 3, "rejected": 0, "shed": 0, "expired": 1}
+
+
+def test_full_queue_sheds_lower_priority_or_rejects():
+    async def scenario():
+        ctl = AdmissionController(max_in_flight=1, max_queue=1, max_wait_s=1.0)
+        await ctl.acquire()
+        batch = asyncio.create_task(ctl.acquire("batch"))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(ctl.acquire("interactive"))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded, match="displaced"):
+            await batch
+        with pytest.raises(Overloaded, match="queue full") as rejected:
+            await ctl.acquire("interactive")
+        ctl.release()
+        await interactive
+        return rejected.value.retry_after_s, ctl.stats()
+
+    retry_after, stats = asyncio.run(scenario())
+    assert retry_after >= 1
+    assert stats["shed"] == 1 and stats["rejected"] == 1 and stats["in_flight"] == 1
+
+
+def test_chat_answers_429_with_retry_after_when_full(monkeypatch):
+    busy = AdmissionController(max_in_flight=1, max_queue=0)
+    busy.in_flight = 1  # another request holds the only slot
+    monkeypatch.setattr(main, "admission", busy)
+    res = TestClient(main.app).post(
+        "/chat", json={"messages": [{"role": "user", "content": "fees?"}]}, headers={"x-priority": "batch"}
+    )
+    assert res.status_code == 429
+    assert int(res.headers["retry-after"]) >= 1
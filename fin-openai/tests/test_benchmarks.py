@@ -0,0 +1,25 @@
+from benchmarks.run import compare, run
+
+
+def test_benchmarks_smoke():
+    report = run(
+        ["chat", "ingest", "embeddings", "search"],
+        {
+            "chat": {"requests": 8, "concurrency": 4, "model_latency_s": 0.0},
+            "ingest": {"docs": 50},
+            "embeddings": {"texts": 10, "batch_size": 4, "latency_s": 0.0, "dim": 8},
+            "search": {"iterations": 5},
+        },
+    )
+    results = report["results"]
+    assert results["chat"]["errors"] == 0
+    assert results["chat"]["latency"]["count"] == 8
+    assert results["ingest"]["uploaded"] == 50
+    assert results["embeddings"]["calls"] == 3
+    assert "overhead_us_per_call" in results["search"]
+
+
+def test_compare_reports_relative_change():
+    base = {"results": {"chat": {"requests_per_s": 100.0}}}
+    cur = {"results": {"chat": {"requests_per_s": 110.0}}}
+    assert compare(cur, base) == ["chat.requests_per_s: 100 -> 110 (+10.0%)"]
@@ -0,0 +1,35 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from scripts.replay_chat import Result, ramp_schedule, summarize
+from src.api import main
+from src.observability.capture import TrafficRecorder, scrub
+
+
+def test_scrub_masks_card_numbers_emails_and_accounts():
+    text = "card 4111 1111 1111 1111, mail jane.doe@example.com, acct 123456789012"
+    assert scrub(text) == "card [PAN], mail [EMAIL], acct [NUMBER]"
+    assert scrub("refund txn_10001 for $49.99") == "refund txn_10001 for $49.99"
+
+
+def test_chat_capture_appends_scrubbed_jsonl(tmp_path, monkeypatch):
+    path = tmp_path / "capture.jsonl"
+    monkeypatch.setattr(main, "traffic_recorder", TrafficRecorder(str(path)))
+    client = TestClient(main.app)
+    body = {"messages": [{"role": "user", "content": "refund card 4111111111111111"}]}
+    assert client.post("/chat", json=body).status_code == 200
+
+    [record] = [json.loads(line) for line in path.read_text().splitlines()]
+    assert record["path"] == "/chat"
+    assert record["status"] == 200
+    assert record["body"]["messages"][0]["content"] == "refund card [PAN]"
+
+
+def test_ramp_reports_first_saturated_step():
+    schedule = ramp_schedule(1, 3, 1, 2)
+    assert [s for _, s in schedule].count(2) == 6
+    results = [Result(0, 0.0, 0.05, 200), Result(1, 2.0, 0.05, 200), Result(2, 4.0, 0.05, 429)]
+    report = summarize(results, step_rates={0: 1, 1: 2, 2: 3}, slo_p95_ms=1000)
+    assert report["saturation"] == {"step": 2, "offered_qps": 3}
+    assert report["overall"]["throttled"] == 1
@@ -0,0 +1,171 @@
+import asyncio
+import contextlib
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from openai import OpenAI
+
+from benchmarks.fakes import FakeOpenAI
+from src.agents.agent_client import AgentClient, Message
+from src.agents.retrieval import Retriever
+from src.api import main
+from src.deadline import Deadline, DeadlineExceeded, call_options, current_deadline, deadline_scope, parse_budget_ms
+
+
+def test_deadline_counts_down_and_cancel_expires_it():
+    now = [100.0]
+    deadline = Deadline(2.0, clock=lambda: now[0])
+    now[0] += 0.5
+    assert deadline.remaining() == 1.5
+    assert call_options() == {}  # no deadline in scope
+    with deadline_scope(deadline):
+        assert call_options() == {"timeout": 1.5}
+        deadline.cancel()
+        with pytest.raises(DeadlineExceeded, match="client disconnected"):
+            call_options("model call")
+    assert current_deadline() is None
+
+
+@pytest.mark.parametrize(
+    "header,expected", [(None, 30.0), ("1500", 1.5), ("junk", 30.0), ("-5", 30.0), ("999999", 120.0)]
+)
+def test_budget_comes_from_header_within_bounds(header, expected):
+    assert parse_budget_ms(header, default_ms=30000, max_ms=120000) == expected
+
+
+def test_retrieval_stops_at_the_request_deadline():
+    seen = []
+
+    class SlowSearch:
+        def query(self, query_text, *, top):
+            seen.append(current_deadline())
+            time.sleep(0.5)
+            return [{"transaction_id": "a", "content": "txn a"}]
+
+    deadline = Deadline(0.05)
+    with deadline_scope(deadline):
+        t0 = time.monotonic()
+        ctx = Retriever(SlowSearch(), deadline_s=5.0, use_vectors=False).retrieve("refunds")
+    assert time.monotonic() - t0 < 0.3
+    assert ctx.missing == ["keyword"]
+    assert seen == [deadline]  # the worker thread saw the request's deadline
+
+
+def test_agent_passes_remaining_budget_to_the_model_and_skips_it_when_expired():
+    fake = FakeOpenAI()
+    calls = []
+    original = fake.chat.completions.create
+    fake.chat.completions.create = lambda **kw: calls.append(kw) or original(**kw)
+    options = []
+    fake.with_options = lambda **kw: options.append(kw) or fake
+    agent = AgentClient(client=fake, model="test", router=None)
+    messages = [Message(role="user", content="Summarize chargebacks for mid_001")]
+
+    with deadline_scope(Deadline(10.0)):
+        assert agent.chat(messages) == fake.reply
+    assert 9.0 < options[0]["timeout"] <= 10.0 and options[0]["max_retries"] == 0
+
+    expired = Deadline(10.0)
+    expired.cancel()
+    with deadline_scope(expired):
+        reply = agent.chat(messages)
+    assert reply.startswith("I'm your Payments Assistant")
+    assert len(calls) == 1
+
+
+def test_throttled_model_call_is_not_retried_past_the_deadline(monkeypatch):
+    monkeypatch.setattr("src.agents.agent_client.governed", lambda *a, **kw: contextlib.nullcontext())
+    requests = []
+
+    def throttled(request):
+        requests.append(request)
+        return httpx.Response(429, headers={"retry-after": "5"}, json={"error": {"message": "slow down"}})
+
+    transport = httpx.MockTransport(throttled)
+    client = OpenAI(api_key="k", base_url="https://aoai.test/v1", http_client=httpx.Client(transport=transport))
+    agent = AgentClient(client=client, model="test", router=None)
+    messages = [Message(role="user", content="Summarize chargebacks for mid_001")]
+
+    t0 = time.monotonic()
+    with deadline_scope(Deadline(2.0)):
+        reply = agent.chat(messages)
+    assert reply.startswith("I'm your Payments Assistant")
+    assert len(requests) == 1  # no SDK retry sleeping out the retry-after
+    assert time.monotonic() - t0 < 1.0
+
+
+def test_chat_skips_work_admitted_after_its_deadline(monkeypatch):
+    monkeypatch.setattr(main, "admission", None)
+    monkeypatch.setattr(main, "get_agent_client", lambda: pytest.fail("agent should not run"))
+    expired = Deadline(0.0)
+    res = main._chat(main.ChatRequest(messages=[{"role": "user", "content": "hi"}]), expired)
+    assert res.status_code == 504
+
+
+def test_chat_request_deadline_reaches_the_agent(monkeypatch):
+    budgets = []
+
+    class Agent:
+        def chat(self, messages):
+            budgets.append(current_deadline().remaining())
+            return "ok"
+
+    monkeypatch.setattr(main, "admission", None)
+    monkeypatch.setattr(main, "get_agent_client", lambda: Agent())
+    res = TestClient(main.app).post(
+        "/chat", json={"messages": [{"role": "user", "content": "hi"}]}, headers={"x-request-timeout-ms": "1500"}
+    )
+    assert res.json() == {"reply": "ok"}
+    assert 1.0 < budgets[0] <= 1.5
+
+
+def test_client_disconnect_cancels_the_deadline(monkeypatch):
+    seen = []
+    started = threading.Event()
+
+    class Agent:
+        def chat(self, messages):
+            started.set()
+            deadline = current_deadline()
+            while not deadline.expired:
+                time.sleep(0.01)
+            seen.append(deadline.cancelled)
+            return "nobody reads this"
+
+    monkeypatch.setattr(main, "admission", None)
+    monkeypatch.setattr(main, "get_agent_client", lambda: Agent())
+    monkeypatch.setattr(main.settings, "chat_disconnect_poll_ms", 10)
+    body = b'{"messages": [{"role": "user", "content": "hi"}]}'
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        while not started.is_set():  # the client hangs up once the agent is working
+            await asyncio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "path": "/chat",
+        "raw_path": b"/chat",
+        "query_string": b"",
+        "root_path": "",
+        "scheme": "http",
+        "server": ("test", 80),
+        "client": ("test", 1234),
+        "headers": [(b"content-type", b"application/json")],
+    }
+    t0 = time.monotonic()
+    asyncio.run(main.app(scope, receive, send))
+    assert seen == [True]
+    assert time.monotonic() - t0 < 5.0
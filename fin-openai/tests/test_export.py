@@ -0,0 +1,68 @@
+import json
+import re
+
+from fastapi.testclient import TestClient
+
+from benchmarks.fakes import make_transaction
+from src.api import main
+from src.search.search_client import AzureSearch
+
+
+class KeyOrderedSearchClient:
+    """Understands just enough OData for key-ordered paging: `transaction_id gt '...'` and
+    `merchant_id eq '...'`."""
+
+    def __init__(self, docs):
+        self.docs = sorted(docs, key=lambda d: d["transaction_id"])
+        self.requests = 0
+
+    def search(self, search_text=None, *, top, filter=None, order_by=None, select=None, **kwargs):
+        self.requests += 1
+        assert order_by == ["transaction_id asc"] and "skip" not in kwargs
+        docs = self.docs
+        if filter:
+            after = re.search(r"transaction_id gt '([^']*)'", filter)
+            merchant = re.search(r"merchant_id eq '([^']*)'", filter)
+            if after:
+                docs = [d for d in docs if d["transaction_id"] > after.group(1)]
+            if merchant:
+                docs = [d for d in docs if d["merchant_id"] == merchant.group(1)]
+        return iter([{k: v for k, v in d.items() if not select or k in select} for d in docs[:top]])
+
+
+def _client(monkeypatch, n=25):
+    fake = KeyOrderedSearchClient([make_transaction(i) for i in range(n)])
+    search = AzureSearch(service_name="svc", index_name="idx", search_client=fake)
+    monkeypatch.setattr(main, "get_azure_search", lambda: search)
+    return fake, search, TestClient(main.app)
+
+
+def _ndjson(res):
+    return [json.loads(line) for line in res.text.splitlines()]
+
+
+def test_iter_all_pages_by_key_range(monkeypatch):
+    fake, search, _ = _client(monkeypatch)
+    ids = [h.transaction_id for h in search.iter_all(page_size=10)]
+    assert ids == sorted(ids) and len(ids) == 25
+    assert fake.requests == 3
+
+
+def test_export_streams_ndjson_and_resumes_from_token(monkeypatch):
+    _, _, client = _client(monkeypatch, n=160)  # mid_001 owns 4 of them
+    first = _ndjson(client.get("/transactions", params={"merchant_id": "mid_001", "limit": 1, "page_size": 10}))
+    assert first[0]["merchant_id"] == "mid_001"
+    token = first[-1]["@continuation"]
+
+    rest = _ndjson(client.get("/transactions", params={"merchant_id": "mid_001", "continuation": token}))
+    rows = [r for r in rest if "transaction_id" in r]
+    assert rest[-1] == {"@continuation": None, "count": len(rows)}
+    assert len(rows) == 3
+    assert first[0]["transaction_id"] < rows[0]["transaction_id"]
+
+
+def test_export_rejects_token_from_another_query(monkeypatch):
+    _, _, client = _client(monkeypatch)
+    token = _ndjson(client.get("/transactions", params={"merchant_id": "mid_001", "limit": 1}))[-1]["@continuation"]
+    res = client.get("/transactions", params={"merchant_id": "mid_002", "continuation": token})
+    assert res.status_code == 400
@@ -0,0 +1,86 @@
+import time
+from datetime import datetime, timezone
+
+from src.deadline import Deadline, current_deadline, deadline_scope
+from src.search.federated import FederatedSearch, IndexShard
+from src.search.filters import and_filters, created_range, odata_literal
+
+
+class StubIndex:
+    def __init__(self, name, delay=0.0):
+        self.name, self.delay, self.filters, self.deadlines = name, delay, [], []
+
+    def query(self, *, query_text, top, filters, select, semantic):
+        self.filters.append(filters)
+        self.deadlines.append(current_deadline())
+        time.sleep(self.delay)
+        return [
+            {"transaction_id": f"{self.name}-{i}", "@search.score": 10.0 - i} for i in range(top)
+        ]
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def _federation(delays=None):
+    shards = [
+        IndexShard.parse("tx-2025-01|2025-01-01|2025-02-01"),
+        IndexShard.parse("tx-2025-02|2025-02-01|2025-03-01"),
+        IndexShard.parse("tx-2025-03|2025-03-01|2025-04-01"),
+    ]
+    delays = delays or {}
+    clients = {s.index_name: StubIndex(s.index_name, delays.get(s.index_name, 0.0)) for s in shards}
+    return clients, shards
+
+
+def test_filters_quote_and_combine():
+    assert odata_literal("o'brien") == "'o''brien'"
+    assert created_range(_utc(2025, 1, 1), None) == "created_utc ge 2025-01-01T00:00:00Z"
+    assert and_filters("a eq 1", None, "b eq 2") == "(a eq 1) and (b eq 2)"
+    assert and_filters(None, "a eq 1") == "a eq 1"
+
+
+def test_prunes_shards_outside_created_range():
+    clients, shards = _federation()
+    fed = FederatedSearch(shards, clients=clients)
+    res = fed.query("refund", top=2, created_from=_utc(2025, 2, 10), created_to=_utc(2025, 3, 1))
+    assert res.searched == ["tx-2025-02"]
+    assert res.pruned == ["tx-2025-01", "tx-2025-03"]
+    assert "created_utc ge 2025-02-10T00:00:00Z" in clients["tx-2025-02"].filters[0]
+
+
+def test_slow_shard_times_out_without_adding_latency():
+    clients, shards = _federation({"tx-2025-01": 0.05, "tx-2025-02": 0.05, "tx-2025-03": 1.0})
+    fed = FederatedSearch(shards, clients=clients, timeout_s=0.2)
+    t0 = time.monotonic()
+    res = fed.query("refund", top=2)
+    assert time.monotonic() - t0 < 0.5
+    assert res.timed_out == ["tx-2025-03"] and res.partial
+    assert sorted(res.searched) == ["tx-2025-01", "tx-2025-02"]
+    assert len(res.documents) == 2
+
+
+def test_shard_spec_sets_its_own_timeout():
+    shard = IndexShard.parse("tx-eu||2025-01-01|2500")
+    assert shard.created_from is None and shard.created_to == _utc(2025, 1, 1) and shard.timeout_s == 2.5
+    assert IndexShard.parse("tx-us").timeout_s is None
+
+    clients, _ = _federation({"tx-2025-01": 0.3, "tx-2025-02": 0.3})
+    shards = [IndexShard.parse("tx-2025-01|||1000"), IndexShard.parse("tx-2025-02")]
+    res = FederatedSearch(shards, clients=clients, timeout_s=0.1).query("refund", top=2)
+    assert res.searched == ["tx-2025-01"] and res.timed_out == ["tx-2025-02"]
+
+
+def test_shard_queries_see_the_request_deadline():
+    clients, shards = _federation()
+    deadline = Deadline(5.0)
+    with deadline_scope(deadline):
+        FederatedSearch(shards, clients=clients).query("refund", top=1)
+    assert all(c.deadlines == [deadline] for c in clients.values())
+
+
+def test_score_merge_normalizes_per_index():
+    clients, shards = _federation()
+    res = FederatedSearch(shards, clients=clients, merge="score").query("refund", top=3)
+    assert {d["@fusion.score"] for d in res.documents} == {1.0}
@@ -0,0 +1,93 @@
+import csv
+import itertools
+import json
+import sys
+
+import pytest
+
+from benchmarks.fakes import make_transaction
+from src.search.ingest import batched, expand_sources, iter_documents, iter_parquet, parse_file
+
+
+def _write_sources(tmp_path):
+    fields = list(make_transaction(0))
+    with open(tmp_path / "a.csv", "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=fields)
+        w.writeheader()
+        for i in range(0, 30):
+            w.writerow(make_transaction(i))
+    with open(tmp_path / "b.jsonl", "w", encoding="utf-8") as f:
+        for i in range(30, 50):
+            f.write(json.dumps(make_transaction(i)) + "\n")
+    (tmp_path / "notes.txt").write_text("ignored")
+
+
+def test_expand_sources_accepts_dirs_globs_and_files(tmp_path):
+    _write_sources(tmp_path)
+    assert [p.rsplit("/", 1)[-1] for p in expand_sources(str(tmp_path))] == ["a.csv", "b.jsonl"]
+    assert expand_sources(str(tmp_path / "*.csv")) == [str(tmp_path / "a.csv")]
+    assert expand_sources(f"{tmp_path / 'b.jsonl'},{tmp_path / 'a.csv'}") == expand_sources(str(tmp_path))
+
+
+def test_csv_and_jsonl_produce_the_same_documents(tmp_path):
+    _write_sources(tmp_path)
+    doc = parse_file(str(tmp_path / "a.csv"))[1]
+    assert doc["amount"] == make_transaction(1)["amount"]
+    assert doc["content"].startswith("txn txn_00000001 amount ")
+    assert set(parse_file(str(tmp_path / "b.jsonl"))[0]) == set(doc)
+    with pytest.raises(ValueError):
+        parse_file(str(tmp_path / "notes.txt"))
+
+
+def test_amount_text_does_not_depend_on_the_source_format(tmp_path):
+    row = {**make_transaction(7), "amount": "12.50"}
+    with open(tmp_path / "a.csv", "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=list(row))
+        w.writeheader()
+        w.writerow(row)
+    (tmp_path / "b.jsonl").write_text(json.dumps({**row, "amount": 12.5}) + "\n", encoding="utf-8")
+    [from_csv] = parse_file(str(tmp_path / "a.csv"))
+    assert parse_file(str(tmp_path / "b.jsonl")) == [from_csv]
+    assert " amount 12.50 " in from_csv["content"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_iter_documents_streams_every_file(tmp_path, workers):
+    _write_sources(tmp_path)
+    docs = iter_documents(expand_sources(str(tmp_path)), workers=workers)
+    batches = list(batched(docs, 16))
+    assert [len(b) for b in batches] == [16, 16, 16, 2]
+    ids = sorted(d["transaction_id"] for b in batches for d in b)
+    assert ids == [make_transaction(i)["transaction_id"] for i in range(50)]
+
+
+def test_iter_documents_hands_back_bounded_chunks_and_stops_early(tmp_path):
+    _write_sources(tmp_path)
+    paths = expand_sources(str(tmp_path))
+    docs = iter_documents(paths, workers=2, chunk_size=4, max_chunks=1)
+    assert len(list(itertools.islice(docs, 5))) == 5
+    docs.close()  # workers blocked on the full queue are drained, not left hanging
+
+    (tmp_path / "bad.jsonl").write_text('{"transaction_id": "x"}\n')
+    with pytest.raises(KeyError):
+        list(iter_documents(paths + [str(tmp_path / "bad.jsonl")], workers=2, chunk_size=4))
+
+
+def test_parquet_without_pyarrow_names_the_dependency(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    with pytest.raises(RuntimeError, match="pip install pyarrow"):
+        list(iter_parquet(str(tmp_path / "a.parquet")))
+
+
+def test_parquet_matches_csv(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    _write_sources(tmp_path)
+    rows = [make_transaction(i) for i in range(30)]
+    pq.write_table(pa.Table.from_pylist(rows), str(tmp_path / "a.parquet"), row_group_size=7)
+    from_parquet = parse_file(str(tmp_path / "a.parquet"))
+    from_csv = parse_file(str(tmp_path / "a.csv"))
+    assert [d["transaction_id"] for d in from_parquet] == [d["transaction_id"] for d in from_csv]
+    assert from_parquet[3]["amount"] == from_csv[3]["amount"]
+    assert from_parquet[3]["content"] == from_csv[3]["content"]
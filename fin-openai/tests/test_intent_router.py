@@ -0,0 +1,124 @@
+import pytest
+
+from benchmarks.fakes import FakeOpenAI
+from src.agents.agent_client import AgentClient, Message
+from src.agents.intent_router import IntentRouter
+from src.domain.payments.rollups import RollupStore
+
+
+def test_fee_quote_is_exact():
+    routed = IntentRouter().route("What's the fee on $1,250.50?")
+    assert routed.intent == "fee_quote"
+    assert routed.slots == {"amount": 1250.5, "fee": 36.56}
+    assert "$36.56" in routed.reply and "$1,213.94" in routed.reply
+
+
+@pytest.mark.parametrize(
+    "text,amount",
+    [
+        ("What's the fee on 100?", 100.0),
+        ("fee on 80 dollars", 80.0),
+        ("What's the card processing fee on a $40 payment?", 40.0),
+        ("Calculate the transaction fee for $12", 12.0),
+    ],
+)
+def test_bare_amount_needs_an_on_for_slot_or_unit(text, amount):
+    assert IntentRouter().route(text).slots["amount"] == amount
+
+
+def test_earlier_turns_with_blocking_context_send_follow_ups_to_the_model():
+    router = IntentRouter()
+    assert router.route("What about the fee on $100?", history=["What's the Amex fee?"]) is None
+    assert router.route("What about the fee on $100?", history=["Hi"]).intent == "fee_quote"
+
+
+def test_fee_schedule_without_amount():
+    routed = IntentRouter().route("What are your processing fees?")
+    assert routed.intent == "fee_schedule"
+    assert "2.9% + $0.30" in routed.reply
+
+
+@pytest.mark.parametrize(
+    "status,refundable", [("settled", True), ("captured", True), ("authorized", False), ("chargeback", False)]
+)
+def test_refund_eligibility_by_status(status, refundable):
+    routed = IntentRouter().route(f"Can a {status} transaction be refunded?")
+    assert routed.intent == "refund_eligibility"
+    assert routed.slots["refundable"] is refundable
+    assert routed.reply.startswith("Yes" if refundable else "No")
+
+
+def test_refund_eligibility_looks_up_the_transaction():
+    store = RollupStore()
+    store.apply(
+        [
+            {
+                "transaction_id": "txn_00000042",
+                "amount": 12.0,
+                "currency": "USD",
+                "status": "authorized",
+                "merchant_id": "mid_001",
+                "created_utc": "2024-06-01T10:00:00Z",
+            }
+        ]
+    )
+    router = IntentRouter(lookup_status=store.status_of)
+    routed = router.route("Can I refund txn_00000042?")
+    assert routed.slots == {"transaction_id": "txn_00000042", "status": "authorized", "refundable": False}
+    assert router.route("Can I refund txn_99999999?") is None  # unknown id: let the model ask
+    assert IntentRouter().route("Can I refund txn_00000042?") is None  # no lookup configured
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "show refunds",
+        "fees?",
+        "Why is my fee 3.5%?",
+        "What's the fee on a €100 Amex payment?",
+        "What's the fee on $100 and $200?",
+        "Total fees for mid_002 last month?",
+        "Can I refund txn_1 and txn_2?",
+        "What's the fee on $100? Can I refund it?",
+        "refund card 4111111111111111",
+        "What's the fee on 2024 transactions?",
+        "What's the fee for 10 payments?",
+        "What's the fee on $100 in euros?",
+        "What's the fee on -100?",
+        "Is the refund fee $5?",
+        "fee on 100 dollars for a refund",
+        "fee on $0?",
+        "What's the annual fee?",
+        "What's the PCI fee?",
+        "What are the wire transfer fees?",
+        "What's the fee on a $100 ACH transfer?",
+        "Is there a fee on $100 ACH?",
+        "fees for a $50 debit transaction",
+        "What is the fee if I process $5000 a month?",
+        "What's the fee on $5000 per month?",
+        "Can I refund the fee?",
+        "Can I avoid refund fees?",
+    ],
+)
+def test_ambiguous_messages_go_to_the_model(text):
+    assert IntentRouter().route(text) is None
+
+
+def test_agent_answers_routed_questions_without_the_model():
+    fake = FakeOpenAI()
+    agent = AgentClient(client=fake, model="test", router=IntentRouter())
+    reply = agent.chat([Message(role="user", content="How much is the fee on $100?")])
+    assert reply.startswith("The processing fee on $100.00 is $3.20")
+    assert fake.chat_calls == 0
+
+    agent.chat([Message(role="user", content="Summarize chargebacks for mid_001")])
+    assert fake.chat_calls == 1
+
+    agent.chat(
+        [
+            Message(role="user", content="What's the fee on a €100 payment?"),
+            Message(role="assistant", content="..."),
+            Message(role="user", content="And the fee on $100?"),
+        ]
+    )
+    assert fake.chat_calls == 2
@@ -0,0 +1,117 @@
+from types import SimpleNamespace
+
+import pytest
+from azure.core.exceptions import HttpResponseError
+from fastapi.testclient import TestClient
+
+from src.api import main
+from src.search.filters import any_of, facet_number
+from src.search.search_client import AzureSearch
+
+
+class FacetResults:
+    def __init__(self, count, facets):
+        self._count, self._facets = count, facets
+
+    def __iter__(self):
+        return iter(())
+
+    def get_count(self):
+        return self._count
+
+    def get_facets(self):
+        return self._facets
+
+
+class FacetingSearchClient:
+    def __init__(self):
+        self.calls = []
+
+    def search(self, search_text=None, **kwargs):
+        self.calls.append(kwargs)
+        return FacetResults(
+            7,
+            {
+                "status": [{"value": "refunded", "count": 4}, {"value": "chargeback", "count": 3}],
+                "currency": [{"value": "USD", "count": 5}, {"value": "EUR", "count": 2}],
+                "amount": [
+                    {"to": 10.0, "count": 1, "from": None},
+                    {"from": 10.0, "to": 100.0, "count": 6},
+                ],
+                "created_utc": [{"value": "2024-06-01T00:00:00Z", "count": 7}],
+            },
+        )
+
+
+def test_summary_uses_facets_without_documents(monkeypatch):
+    fake = FacetingSearchClient()
+    search = AzureSearch(service_name="svc", index_name="idx", search_client=fake)
+    monkeypatch.setattr(main, "get_azure_search", lambda: search)
+
+    res = TestClient(main.app).get(
+        "/merchants/mid_002/summary",
+        params={"status": ["refunded", "chargeback"], "amount_edges": "10,100", "created_from": "2024-06-01T00:00:00Z"},
+    )
+    assert res.status_code == 200
+    body = res.json()
+    assert body["count"] == 7
+    assert body["by_status"] == {"refunded": 4, "chargeback": 3}
+    assert body["by_currency"] == {"USD": 5, "EUR": 2}
+    assert body["by_amount"][0] == {"to": 10.0, "count": 1}
+    assert body["by_day"] == [{"start": "2024-06-01T00:00:00Z", "count": 7}]
+
+    (call,) = fake.calls
+    assert call["top"] == 0 and call["include_total_count"] is True
+    assert "amount,values:10|100" in call["facets"]
+    assert "merchant_id eq 'mid_002'" in call["filter"]
+    assert "search.in(status, 'refunded|chargeback', '|')" in call["filter"]
+    assert "created_utc ge 2024-06-01T00:00:00Z" in call["filter"]
+
+
+def test_summary_sends_each_edge_once(monkeypatch):
+    fake = FacetingSearchClient()
+    search = AzureSearch(service_name="svc", index_name="idx", search_client=fake)
+    monkeypatch.setattr(main, "get_azure_search", lambda: search)
+    res = TestClient(main.app).get("/merchants/mid_002/summary", params={"amount_edges": "100,10,10.0,100"})
+    assert res.status_code == 200
+    assert "amount,values:10|100" in fake.calls[0]["facets"]
+
+
+@pytest.mark.parametrize("status,expected", [(400, 409), (503, 502)])
+def test_summary_maps_search_errors(monkeypatch, status, expected):
+    response = SimpleNamespace(status_code=status, reason="error", headers={}, text=lambda: "", request=None)
+
+    class FailingSearchClient:
+        def search(self, search_text=None, **kwargs):
+            raise HttpResponseError(message="Field 'amount' is not facetable", response=response)
+
+    search = AzureSearch(service_name="svc", index_name="idx", search_client=FailingSearchClient())
+    monkeypatch.setattr(main, "get_azure_search", lambda: search)
+    res = TestClient(main.app).get("/merchants/mid_002/summary")
+    assert res.status_code == expected
+    if expected == 409:
+        assert "not facetable" in res.json()["detail"]
+
+
+def test_summary_rejects_bad_interval():
+    res = TestClient(main.app).get("/merchants/mid_002/summary", params={"interval": "hour"})
+    assert res.status_code == 400
+
+
+def test_any_of():
+    assert any_of("status", None) is None
+    assert any_of("status", ["refunded"]) == "status eq 'refunded'"
+    assert any_of("status", ["a|b", "c"]) == "search.in(status, 'a|b,c', ',')"
+    assert any_of("status", ["a|,;~^", "b"]) == "status eq 'a|,;~^' or status eq 'b'"
+
+
+def test_facet_edges_are_plain_exact_decimals():
+    assert [facet_number(e) for e in (10.0, 1234567.5, 1e6, 0.25, 1e-7)] == [
+        "10",
+        "1234567.5",
+        "1000000",
+        "0.25",
+        "0.0000001",
+    ]
+    with pytest.raises(ValueError):
+        facet_number(float("inf"))
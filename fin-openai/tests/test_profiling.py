@@ -0,0 +1,102 @@
+import json
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.observability import profiling
+from src.observability.profiling import ProfilingMiddleware, profile_thread, stage
+
+
+def _make_app(tmp_path, **kwargs):
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, output_dir=str(tmp_path), **kwargs)
+
+    @app.get("/work")
+    def work():
+        with profile_thread():
+            with stage("model"):
+                sum(range(1000))
+        return {"ok": True}
+
+    return app
+
+
+def _summaries(tmp_path):
+    return [json.load(open(os.path.join(tmp_path, n))) for n in sorted(os.listdir(tmp_path)) if n.endswith(".json")]
+
+
+def test_sampled_request_writes_profile_and_stages(tmp_path):
+    client = TestClient(_make_app(tmp_path, sample_rate=1.0))
+    assert client.get("/work").status_code == 200
+
+    [summary] = _summaries(tmp_path)
+    assert summary["reason"] == "sampled"
+    assert summary["status"] == 200
+    assert [s["stage"] for s in summary["stages"]] == ["model"]
+    assert any(n.endswith(".prof") for n in os.listdir(tmp_path))
+
+
+def test_admin_header_required_when_not_sampling(tmp_path):
+    client = TestClient(_make_app(tmp_path, admin_token="s3cret"))
+    client.get("/work")
+    client.get("/work", headers={"x-profile-token": "wrong"})
+    assert _summaries(tmp_path) == []
+
+    client.get("/work", headers={"x-profile-token": "s3cret"})
+    [summary] = _summaries(tmp_path)
+    assert summary["reason"] == "header"
+
+
+def test_worker_thread_profile_never_fails_the_request(tmp_path, monkeypatch):
+    class BusyProfile:
+        """Python 3.12+: a second profiler raises while the middleware's one is active."""
+
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    real_profile = profiling.cProfile.Profile
+    profilers = iter([real_profile(), BusyProfile()])  # the middleware's, then the thread's
+    monkeypatch.setattr(profiling.cProfile, "Profile", lambda: next(profilers))
+    client = TestClient(_make_app(tmp_path, sample_rate=1.0))
+    assert client.get("/work").status_code == 200
+    [summary] = _summaries(tmp_path)
+    assert [s["stage"] for s in summary["stages"]] == ["model"]
+
+
+def test_request_runs_unprofiled_when_the_profiler_cannot_start(tmp_path, monkeypatch):
+    class BusyProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(profiling.cProfile, "Profile", BusyProfile)
+    client = TestClient(_make_app(tmp_path, sample_rate=1.0))
+    assert client.get("/work").status_code == 200
+    assert client.get("/work").status_code == 200
+    assert _summaries(tmp_path) == []
+    assert profiling._current.get() is None
+    assert profiling._slot.acquire(blocking=False)  # released for the next sampled request
+    profiling._slot.release()
+
+
+def test_single_profiler_is_reused_on_sys_monitoring(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "_PROFILER_SEES_ALL_THREADS", True)
+    enabled = []
+    real_profile = profiling.cProfile.Profile
+
+    def profile():
+        enabled.append(1)
+        return real_profile()
+
+    monkeypatch.setattr(profiling.cProfile, "Profile", profile)
+    assert TestClient(_make_app(tmp_path, sample_rate=1.0)).get("/work").status_code == 200
+    assert len(enabled) == 1
+
+
+def test_rotation_keeps_newest_profiles(tmp_path):
+    client = TestClient(_make_app(tmp_path, sample_rate=1.0, max_files=2))
+    for _ in range(4):
+        client.get("/work")
+    names = os.listdir(tmp_path)
+    assert len([n for n in names if n.endswith(".json")]) == 2
+    assert len([n for n in names if n.endswith(".prof")]) == 2
@@ -0,0 +1,100 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.ml import rate_governor
+from src.ml.rate_governor import RateGovernor, RateLimitTimeout
+
+
+class Throttled(Exception):
+    status_code = 429
+
+
+def test_aimd_halves_once_per_burst_and_recovers():
+    gov = RateGovernor(max_concurrency=32, initial_concurrency=8)
+    for _ in range(3):  # three calls hit the same 429 burst
+        with pytest.raises(Throttled):
+            with gov.slot(10):
+                raise Throttled()
+    assert gov.limit == 4 and gov.throttled == 1
+
+    for _ in range(20):
+        with gov.slot(10):
+            pass
+    assert 6 < gov.limit < 8
+    assert gov.in_flight == 0
+
+
+def test_retry_after_pauses_all_admissions():
+    gov = RateGovernor()
+    gov.http_hook(SimpleNamespace(status_code=429, headers={"retry-after-ms": "200"}))
+    with pytest.raises(RateLimitTimeout):
+        gov.acquire(10, timeout=0.05)
+    t0 = time.monotonic()
+    gov.release(gov.acquire(10, timeout=2.0))
+    assert time.monotonic() - t0 >= 0.1
+    assert gov.stats()["waiting"] == 0
+
+
+def test_interactive_is_admitted_before_bulk():
+    gov = RateGovernor(max_concurrency=1, initial_concurrency=1, bulk_reserve=0.0)
+    held = gov.acquire(1)
+    order = []
+
+    def call(priority):
+        with gov.slot(1, priority=priority):
+            order.append(priority)
+
+    bulk = threading.Thread(target=call, args=("bulk",))
+    bulk.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=call, args=("interactive",))
+    interactive.start()
+    time.sleep(0.05)
+    gov.release(held)
+    bulk.join(2)
+    interactive.join(2)
+    assert order == ["interactive", "bulk"]
+
+
+def test_token_bucket_paces_and_reserves_headroom_for_interactive():
+    # 600 TPM with a 1s burst: 10 tokens of capacity refilled at 10 tokens/s
+    gov = RateGovernor(tokens_per_minute=600, burst_s=1.0, bulk_reserve=0.5)
+    gov.release(gov.acquire(6, priority="interactive"))
+    with pytest.raises(RateLimitTimeout):
+        gov.acquire(2, priority="bulk", timeout=0.05)  # would dip into the interactive reserve
+    gov.release(gov.acquire(2, priority="interactive", timeout=0.05))
+
+    gov.observe(200, {"x-ratelimit-remaining-tokens": "0"})
+    t0 = time.monotonic()
+    gov.release(gov.acquire(3, timeout=2.0))
+    assert time.monotonic() - t0 >= 0.25
+
+
+def test_each_worker_paces_at_its_share_of_the_quota(monkeypatch):
+    settings = SimpleNamespace(
+        openai_governor_enabled=True,
+        openai_tpm_limit=60_000,
+        openai_rpm_limit=600,
+        openai_quota_workers=4,
+        openai_max_concurrency=32,
+        openai_bulk_reserve=0.25,
+    )
+    monkeypatch.setattr(rate_governor, "get_settings", lambda: settings)
+    rate_governor.get_rate_governor.cache_clear()
+    try:
+        gov = rate_governor.get_rate_governor()
+    finally:
+        rate_governor.get_rate_governor.cache_clear()
+    assert gov.tokens.rate * 60 == 15_000 and gov.requests.rate * 60 == 150
+
+
+def test_malformed_rate_limit_headers_are_ignored():
+    gov = RateGovernor(tokens_per_minute=6000)
+    gov.http_hook(SimpleNamespace(status_code=200, headers={"x-ratelimit-remaining-tokens": "n/a"}))
+    gov.http_hook(SimpleNamespace(status_code=200, headers={"x-ratelimit-remaining-requests": "1e"}))
+    gov.release(gov.acquire(10, timeout=0.5))
+    gov.http_hook(SimpleNamespace(status_code=200, headers={"x-ratelimit-remaining-tokens": "0"}))
+    assert gov.stats()["paused_s"] > 0
@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from benchmarks.fakes import FakeOpenAI
+from src.agents.agent_client import AgentClient
+from src.api import main
+
+
+def _wait_ready(client, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        res = client.get("/readyz")
+        if res.status_code == 200:
+            return res.json()
+        time.sleep(0.02)
+    raise AssertionError("instance never became ready")
+
+
+def test_readyz_reports_ready_after_warmup():
+    with TestClient(main.app) as client:
+        body = _wait_ready(client)
+        assert body["status"] == "ready"
+        assert body["timed_out"] is False
+        assert body["steps"]["agent"]["ok"] is True
+
+
+def test_readyz_waits_for_slow_warmup_then_times_out(monkeypatch):
+    monkeypatch.setattr("src.api.warmup.run_warmup", lambda state, settings: time.sleep(1.0))
+    monkeypatch.setattr(main.settings, "warmup_timeout_s", 0.2)
+    with TestClient(main.app) as client:
+        assert client.get("/readyz").status_code == 503
+        body = _wait_ready(client)
+        assert body["timed_out"] is True
+        assert client.get("/healthz").status_code == 200
+
+
+def test_ping_sends_one_token_only_when_a_model_is_configured():
+    fake = FakeOpenAI()
+    assert AgentClient(client=fake, model="test", router=None).ping() is True
+    assert AgentClient(client=fake, model=None, router=None).ping() is False
+    assert fake.chat_calls == 1
+
+
+def test_shutdown_waits_for_the_cancelled_warmup(monkeypatch):
+    tasks = []
+
+    async def slow_warm_up(state, settings):
+        tasks.append(asyncio.current_task())
+        await asyncio.sleep(10)
+
+    async def start_and_stop():
+        async with main.lifespan(main.app):
+            await asyncio.sleep(0)
+        return tasks[0].cancelled()
+
+    monkeypatch.setattr(main, "warm_up", slow_warm_up)
+    monkeypatch.setattr(main.settings, "warmup_enabled", True)
+    assert asyncio.run(start_and_stop()) is True
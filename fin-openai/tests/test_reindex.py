@@ -0,0 +1,145 @@
+import os
+from types import SimpleNamespace
+
+from benchmarks.fakes import FakeSearchClient, make_transaction
+from src.search import search_client
+from src.search.index_pointer import IndexPointer, read_pointer, write_pointer
+from src.search.reindex import bulk_load, validate_index
+from src.search.search_client import AzureSearch, active_index_name
+
+
+class ThrottlingIndex(FakeSearchClient):
+    """Stores uploads; the first attempt at every third document is throttled with a 503."""
+
+    def __init__(self, **kwargs):
+        super().__init__(corpus_size=0, **kwargs)
+        self.stored = {}
+        self.throttled = set()
+
+    def upload_documents(self, documents, **kwargs):
+        results = []
+        for d in documents:
+            key = d["transaction_id"]
+            if int(key[-4:]) % 3 == 0 and key not in self.throttled:
+                self.throttled.add(key)
+                results.append(SimpleNamespace(key=key, succeeded=False, status_code=503))
+                continue
+            self.stored[key] = d
+            results.append(SimpleNamespace(key=key, succeeded=True, status_code=201))
+        self._docs = sorted(self.stored.values(), key=lambda d: d["transaction_id"])
+        return results
+
+    def get_document_count(self):
+        return len(self.stored)
+
+    def get_document(self, key, **kwargs):
+        return self.stored[key]
+
+
+def test_pointer_switch_is_picked_up(tmp_path):
+    path = str(tmp_path / "index.json")
+    pointer = IndexPointer(path, default="transactions")
+    assert pointer.active_index() == "transactions"
+
+    write_pointer(path, "transactions-v2", previous="transactions")
+    assert pointer.active_index() == "transactions-v2"
+    write_pointer(path, "transactions-v3-longer", previous="transactions-v2")
+    assert pointer.active_index() == "transactions-v3-longer"
+    assert read_pointer(path)["previous"] == "transactions-v2"
+    assert [p.name for p in tmp_path.iterdir()] == ["index.json"]  # no temp files left behind
+
+
+def test_pointer_sees_a_same_size_rewrite_within_one_mtime_tick(tmp_path):
+    path = str(tmp_path / "index.json")
+    write_pointer(path, "transactions-v2", previous="transactions-v1")
+    pointer = IndexPointer(path)
+    assert pointer.active_index() == "transactions-v2"
+    before = os.stat(path)
+    write_pointer(path, "transactions-v1", previous="transactions-v2")  # rollback, same size
+    os.utime(path, ns=(before.st_atime_ns, before.st_mtime_ns))  # a filesystem with coarse mtimes
+    assert os.stat(path).st_size == before.st_size
+    assert pointer.active_index() == "transactions-v1"
+
+
+def test_active_index_name_follows_pointer(tmp_path, monkeypatch):
+    path = str(tmp_path / "index.json")
+    monkeypatch.setattr(search_client, "_index_pointer", lambda: IndexPointer(path, default="base"))
+    assert active_index_name() == "base"
+    write_pointer(path, "base-20250101")
+    assert active_index_name() == "base-20250101"
+
+
+def test_bulk_load_retries_throttled_documents():
+    target = ThrottlingIndex()
+    docs = (make_transaction(i) for i in range(250))
+    result = bulk_load(target, docs, batch_size=40, workers=3, backoff_s=0.0)
+    assert result.uploaded == 250 and not result.failed_keys
+    assert result.batches == 7 and result.retries == 7
+    assert len(target.stored) == 250
+
+
+class TooLarge(Exception):
+    status_code = 413
+
+
+class RejectingIndex:
+    """`a` is rejected for good (400), `c` is throttled once (503); batches over `max_docs` are 413."""
+
+    def __init__(self, max_docs=1000):
+        self.max_docs = max_docs
+        self.calls = []
+        self.throttled = False
+
+    def upload_documents(self, documents):
+        keys = [d["transaction_id"] for d in documents]
+        self.calls.append(keys)
+        if len(keys) > self.max_docs:
+            raise TooLarge("request entity too large")
+        results = []
+        for key in keys:
+            status = 201
+            if key == "a":
+                status = 400
+            elif key == "c" and not self.throttled:
+                self.throttled, status = True, 503
+            results.append(SimpleNamespace(key=key, succeeded=status == 201, status_code=status))
+        return results
+
+
+def test_bulk_load_reports_rejections_from_every_attempt():
+    index = RejectingIndex()
+    result = bulk_load(index, [{"transaction_id": k} for k in "abc"], backoff_s=0.0)
+    assert result.uploaded == 2 and result.failed_keys == ["a"] and result.retries == 1
+    assert index.calls == [["a", "b", "c"], ["c"]]
+
+
+def test_bulk_load_splits_batches_rejected_as_too_large():
+    index = RejectingIndex(max_docs=2)
+    result = bulk_load(index, [{"transaction_id": k} for k in "abcd"], backoff_s=0.0)
+    assert result.uploaded == 3 and result.failed_keys == ["a"]
+    assert index.calls[:3] == [["a", "b", "c", "d"], ["a", "b"], ["c", "d"]]
+
+
+def test_validate_index_compares_against_live():
+    target = ThrottlingIndex()
+    bulk_load(target, (make_transaction(i) for i in range(30)), backoff_s=0.0)
+    new = AzureSearch(service_name="svc", index_name="new", search_client=target)
+    live = AzureSearch(service_name="svc", index_name="live", search_client=FakeSearchClient(corpus_size=30))
+
+    report = validate_index(
+        new, expected=30, live=live, sample_queries=["refund"], sample_keys=["txn_00000003"]
+    )
+    assert report.ok and report.queries == {"refund": 1.0}
+
+    short = validate_index(new, expected=31, count_timeout_s=0.0, sample_keys=["txn_99999999"])
+    assert not short.ok and short.missing_keys == ["txn_99999999"]
+
+
+def test_ingest_targets_the_pointer_s_live_index(tmp_path, monkeypatch):
+    import scripts.ingest_search as ingest
+
+    path = str(tmp_path / "pointer.json")
+    write_pointer(path, "transactions-v2", previous="transactions")
+    monkeypatch.setattr(search_client, "_index_pointer", lambda: IndexPointer(path, default="transactions"))
+    assert ingest.target_index() == "transactions-v2"
+    assert ingest.target_index("scratch") == "scratch"
@@ -0,0 +1,65 @@
+import time
+
+from src.agents.agent_client import AgentClient, Message
+from src.agents.retrieval import Retriever, trim_to_budget
+from src.search.ranking import reciprocal_rank_fusion
+
+from benchmarks.fakes import FakeOpenAI
+
+
+def _doc(txn, content=None):
+    return {"transaction_id": txn, "content": content or f"txn {txn} status settled"}
+
+
+class StubSearch:
+    def __init__(self, vector_delay=0.0):
+        self.vector_delay = vector_delay
+        self.vectors = []
+
+    def query(self, query_text, *, top):
+        return [_doc("a"), _doc("b"), _doc("c")]
+
+    def vector_query(self, query_text, *, top, vector):
+        self.vectors.append(vector)
+        time.sleep(self.vector_delay)
+        return [_doc("c"), _doc("d")]
+
+
+def test_rrf_rewards_documents_ranked_by_both_retrievers():
+    fused = reciprocal_rank_fusion([[_doc("a"), _doc("c")], [_doc("c"), _doc("d")]])
+    assert [d["transaction_id"] for d in fused] == ["c", "a", "d"]
+
+
+def test_retriever_fuses_keyword_and_vector_results():
+    search = StubSearch()
+    retriever = Retriever(search, top_k=3, deadline_s=1.0, embed=lambda texts: [[0.5, 0.5]])
+    ctx = retriever.retrieve("refunds for mid_002")
+    assert ctx.completed == ["keyword", "vector"] and not ctx.partial
+    assert [d["transaction_id"] for d in ctx.documents] == ["c", "a", "b"]
+    assert search.vectors == [[0.5, 0.5]]  # the precomputed embedding is reused
+
+
+def test_retriever_returns_partial_results_at_deadline():
+    retriever = Retriever(StubSearch(vector_delay=1.0), deadline_s=0.1, embed=lambda texts: [[0.0]])
+    t0 = time.monotonic()
+    ctx = retriever.retrieve("refund")
+    assert time.monotonic() - t0 < 0.5
+    assert ctx.missing == ["vector"]
+    assert [d["transaction_id"] for d in ctx.documents] == ["a", "b", "c"]
+
+
+def test_context_is_trimmed_to_token_budget():
+    docs = [_doc(str(i), "x" * 400) for i in range(10)]
+    assert len(trim_to_budget(docs, 350)) == 3
+
+
+def test_agent_prepends_retrieved_context():
+    fake = FakeOpenAI()
+    seen = []
+    original = fake.chat.completions.create
+    fake.chat.completions.create = lambda **kw: seen.append(kw["messages"]) or original(**kw)
+    retriever = Retriever(StubSearch(), deadline_s=1.0, use_vectors=False)
+    agent = AgentClient(client=fake, model="test", retriever=retriever)
+    agent.chat([Message(role="user", content="show refunds")])
+    assert seen[0][0]["role"] == "system"
+    assert "[1] txn a status settled" in seen[0][0]["content"]
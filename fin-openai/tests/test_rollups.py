@@ -0,0 +1,101 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.fakes import make_transaction
+from src.domain.payments.rollups import RollupStore, utc_day
+from src.domain.payments.tools import merchant_volume
+
+
+def _row(txn_id, amount, status="settled", currency="USD", merchant="mid_001", created="2024-06-01T10:00:00Z"):
+    return {
+        "transaction_id": txn_id,
+        "amount": amount,
+        "currency": currency,
+        "status": status,
+        "merchant_id": merchant,
+        "created_utc": created,
+    }
+
+
+def test_apply_is_idempotent_and_aggregates():
+    store = RollupStore()
+    rows = [_row("t1", 10.0), _row("t2", 30.0), _row("t3", 5.0, status="refunded")]
+    assert store.apply(rows) == 3
+    assert store.apply(rows) == 0  # re-running an ingest does not double count
+
+    (settled,) = store.query(merchant_id="mid_001", status=["settled"])
+    assert settled == {"count": 2, "sum": 40.0, "min": 10.0, "max": 30.0}
+    assert [r["status"] for r in store.query(group_by=["status"])] == ["refunded", "settled"]
+
+
+def test_changed_transaction_moves_between_groups():
+    store = RollupStore()
+    store.apply([_row("t1", 10.0), _row("t2", 30.0)])
+    assert store.apply([_row("t2", 30.0, status="refunded")]) == 1
+
+    by_status = {r["status"]: r for r in store.query(group_by=["status"])}
+    assert by_status["settled"] == {"status": "settled", "count": 1, "sum": 10.0, "min": 10.0, "max": 10.0}
+    assert by_status["refunded"]["count"] == 1
+
+
+def test_query_by_day_range_and_utc_day():
+    store = RollupStore()
+    store.apply(
+        [
+            _row("t1", 1.0, created="2024-06-01T23:30:00-02:00"),  # 2024-06-02 in UTC
+            _row("t2", 2.0, created="2024-06-03T00:00:00Z"),
+        ]
+    )
+    assert utc_day("2024-06-01T23:30:00-02:00") == "2024-06-02"
+    days = store.query(start="2024-06-02", end="2024-06-03", group_by=["day"])
+    assert days == [{"day": "2024-06-02", "count": 1, "sum": 1.0, "min": 1.0, "max": 1.0}]
+    with pytest.raises(ValueError):
+        store.query(group_by=["amount"])
+
+
+def test_merchant_volume_tool_reads_rollups(tmp_path):
+    store = RollupStore(str(tmp_path / "rollups.db"))
+    store.apply([make_transaction(i) for i in range(2000)])
+
+    t0 = time.perf_counter()
+    volume = merchant_volume("mid_001", store=store)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    assert volume["count"] == sum(v["count"] for v in volume["by_status"].values())
+    assert volume["count"] == sum(v["count"] for v in volume["by_currency"].values())
+    assert 0.0 <= volume["refund_rate"] <= 1.0
+    assert elapsed_ms < 100
+
+
+def test_ingest_rolls_up_only_rows_the_index_accepted(tmp_path, monkeypatch):
+    import scripts.ingest_search as ingest
+
+    class Index:
+        def __init__(self, **kwargs):
+            pass
+
+        def upload_documents(self, docs):
+            # every third row is rejected by the service
+            return [SimpleNamespace(key=d["transaction_id"], succeeded=i % 3 != 0) for i, d in enumerate(docs)]
+
+    with open(tmp_path / "rows.jsonl", "w", encoding="utf-8") as f:
+        for i in range(9):
+            f.write(json.dumps(make_transaction(i)) + "\n")
+    store = RollupStore()
+    monkeypatch.setenv("INGEST_SOURCES", str(tmp_path / "rows.jsonl"))
+    monkeypatch.setenv("INGEST_WORKERS", "1")
+    monkeypatch.setattr(ingest, "ensure_index", lambda *a, **kw: None)
+    monkeypatch.setattr(ingest, "get_service_endpoint", lambda: "https://svc")
+    monkeypatch.setattr(ingest, "DefaultAzureCredential", lambda: None)
+    monkeypatch.setattr(ingest, "SearchClient", Index)
+    monkeypatch.setattr(ingest, "add_embeddings", lambda docs, field: None)
+    monkeypatch.setattr(ingest, "get_settings", lambda: SimpleNamespace(rollup_db_path="x"))
+    monkeypatch.setattr(ingest, "get_rollup_store", lambda: store)
+    ingest.main([])
+
+    assert store.status_of("txn_00000000") is None  # rejected
+    assert store.status_of("txn_00000001") == make_transaction(1)["status"]
+    assert sum(r["count"] for r in store.query()) == 6
@@ -0,0 +1,70 @@
+from benchmarks.fakes import FakeSearchClient
+from src.config import get_settings
+from src.search.models import DEFAULT_SELECT, SearchHit
+from src.search.search_client import AzureSearch
+
+
+class RecordingSearchClient(FakeSearchClient):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = []
+
+    def search(self, search_text=None, **kwargs):
+        self.calls.append(kwargs)
+        return super().search(search_text, top=kwargs.get("top"), select=kwargs.get("select"))
+
+
+def _search(**kwargs):
+    fake = RecordingSearchClient(corpus_size=3, vector_dim=16)
+    return fake, AzureSearch(service_name="svc", index_name="idx", search_client=fake, **kwargs)
+
+
+def test_default_projection_excludes_vectors():
+    fake, search = _search()
+    hits = search.query("refund", top=2)
+    assert fake.calls[0]["select"] == DEFAULT_SELECT
+    assert all(isinstance(h, SearchHit) and "contentVector" not in h for h in hits)
+
+
+def test_star_select_returns_every_field():
+    fake, search = _search()
+    [hit] = search.query("refund", top=1, select=["*"])
+    assert fake.calls[0]["select"] is None
+    assert len(hit["contentVector"]) == 16
+
+
+def test_search_hit_behaves_like_a_read_only_mapping():
+    hit = SearchHit.from_result({"transaction_id": "txn_1", "amount": 9.5, "@search.score": 2.0, "region": "eu"})
+    assert hit.transaction_id == "txn_1" and hit.score == 2.0
+    assert hit["@search.score"] == 2.0 and hit.get("region") == "eu"
+    assert {**hit} == {"transaction_id": "txn_1", "amount": 9.5, "@search.score": 2.0, "region": "eu"}
+    assert not hasattr(hit, "__dict__")
+
+
+def test_a_document_field_named_score_is_not_the_search_score():
+    hit = SearchHit.from_result({"transaction_id": "txn_1", "score": 720, "@search.score": 1.5})
+    assert hit.score == 1.5 and hit["score"] == 720
+    assert {**hit} == {"transaction_id": "txn_1", "@search.score": 1.5, "score": 720}
+    plain = SearchHit.from_result({"transaction_id": "txn_2", "score": 720})
+    assert "@search.score" not in plain and plain.score is None
+
+
+def test_search_hit_keeps_null_fields_like_a_dict():
+    hit = SearchHit.from_result({"transaction_id": "txn_1", "content": None, "@search.score": None})
+    assert hit.get("content", "x") is None and hit.get("status", "x") == "x"
+    assert "content" in hit and "status" not in hit
+    assert {**hit} == {"transaction_id": "txn_1", "content": None, "@search.score": None}
+
+
+def test_default_select_setting_ignores_spaces_and_empty_fields(monkeypatch):
+    monkeypatch.setattr(get_settings(), "azure_search_default_select", " transaction_id, content ,,")
+    fake, search = _search()
+    search.query("refund", top=1)
+    assert fake.calls[0]["select"] == ["transaction_id", "content"]
+
+
+def test_iter_query_streams_hits_lazily():
+    fake, search = _search()
+    stream = search.iter_query("refund", top=3)
+    assert fake.calls == []
+    assert next(stream).transaction_id == "txn_00000000"
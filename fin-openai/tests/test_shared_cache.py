@@ -0,0 +1,173 @@
+import pickle
+import sqlite3
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.fakes import FakeOpenAI, FakeSearchClient
+from src.agents import agent_client
+from src.agents.agent_client import AgentClient, Message
+from src.agents.retrieval import RetrievedContext
+from src.cache import shared_cache
+from src.cache.shared_cache import SharedCache, make_key
+from src.ml import embeddings
+from src.search import search_client
+from src.search.search_client import AzureSearch
+
+
+def test_entries_are_shared_across_processes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = SharedCache(path)
+    code = (
+        "from src.cache.shared_cache import SharedCache\n"
+        f"SharedCache({path!r}).set('emb', 'k', [0.5, 0.25])\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+    assert cache.get("emb", "k") == [0.5, 0.25]
+    assert oct((tmp_path / "cache.db").stat().st_mode & 0o777) == "0o600"
+
+
+def test_a_held_write_lock_never_stalls_the_request_path(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = SharedCache(path, touch_interval_s=0.0)
+    cache.set("ns", "k", [1, 2])
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")  # another worker in the middle of a write
+    try:
+        t0 = time.monotonic()
+        assert cache.get("ns", "k") == [1, 2]  # the LRU touch gives up quickly
+        cache.set("ns", "k2", 3)  # skipped, not raised
+        assert time.monotonic() - t0 < 1.0
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+
+def test_unreadable_cache_is_a_miss(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    cache = SharedCache(path)
+    cache.set("ns", "k", 1)
+    sqlite3.connect(path, isolation_level=None).execute("DROP TABLE cache")
+    assert cache.get("ns", "k") is None
+    cache.set("ns", "k", 2)
+
+    garbage = tmp_path / "garbage.db"
+    garbage.write_bytes(b"not a database" * 100)
+    settings = SimpleNamespace(
+        shared_cache_path=str(garbage), shared_cache_max_entries=10, shared_cache_busy_timeout_ms=50
+    )
+    monkeypatch.setattr(shared_cache, "get_settings", lambda: settings)
+    shared_cache.get_shared_cache.cache_clear()
+    try:
+        assert shared_cache.get_shared_cache() is None  # disabled, not raised on every request
+    finally:
+        shared_cache.get_shared_cache.cache_clear()
+
+
+def test_ttl_and_lru_trimming(tmp_path):
+    now = [1000.0]
+    cache = SharedCache(str(tmp_path / "cache.db"), max_entries=10, touch_interval_s=0.0, clock=lambda: now[0])
+    cache.set("ns", "short", 1, ttl_s=5)
+    for i in range(11):
+        now[0] += 1
+        cache.set("ns", f"k{i}", i)
+    now[0] += 1
+    assert cache.get("ns", "k0") == 0  # touched: now the most recently used
+    assert cache.get("ns", "short") is None  # expired
+
+    cache.trim()
+    kept = cache.get_many("ns", [f"k{i}" for i in range(11)])
+    assert set(kept) == {"k0"} | {f"k{i}" for i in range(3, 11)}  # trimmed to 90%, LRU first
+
+
+def test_embed_texts_only_sends_uncached_texts(tmp_path, monkeypatch):
+    cache = SharedCache(str(tmp_path / "cache.db"))
+    monkeypatch.setattr(embeddings, "get_shared_cache", lambda: cache)
+    fake = FakeOpenAI(embedding_dim=4)
+    sent = []
+    original = fake.embeddings.create
+    fake.embeddings.create = lambda **kw: sent.append(list(kw["input"])) or original(**kw)
+
+    first = embeddings.embed_texts(["a", "b"], client=fake)
+    second = embeddings.embed_texts(["b", "c", "a"], client=fake)
+    assert sent == [["a", "b"], ["c"]]
+    assert second[0] == first[1] and second[2] == first[0]
+    assert embeddings.embed_texts(["a", "c"], client=fake) and len(sent) == 2
+
+
+def test_search_results_are_cached_per_index(tmp_path, monkeypatch):
+    cache = SharedCache(str(tmp_path / "cache.db"))
+    monkeypatch.setattr(search_client, "get_shared_cache", lambda: cache)
+    fake = FakeSearchClient(corpus_size=20)
+    calls = []
+    original = fake.search
+    fake.search = lambda *a, **kw: calls.append(kw) or original(*a, **kw)
+
+    blue = AzureSearch(service_name="svc", index_name="blue", search_client=fake)
+    green = AzureSearch(service_name="svc", index_name="green", search_client=fake)
+    hits = blue.query("refund", top=3)
+    assert blue.query("refund", top=3) == hits
+    assert len(calls) == 1
+    green.query("refund", top=3)
+    blue.query("refund", top=4)
+    assert len(calls) == 3
+    assert make_key("a", 1) != make_key("a", "1")
+
+    [fresh] = AzureSearch(service_name="svc", index_name="blue", search_client=fake).query("refund", top=1)
+    [cached] = blue.query("refund", top=1)  # now stored as JSON and rebuilt
+    assert cached == fresh and cached["@search.score"] == 1.0
+
+
+def test_values_are_json_never_unpickled(tmp_path):
+    cache = SharedCache(str(tmp_path / "cache.db"))
+    cache.set("ns", "k", {"hits": [{"transaction_id": "a"}]})
+    assert cache.get("ns", "k") == {"hits": [{"transaction_id": "a"}]}
+
+    class Payload:
+        def __reduce__(self):
+            return (exec, ("raise SystemExit('pickle was loaded')",))
+
+    cache._conn().execute(
+        "UPDATE cache SET value = ? WHERE ns = 'ns' AND key = 'k'", (pickle.dumps(Payload()),)
+    )
+    assert cache.get("ns", "k") is None  # unreadable: a miss, not code execution
+
+
+def test_vector_query_cache_key_is_the_query_text(tmp_path, monkeypatch):
+    cache = SharedCache(str(tmp_path / "cache.db"))
+    monkeypatch.setattr(search_client, "get_shared_cache", lambda: cache)
+    search = AzureSearch(service_name="svc", index_name="blue", search_client=FakeSearchClient(corpus_size=5))
+    first = search.vector_query("refund", top=2, vector=[0.1] * 3072)
+    monkeypatch.setattr(search_client, "embed_texts", lambda texts: pytest.fail("should be a cache hit"))
+    assert search.vector_query("refund", top=2) == first
+
+
+class StubRetriever:
+    def __init__(self, docs, missing=()):
+        self.docs, self.missing = docs, list(missing)
+
+    def retrieve(self, query):
+        return RetrievedContext(documents=self.docs, missing=self.missing)
+
+
+def test_chat_cache_is_keyed_on_context_and_skips_degraded_retrieval(tmp_path, monkeypatch):
+    cache = SharedCache(str(tmp_path / "cache.db"))
+    monkeypatch.setattr(agent_client, "get_shared_cache", lambda: cache)
+    monkeypatch.setattr(agent_client, "active_index_name", lambda: "blue")
+    fake = FakeOpenAI()
+    messages = [Message(role="user", content="Summarize chargebacks for mid_001")]
+
+    def ask(retriever):
+        AgentClient(client=fake, model="test", retriever=retriever, router=None).chat(messages)
+        return fake.chat_calls
+
+    assert ask(StubRetriever([{"content": "txn a"}])) == 1
+    assert ask(StubRetriever([{"content": "txn a"}])) == 1  # same grounding: cache hit
+    assert ask(StubRetriever([{"content": "txn b"}])) == 2  # new context: new key
+    assert ask(StubRetriever([{"content": "txn c"}], missing=["vector"])) == 3
+    assert ask(StubRetriever([{"content": "txn c"}], missing=["vector"])) == 4  # partial: never cached
+    monkeypatch.setattr(agent_client, "active_index_name", lambda: "green")
+    assert ask(StubRetriever([{"content": "txn a"}])) == 5  # other index
@@ -0,0 +1,12 @@
+import os
+
+from benchmarks.startup import measure_startup
+
+# Generous enough for CI runners; tighten locally with STARTUP_BUDGET_MS
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "2500"))
+
+
+def test_cold_start_defers_sdks_and_meets_budget():
+    result = measure_startup(runs=1)
+    assert result["heavy_modules_loaded"] == []
+    assert result["startup_ms_max"] < STARTUP_BUDGET_MS, result
@@ -2,13 +2,15 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 import os
-from openai import OpenAI
 
 from ..config import get_settings
 from ..security.key_vault import get_secret
 
+if TYPE_CHECKING:  # the SDK is imported on first use to keep cold start fast
+    from openai import OpenAI
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,6 +51,8 @@ class AgentClient:
                 )
                 # The Azure OpenAI API version – update to latest supported
                 api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-06-01")
+                from openai import OpenAI
+
                 self._client = OpenAI(
                     base_url=f"{base_url}",
                     api_key=api_key,
@@ -1,15 +1,15 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional
-
-from azure.search.documents import SearchClient
-from azure.core.credentials import AzureKeyCredential  # type: ignore
-from azure.core.credentials import TokenCredential
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from ..config import get_settings
 from ..security.managed_identity import get_default_credential
 
+if TYPE_CHECKING:  # SDK modules load on first use, not at import time
+    from azure.core.credentials import TokenCredential
+    from azure.search.documents import SearchClient
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,6 +34,8 @@ class AzureSearch:
 
         endpoint = f"https://{self._service}.search.windows.net"
 
+        from azure.search.documents import SearchClient
+
         # Prefer AAD via DefaultAzureCredential
         cred = credential or get_default_credential()
         self.client = SearchClient(
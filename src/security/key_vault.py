@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import Optional
-from azure.keyvault.secrets import SecretClient
+
 from .managed_identity import get_default_credential
 
 
@@ -11,6 +11,8 @@ def get_secret(vault_uri: str, name: str, *, version: Optional[str] = None) -> O
     Returns None if the secret cannot be fetched (e.g., not found or access denied).
     """
     cred = get_default_credential()
+    from azure.keyvault.secrets import SecretClient
+
     client = SecretClient(vault_url=vault_uri, credential=cred)
     try:
         if version:
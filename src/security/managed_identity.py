@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from azure.identity import DefaultAzureCredential
+if TYPE_CHECKING:
+    from azure.identity import DefaultAzureCredential
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,8 @@ def get_default_credential(authority_host: Optional[str] = None) -> DefaultAzure
     """
     # In highly locked-down environments, you may want to set exclude_* flags.
     # We keep defaults but log the resolved chain for visibility.
+    from azure.identity import DefaultAzureCredential
+
     credential = DefaultAzureCredential(authority=authority_host)
     logger.debug("Initialized DefaultAzureCredential with authority=%s", authority_host)
     return credential
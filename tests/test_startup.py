@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous enough for CI runners; tighten locally with STARTUP_BUDGET_MS
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "2500"))
+
+HEAVY_MODULES = ("openai", "azure.identity", "azure.keyvault.secrets", "azure.search.documents")
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from src.api.main import app
+from fastapi.testclient import TestClient
+status = TestClient(app).get("/healthz").status_code
+print(json.dumps({
+    "startup_ms": (time.perf_counter() - t0) * 1000,
+    "status": status,
+    "heavy_modules_loaded": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def test_cold_start_defers_sdks_and_meets_budget():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE % (HEAVY_MODULES,)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    assert result["status"] == 200
+    assert result["heavy_modules_loaded"] == []
+    assert result["startup_ms"] < STARTUP_BUDGET_MS, result